@@ -0,0 +1,79 @@
+"""Compare HTML extraction throughput across parser backends.
+
+Runs every extractor over the pages in the page cache (or over HTML files
+given on the command line) with each parser backend, serially and in a
+process pool, and checks that the text matches the html.parser reference.
+
+    python benchmark_parsing.py
+    python benchmark_parsing.py --workers 8 --repeat 3
+    python benchmark_parsing.py --source espn page1.html page2.html
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from html_extract import DEFAULT_HTML_PARSER, EXTRACTORS, HTML_PARSERS
+from page_cache import PageCache
+
+
+def load_pages(args):
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, 'rb') as f:
+                pages.append((args.source, f.read()))
+        return pages
+    cache = PageCache(args.cache)
+    return [(source, body) for source in EXTRACTORS for _, body in cache.bodies(source)]
+
+
+def extract(page, parser, targeted):
+    source, body = page
+    return EXTRACTORS[source](body, parser=parser, targeted=targeted)
+
+
+def extract_chunk(pages, parser, targeted):
+    return [extract(page, parser, targeted) for page in pages]
+
+
+def run(pages, parser, targeted, workers):
+    if workers <= 0:
+        return [extract(page, parser, targeted) for page in pages]
+    chunk = max(1, len(pages) // (workers * 4))
+    chunks = [pages[i:i + chunk] for i in range(0, len(pages), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(extract_chunk, chunks, itertools.repeat(parser), itertools.repeat(targeted))
+        return [text for texts in results for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction backends")
+    parser.add_argument('files', nargs='*', help="HTML files to parse instead of the page cache")
+    parser.add_argument('--source', choices=list(EXTRACTORS), default='espn', help="extractor used for FILES")
+    parser.add_argument('--cache', default=os.getenv("PAGE_CACHE_PATH", "page_cache.db"), help="page cache to read pages from")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="processes for the pooled runs")
+    parser.add_argument('--repeat', type=int, default=1, help="times each page is parsed per run")
+    args = parser.parse_args()
+
+    pages = load_pages(args) * args.repeat
+    if not pages:
+        print("No pages to parse; run the scraper first or pass HTML files.")
+        return
+    size = sum(len(body) for _, body in pages) / 1e6
+    print(f"{len(pages)} pages, {size:.1f} MB")
+
+    reference = run(pages, DEFAULT_HTML_PARSER, False, 0)
+    for backend, targeted, workers in itertools.product(HTML_PARSERS, [False, True], [0, args.workers]):
+        start = time.perf_counter()
+        texts = run(pages, backend, targeted, workers)
+        elapsed = time.perf_counter() - start
+        mismatches = sum(text != ref for text, ref in zip(texts, reference))
+        label = f"{backend}{' targeted' if targeted else ''}, {workers or 'no'} workers"
+        print(f"{label:<36} {len(pages) / elapsed:8.1f} pages/s  {size / elapsed:6.1f} MB/s  "
+              f"{'identical' if not mismatches else f'{mismatches} pages differ'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+CHECKPOINT_PATH = 'scrape_checkpoint.db'
+# Checkpoints older than this are discarded instead of resumed
+CHECKPOINT_MAX_AGE = 24 * 3600
+
+
+class Checkpoint:
+    """Append-only SQLite log of finished players for a resumable scrape.
+
+    Each player's stats row and scraped row are committed as soon as the
+    player is done, so a crash or a killed process loses at most the
+    players still in flight. The log is cleared once the final tables have
+    been written.
+
+    The log records which league and season it belongs to and when the run
+    started. A log from another league or season, one older than `max_age`
+    seconds, or any log when `fresh` is set, is discarded on open rather
+    than resumed.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH, league_id=None, year=None, max_age=CHECKPOINT_MAX_AGE, fresh=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS finished (
+                playerId INTEGER PRIMARY KEY,
+                stats TEXT NOT NULL,
+                scraped_info TEXT NOT NULL,
+                finished_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS run (
+                league_id INTEGER,
+                year INTEGER,
+                created_at REAL NOT NULL
+            );
+        """)
+        self._start(league_id, year, max_age, fresh)
+
+    def _start(self, league_id, year, max_age, fresh):
+        run = self.conn.execute("SELECT league_id, year, created_at FROM run").fetchone()
+        reason = None
+        if fresh:
+            reason = "--fresh"
+        elif run is not None and (run[0], run[1]) != (league_id, year):
+            reason = f"it belongs to league {run[0]} ({run[1]})"
+        elif run is not None and time.time() - run[2] > max_age:
+            reason = f"it is {(time.time() - run[2]) / 3600:.0f} hours old"
+        elif run is None and self.conn.execute("SELECT 1 FROM finished LIMIT 1").fetchone():
+            reason = "it has no run record"
+        if reason is not None:
+            count = self.conn.execute("SELECT COUNT(*) FROM finished").fetchone()[0]
+            if count:
+                print(f"Discarding checkpoint of {count} players: {reason}")
+            self.conn.execute("DELETE FROM finished")
+            self.conn.execute("DELETE FROM run")
+            run = None
+        if run is None:
+            self.conn.execute("INSERT INTO run (league_id, year, created_at) VALUES (?, ?, ?)",
+                              (league_id, year, time.time()))
+        self.conn.commit()
+
+    def add(self, player_stats, scraped_info):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO finished (playerId, stats, scraped_info, finished_at) VALUES (?, ?, ?, ?)",
+                (int(player_stats['playerId']), json.dumps(player_stats), json.dumps(scraped_info), time.time()),
+            )
+            self.conn.commit()
+
+    def load(self):
+        """{playerId: (stats, scraped_info)} for every checkpointed player."""
+        with self.lock:
+            rows = self.conn.execute("SELECT playerId, stats, scraped_info FROM finished").fetchall()
+        return {player_id: (json.loads(stats), json.loads(scraped_info)) for player_id, stats, scraped_info in rows}
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM finished")
+            self.conn.execute("DELETE FROM run")
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def run_checkpointed(jobs, scrape, checkpoint):
+    """Run `scrape` over the jobs the checkpoint has not seen yet.
+
+    `scrape(jobs)` must add every finished player to `checkpoint` (see the
+    checkpoint argument of run_serial and run_pipeline). Returns stats and
+    scraped rows for all of `jobs`, in job order, from the checkpoint.
+    """
+    done = checkpoint.load()
+    pending = [job for job in jobs if int(job[0].playerId) not in done]
+    if done:
+        print(f"Resuming from checkpoint: {len(jobs) - len(pending)} players done, {len(pending)} to go")
+    if pending:
+        scrape(pending)
+        done = checkpoint.load()
+    results = [done[int(player.playerId)] for player, _ in jobs]
+    return [stats for stats, _ in results], [scraped_info for _, scraped_info in results]
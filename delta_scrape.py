@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import time
+
+
+SNAPSHOT_PATH = 'scrape_snapshot.json'
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# get_player_stats fields whose change means the player's news may have moved
+FINGERPRINT_FIELDS = [
+    'injuryStatus', 'injured', 'lineupSlot', 'onTeamId', 'proTeam', 'position',
+    'projected_total_points', 'projected_avg_points', 'percent_owned', 'percent_started',
+]
+# Ownership drifts a little every day; only a move across a bucket counts
+PERCENT_BUCKET = 5
+
+
+def player_fingerprint(player_stats):
+    """Stable hash of the ESPN state in a get_player_stats row."""
+    state = {}
+    for field in FINGERPRINT_FIELDS:
+        value = player_stats.get(field)
+        if field in ('percent_owned', 'percent_started') and value is not None:
+            value = round(value / PERCENT_BUCKET) * PERCENT_BUCKET
+        elif isinstance(value, float):
+            value = round(value, 1)
+        state[field] = value
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """{playerId (str): {'fingerprint': ..., 'scraped_at': ...}} from the previous run."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def split_changed(stats, snapshot, known_ids, max_age=DEFAULT_MAX_AGE, now=None):
+    """Indexes of `stats` rows that need a fresh scrape, and of those that do not.
+
+    A player is re-scraped when it is new, its fingerprint differs from the
+    snapshot, its last scrape is older than `max_age` seconds, or its text
+    is missing from the text store (`known_ids`).
+    """
+    now = time.time() if now is None else now
+    changed = []
+    unchanged = []
+    for index, player_stats in enumerate(stats):
+        entry = snapshot.get(str(player_stats['playerId']))
+        if (entry is None
+                or player_stats['playerId'] not in known_ids
+                or entry['fingerprint'] != player_fingerprint(player_stats)
+                or now - entry['scraped_at'] > max_age):
+            changed.append(index)
+        else:
+            unchanged.append(index)
+    return changed, unchanged
+
+
+def update_snapshot(snapshot, stats, changed, now=None):
+    """Record fresh fingerprints for the re-scraped rows of `stats`."""
+    now = time.time() if now is None else now
+    for index in changed:
+        player_stats = stats[index]
+        snapshot[str(player_stats['playerId'])] = {
+            'fingerprint': player_fingerprint(player_stats),
+            'scraped_at': now,
+        }
+    return snapshot
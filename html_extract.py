@@ -0,0 +1,38 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+# BeautifulSoup tree builders the scraper can parse with. html.parser is the
+# reference; lxml is faster but may repair malformed markup differently.
+HTML_PARSERS = ['html.parser', 'lxml']
+DEFAULT_HTML_PARSER = 'html.parser'
+
+ESPN_NEWS_CLASS = 'FantasyOverview__News pa4'
+
+
+def _soup(content, parser, parse_only):
+    return BeautifulSoup(content, parser, parse_only=parse_only)
+
+
+def extract_fantasy_pros(content, parser=DEFAULT_HTML_PARSER, targeted=False):
+    """Text of every <p> on a FantasyPros notes page, one paragraph per line.
+
+    With `targeted`, only <p> elements (and their contents) are built into
+    the tree instead of the whole document.
+    """
+    soup = _soup(content, parser, SoupStrainer('p') if targeted else None)
+    return '\n'.join(p.get_text().strip() for p in soup.find_all('p'))
+
+
+def extract_espn(content, parser=DEFAULT_HTML_PARSER, targeted=False):
+    """Fantasy news block of an ESPN player page, or "No news found"."""
+    strainer = SoupStrainer('div', class_=ESPN_NEWS_CLASS) if targeted else None
+    news = _soup(content, parser, strainer).find('div', class_=ESPN_NEWS_CLASS)
+    if news:
+        return news.get_text(strip=True, separator='\n\n')
+    return "No news found"
+
+
+EXTRACTORS = {
+    'fantasypros': extract_fantasy_pros,
+    'espn': extract_espn,
+}
@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Requests per second allowed against each host; anything else uses DEFAULT_RATE
+HOST_RATE_LIMITS = {
+    'www.fantasypros.com': 2.0,
+    'www.espn.com': 2.0,
+}
+DEFAULT_RATE = 5.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostStats:
+    def __init__(self, window=1000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency=None, retry=False, error=False):
+        with self.lock:
+            self.requests += 1
+            if latency is not None:
+                self.latencies.append(latency)
+            self.retries += retry
+            self.errors += error
+
+    def summary(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return {'requests': self.requests, 'retries': self.retries, 'errors': self.errors}
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'errors': self.errors,
+            'mean_ms': 1000 * sum(latencies) / len(latencies),
+            'p50_ms': 1000 * pct(0.50),
+            'p95_ms': 1000 * pct(0.95),
+            'max_ms': 1000 * latencies[-1],
+        }
+
+
+class HttpClient:
+    """Pooled HTTP client shared by the page scrapers.
+
+    Keeps one keep-alive session per host, throttles each host with a token
+    bucket and retries 429/5xx responses with exponential backoff and full
+    jitter, honouring Retry-After when the server sends it.
+    """
+
+    def __init__(self, host_rates=None, default_rate=DEFAULT_RATE, burst=4, pool_maxsize=16,
+                 max_retries=4, backoff=0.5, max_backoff=30.0, timeout=30):
+        self.host_rates = {**HOST_RATE_LIMITS, **(host_rates or {})}
+        self.default_rate = default_rate
+        self.burst = burst
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.sessions = {}
+        self.buckets = {}
+        self.stats = defaultdict(HostStats)
+        self.lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[host] = session
+                self.buckets[host] = TokenBucket(self.host_rates.get(host, self.default_rate), self.burst)
+            return self.sessions[host], self.buckets[host], self.stats[host]
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(self.max_backoff, float(retry_after))
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get(self, url, headers=None, **kwargs):
+        host = urlsplit(url).netloc
+        session, bucket, stats = self._host_state(host)
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            start = time.monotonic()
+            try:
+                response = session.get(url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                retry = attempt < self.max_retries
+                stats.record(retry=retry, error=True)
+                if not retry:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            retry = response.status_code in RETRY_STATUSES and attempt < self.max_retries
+            stats.record(latency=time.monotonic() - start, retry=retry)
+            if retry:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+            return response
+
+    def latency_stats(self):
+        return {host: stats.summary() for host, stats in self.stats.items()}
+
+    def report(self):
+        for host, summary in self.latency_stats().items():
+            line = f"{host}: {summary['requests']} requests, {summary['retries']} retries, {summary['errors']} errors"
+            if 'mean_ms' in summary:
+                line += f", mean {summary['mean_ms']:.0f}ms, p50 {summary['p50_ms']:.0f}ms, p95 {summary['p95_ms']:.0f}ms"
+            print(line)
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide HttpClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from lineup import weekly_projection
+from player_ids import name_key, resolve_rows
+
+
+# Sources averaged in the League Analysis position headers
+SOURCE_SCORE_COLUMNS = {
+    'reddit': 'reddit_sentiment_score',
+    'fantasypros': 'fantasypros_sentiment_score',
+    'overall': 'overall_sentiment_score',
+}
+
+
+def league_rosters(league):
+    """Hashable (team_id, playerId, name, position) tuples for every rostered player."""
+    return tuple(
+        (team.team_id, int(player.playerId), player.name, player.position)
+        for team in league.teams
+        for player in team.roster
+    )
+
+
+def league_projections(league, week=None):
+    """Hashable (playerId, injuryStatus, projection) tuples for every rostered player in `week`.
+
+    Cache keys include these so lineup-based results are recomputed when a
+    projection or injury status changes, e.g. when a live league replaces
+    its snapshot or a player is ruled out.
+    """
+    return tuple(
+        (int(player.playerId), getattr(player, 'injuryStatus', None), weekly_projection(player, week))
+        for team in league.teams
+        for player in team.roster
+    )
+
+
+def position_sentiment_summary(store, rosters):
+    """Average sentiment per team, position and source for a whole league.
+
+    `rosters` comes from league_rosters. All players are joined to the
+    store in one merge and aggregated with a single groupby over
+    team x position x source. The result is indexed by (team_id, position)
+    and has a players count, one `<source>_avg` column per source (NaN
+    when no player has a score) and `position_avg`, the mean over every
+    available score of that position group.
+    """
+    roster = pd.DataFrame(list(rosters), columns=['team_id', 'playerId', 'name', 'position'])
+    roster['name_key'] = roster['name'].map(name_key)
+    rows = resolve_rows(roster[['playerId', 'name_key']], store.index)
+
+    score_columns = list(SOURCE_SCORE_COLUMNS.values())
+    scores = store.df.reindex(columns=score_columns).to_numpy(dtype=float, na_value=np.nan)
+    matched = np.full((len(roster), len(score_columns)), np.nan)
+    found = rows >= 0
+    matched[found] = scores[rows[found]]
+    for source, values in zip(SOURCE_SCORE_COLUMNS, matched.T):
+        roster[source] = values
+
+    long = roster.melt(id_vars=['team_id', 'position'], value_vars=list(SOURCE_SCORE_COLUMNS),
+                       var_name='source', value_name='score')
+    grouped = long.groupby(['team_id', 'position', 'source'])['score'].agg(['sum', 'count']).unstack('source')
+
+    summary = pd.DataFrame(index=grouped.index)
+    summary['players'] = roster.groupby(['team_id', 'position']).size()
+    for source in SOURCE_SCORE_COLUMNS:
+        count = grouped[('count', source)]
+        summary[f'{source}_avg'] = (grouped[('sum', source)] / count).where(count > 0)
+    total_count = grouped['count'].sum(axis=1)
+    summary['position_avg'] = (grouped['sum'].sum(axis=1) / total_count).where(total_count > 0)
+    return summary
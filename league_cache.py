@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from espn_api.football import League
+
+
+LEAGUE_TTL = 15 * 60
+SNAPSHOT_DIR = 'league_snapshots'
+
+TEAM_FIELDS = ['team_id', 'team_name', 'wins', 'losses', 'ties', 'points_for', 'points_against',
+               'standing', 'division_id', 'scores', 'outcomes']
+PLAYER_FIELDS = ['name', 'playerId', 'position', 'proTeam', 'injuryStatus', 'injured', 'posRank',
+                 'eligibleSlots', 'lineupSlot', 'acquisitionType', 'total_points', 'avg_points',
+                 'projected_total_points', 'projected_avg_points', 'percent_owned', 'percent_started', 'stats']
+SETTINGS_FIELDS = ['name', 'reg_season_count', 'playoff_team_count', 'position_slot_counts']
+
+
+def snapshot_league(league):
+    """Plain-dict snapshot of the league's settings, teams and rosters."""
+    return {
+        'league_id': league.league_id,
+        'year': league.year,
+        'current_week': getattr(league, 'current_week', None),
+        'settings': {field: getattr(league.settings, field, None) for field in SETTINGS_FIELDS},
+        'teams': [
+            {
+                **{field: getattr(team, field, None) for field in TEAM_FIELDS},
+                'schedule': [opponent.team_id for opponent in getattr(team, 'schedule', [])],
+                'roster': [{field: getattr(player, field, None) for field in PLAYER_FIELDS} for player in team.roster],
+            }
+            for team in league.teams
+        ],
+    }
+
+
+def league_from_snapshot(snapshot):
+    """Rebuild a read-only, League-like object from `snapshot_league` output.
+
+    Teams and players expose the same attributes the app reads from live
+    espn_api objects, and each team's schedule points at the rebuilt teams.
+    """
+    teams = []
+    for team_data in snapshot['teams']:
+        team = SimpleNamespace(**{field: team_data.get(field) for field in TEAM_FIELDS})
+        team.roster = [SimpleNamespace(**player) for player in team_data['roster']]
+        teams.append(team)
+    teams_by_id = {team.team_id: team for team in teams}
+    for team, team_data in zip(teams, snapshot['teams']):
+        team.schedule = [teams_by_id[team_id] for team_id in team_data['schedule'] if team_id in teams_by_id]
+    return SimpleNamespace(
+        league_id=snapshot['league_id'],
+        year=snapshot['year'],
+        current_week=snapshot.get('current_week'),
+        settings=SimpleNamespace(**snapshot['settings']),
+        teams=teams,
+        is_snapshot=True,
+    )
+
+
+class LeagueCache:
+    """Process-wide cache of ESPN leagues keyed on (league_id, year).
+
+    Concurrent requests for the same league share a single load. Entries
+    older than `ttl` keep being served while a background refresh runs.
+    Every load also writes a JSON snapshot to disk, so a fresh process can
+    serve the teams and rosters immediately while the live league loads.
+    """
+
+    def __init__(self, ttl=LEAGUE_TTL, snapshot_dir=SNAPSHOT_DIR, loader=League):
+        self.ttl = ttl
+        self.snapshot_dir = snapshot_dir
+        self.loader = loader
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='league-cache')
+
+    def _snapshot_path(self, key):
+        return os.path.join(self.snapshot_dir, f"{key[0]}_{key[1]}.json")
+
+    def _fetch(self, key):
+        try:
+            league = self.loader(league_id=key[0], year=key[1])
+            with self.lock:
+                self.entries[key] = (league, time.time())
+            self._write_snapshot(key, league)
+            return league
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def _write_snapshot(self, key, league):
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            tmp_path = self._snapshot_path(key) + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot_league(league), f)
+            os.replace(tmp_path, self._snapshot_path(key))
+        except (OSError, TypeError) as e:
+            print(f"Could not write league snapshot {key}: {e}")
+
+    def _read_snapshot(self, key):
+        try:
+            with open(self._snapshot_path(key)) as f:
+                return league_from_snapshot(json.load(f)), os.path.getmtime(self._snapshot_path(key))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _load(self, key):
+        """Start (or join) the single in-flight load for `key`."""
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is None:
+                future = self.executor.submit(self._fetch, key)
+                self.inflight[key] = future
+            return future
+
+    def get(self, league_id, year):
+        key = (int(league_id), int(year))
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None:
+            league, loaded_at = entry
+            if time.time() - loaded_at > self.ttl:
+                self._load(key)
+            return league
+
+        snapshot = self._read_snapshot(key)
+        if snapshot is not None:
+            league, saved_at = snapshot
+            with self.lock:
+                self.entries.setdefault(key, (league, saved_at))
+            self._load(key)
+            return league
+
+        return self._load(key).result()
+
+    def refresh(self, league_id, year):
+        """Reload a league now, waiting for the result."""
+        return self._load((int(league_id), int(year))).result()
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+
+# Roster slots that never score
+BENCH_SLOTS = {'BE', 'IR'}
+# Display order of starting slots; slots not listed go last
+SLOT_ORDER = ['QB', 'TQB', 'RB', 'RB/WR', 'WR', 'WR/TE', 'TE', 'RB/WR/TE', 'OP',
+              'DT', 'DE', 'LB', 'DL', 'CB', 'S', 'DB', 'DP', 'D/ST', 'K', 'P', 'HC']
+# Players with these statuses are projected for zero
+INACTIVE_STATUSES = {'OUT', 'INJURY_RESERVE', 'SUSPENSION'}
+
+# Assignment costs: an ineligible player is never used, and a seat is only
+# left empty when nobody eligible is left
+INELIGIBLE_COST = 1e9
+EMPTY_COST = 1e6
+
+
+def starting_slots(position_slot_counts):
+    """One entry per starting seat (e.g. ['QB', 'RB', 'RB', ...]) from league settings."""
+    slots = [slot for slot, count in position_slot_counts.items()
+             if count and slot not in BENCH_SLOTS for _ in range(count)]
+    order = {slot: index for index, slot in enumerate(SLOT_ORDER)}
+    return sorted(slots, key=lambda slot: order.get(slot, len(order)))
+
+
+def weekly_projection(player, week=None):
+    """Projected points for `week`, falling back to the season per-game projection."""
+    if getattr(player, 'injuryStatus', None) in INACTIVE_STATUSES:
+        return 0.0
+    stats = getattr(player, 'stats', None) or {}
+    entry = None
+    if week is not None:
+        entry = stats.get(week) or stats.get(str(week))
+    if entry and entry.get('projected_points') is not None:
+        return float(entry['projected_points'])
+    return float(getattr(player, 'projected_avg_points', 0) or 0)
+
+
+def _assign(cost):
+    """Minimum-cost assignment of each row of `cost` to a distinct column.
+
+    Hungarian algorithm with potentials, O(n^2 m), with each step
+    vectorized over the columns. Requires rows <= columns. Returns the
+    column assigned to every row.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            reduced = cost[current_row - 1] - u[current_row] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = column
+            candidates = np.where(free, minv[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+    assignment = np.full(n, -1)
+    for column in range(1, m + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
+
+
+def slot_eligibility(eligible_slots, slots):
+    """Boolean seats x players matrix of which player may fill which seat."""
+    eligible = np.array([[slot in player_slots for player_slots in eligible_slots] for slot in slots], dtype=bool)
+    return eligible.reshape(len(slots), len(eligible_slots))
+
+
+def _best_starters(eligible, projections):
+    # Padding columns stand for an empty seat, so every seat can be assigned
+    n_slots, n_players = eligible.shape
+    cost = np.hstack([
+        np.where(eligible, -projections, INELIGIBLE_COST),
+        np.full((n_slots, n_slots), EMPTY_COST),
+    ])
+    assignment = _assign(cost)
+    return np.where(assignment < n_players, assignment, -1)
+
+
+def lineup_value(eligible, projections):
+    """Projected total of the best lineup for a slot_eligibility matrix and projections."""
+    projections = np.asarray(projections, dtype=float)
+    starters = _best_starters(eligible, projections)
+    return float(projections[starters[starters >= 0]].sum())
+
+
+def optimal_lineup(eligible_slots, projections, slots):
+    """Best start/sit assignment for one roster.
+
+    `eligible_slots` and `projections` are per player; `slots` is the
+    starting_slots list. Returns, for each seat in `slots`, the index of
+    the player starting there (-1 if no eligible player is left).
+    """
+    return _best_starters(slot_eligibility(eligible_slots, slots), np.asarray(projections, dtype=float))
+
+
+def optimize_roster(roster, position_slot_counts, week=None):
+    """Optimal lineup for a list of espn_api players.
+
+    Returns a dict with the starting `lineup` as (slot, player, projection)
+    tuples in slot order, the `bench` players, the optimal projected
+    `total` and the `current_total` of the players now in starting slots.
+    """
+    slots = starting_slots(position_slot_counts)
+    projections = [weekly_projection(player, week) for player in roster]
+    starters = optimal_lineup([getattr(player, 'eligibleSlots', None) or [] for player in roster], projections, slots)
+    lineup = [(slot, roster[index] if index >= 0 else None, projections[index] if index >= 0 else 0.0)
+              for slot, index in zip(slots, starters)]
+    starting = set(int(index) for index in starters if index >= 0)
+    return {
+        'lineup': lineup,
+        'bench': [player for index, player in enumerate(roster) if index not in starting],
+        'total': sum(projection for _, _, projection in lineup),
+        'current_total': sum(projection for player, projection in zip(roster, projections)
+                             if getattr(player, 'lineupSlot', 'BE') not in BENCH_SLOTS),
+    }
+
+
+def optimize_league(league, week=None):
+    """Optimal and current projected totals for every team in the league.
+
+    Returns a frame indexed by team_id with team_name, optimal, current and
+    gain (points left on the bench by the current lineup), best first.
+    """
+    week = getattr(league, 'current_week', None) if week is None else week
+    slot_counts = league.settings.position_slot_counts
+    rows = []
+    for team in league.teams:
+        result = optimize_roster(team.roster, slot_counts, week)
+        rows.append({
+            'team_id': team.team_id,
+            'team_name': team.team_name,
+            'optimal': result['total'],
+            'current': result['current_total'],
+        })
+    teams = pd.DataFrame(rows).set_index('team_id')
+    teams['gain'] = teams['optimal'] - teams['current']
+    return teams.sort_values('optimal', ascending=False)
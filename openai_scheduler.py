@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import OpenAI, RateLimitError
+
+from http_client import HostStats
+
+
+# (requests per minute, tokens per minute) allowed for each model
+MODEL_LIMITS = {
+    'gpt-4o-mini': (500, 200_000),
+    'gpt-4.1-mini': (500, 200_000),
+    'gpt-4.1-nano': (500, 200_000),
+}
+DEFAULT_LIMITS = (500, 200_000)
+# Seconds a throttled model is skipped when the 429 has no Retry-After
+THROTTLE_COOLDOWN = 10.0
+# 429s one request takes from a model before that model counts as failed
+MAX_THROTTLES = 3
+MAX_CONCURRENCY = 16
+
+
+class AllModelsFailed(Exception):
+    """No model in a request's list produced a response."""
+
+
+class ModelLimiter:
+    """Requests-per-minute and tokens-per-minute budget of one model.
+
+    Both budgets refill continuously, like http_client.TokenBucket, and are
+    reserved together so a request only starts when both allow it.
+    """
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = rpm
+        self.tokens = tpm
+        self.updated = time.monotonic()
+        self.throttled_until = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+        self.updated = now
+
+    def reserve(self, tokens):
+        """Take one request and `tokens` tokens. Returns 0, or the seconds until that is possible."""
+        tokens = min(tokens, self.tpm)
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.throttled_until:
+                return self.throttled_until - now
+            if self.requests >= 1 and self.tokens >= tokens:
+                self.requests -= 1
+                self.tokens -= tokens
+                return 0
+            return max((1 - self.requests) * 60 / self.rpm, (tokens - self.tokens) * 60 / self.tpm)
+
+    def settle(self, reserved, used):
+        """Give back the part of a token reservation the response did not use."""
+        with self.lock:
+            self.tokens = min(self.tpm, self.tokens + reserved - used)
+
+    def throttle(self, seconds):
+        with self.lock:
+            self.throttled_until = max(self.throttled_until, time.monotonic() + seconds)
+
+
+def _retry_after(error):
+    retry_after = getattr(error, 'response', None) and error.response.headers.get('retry-after')
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return THROTTLE_COOLDOWN
+
+
+class OpenAIScheduler:
+    """Runs Responses API calls concurrently within each model's rate limits.
+
+    Every request names its models in order of preference. A worker sends it
+    to the first model whose RPM/TPM budget has room; a model that answers
+    429 is skipped for its Retry-After period, so traffic moves to the
+    fallbacks instead of waiting. A model that fails any other way, answers
+    `max_throttles` 429s to the same request, or reports insufficient quota
+    is not tried again for that request, like the old fallback loop. When
+    every model has failed, the request raises AllModelsFailed.
+    """
+
+    def __init__(self, client=None, limits=None, max_concurrency=MAX_CONCURRENCY, max_throttles=MAX_THROTTLES):
+        self.base_client = client
+        self.client = None
+        self.limits = {**MODEL_LIMITS, **(limits or {})}
+        self.max_throttles = max_throttles
+        self.limiters = {}
+        self.stats = defaultdict(HostStats)
+        self.queued = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='openai')
+
+    def _client(self):
+        with self.lock:
+            if self.client is None:
+                # The scheduler handles throttling itself, so the SDK must not retry 429s
+                self.client = (self.base_client or get_openai_client()).with_options(max_retries=0)
+            return self.client
+
+    def _limiter(self, model):
+        with self.lock:
+            if model not in self.limiters:
+                self.limiters[model] = ModelLimiter(*self.limits.get(model, DEFAULT_LIMITS))
+            return self.limiters[model]
+
+    def submit(self, models, tokens, **request):
+        """Queue a responses.create call; the future resolves to (model, response).
+
+        `tokens` is the expected prompt plus output size, reserved against
+        the model's tokens-per-minute budget.
+        """
+        with self.lock:
+            self.queued += 1
+        return self.executor.submit(self._run, list(models), tokens, request)
+
+    def create(self, models, tokens, **request):
+        return self.submit(models, tokens, **request).result()
+
+    def _run(self, models, tokens, request):
+        with self.lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            failed = set()
+            throttles = defaultdict(int)
+            last_error = None
+            while len(failed) < len(models):
+                waits = []
+                for model in models:
+                    if model in failed:
+                        continue
+                    limiter = self._limiter(model)
+                    wait = limiter.reserve(tokens)
+                    if wait:
+                        waits.append(wait)
+                        continue
+                    start = time.monotonic()
+                    try:
+                        response = self._client().responses.create(model=model, **request)
+                    except RateLimitError as e:
+                        self.stats[model].record(retry=True)
+                        throttles[model] += 1
+                        if getattr(e, 'code', None) == 'insufficient_quota' or throttles[model] >= self.max_throttles:
+                            print(f"Error with model {model}: {e}")
+                            failed.add(model)
+                            last_error = e
+                            continue
+                        limiter.throttle(_retry_after(e))
+                        print(f"Model {model} throttled, routing to fallback models")
+                        break
+                    except Exception as e:
+                        self.stats[model].record(error=True)
+                        print(f"Error with model {model}: {e}")
+                        failed.add(model)
+                        last_error = e
+                        continue
+                    self.stats[model].record(latency=time.monotonic() - start)
+                    usage = getattr(response, 'usage', None)
+                    if usage is not None and getattr(usage, 'total_tokens', None) is not None:
+                        limiter.settle(min(tokens, limiter.tpm), usage.total_tokens)
+                    return model, response
+                else:
+                    if waits:
+                        time.sleep(min(waits))
+            raise AllModelsFailed(f"No response from {', '.join(models) or 'an empty model list'}") from last_error
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def queue_depth(self):
+        with self.lock:
+            return {'queued': self.queued, 'in_flight': self.in_flight}
+
+    def latency_stats(self):
+        return {model: stats.summary() for model, stats in self.stats.items()}
+
+    def report(self):
+        depth = self.queue_depth()
+        print(f"OpenAI scheduler: {depth['queued']} queued, {depth['in_flight']} in flight")
+        for model, summary in self.latency_stats().items():
+            line = f"{model}: {summary['requests']} requests, {summary['retries']} throttled, {summary['errors']} errors"
+            if 'mean_ms' in summary:
+                line += f", mean {summary['mean_ms']:.0f}ms, p50 {summary['p50_ms']:.0f}ms, p95 {summary['p95_ms']:.0f}ms"
+            print(line)
+
+
+_client = None
+_scheduler = None
+_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Process-wide OpenAI client, created on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = OpenAI()
+        return _client
+
+
+def get_openai_scheduler():
+    """Process-wide OpenAIScheduler, created on first use."""
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = OpenAIScheduler()
+        return _scheduler
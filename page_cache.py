@@ -0,0 +1,178 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from http_client import get_client
+
+
+# Seconds a cached page is served without revalidation, per source
+SOURCE_TTLS = {
+    'fantasypros': 6 * 3600,
+    'espn': 2 * 3600,
+}
+DEFAULT_TTL = 3600
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+CONDITIONAL_HEADERS = {'if-none-match', 'if-modified-since'}
+
+
+class PageCache:
+    """Persistent SQLite cache of fetched pages.
+
+    Bodies are zlib-compressed and stored once per content hash, so pages
+    that did not change between fetches share a row. Each URL keeps its
+    ETag/Last-Modified validators for conditional revalidation, and the
+    least recently used URLs are evicted once the compressed bodies exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, path='page_cache.db', max_bytes=MAX_CACHE_BYTES, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                hash TEXT NOT NULL REFERENCES blobs(hash),
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed_at);
+        """)
+
+    def get(self, url):
+        """Return (body, etag, last_modified, fetched_at) for `url`, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT b.body, p.etag, p.last_modified, p.fetched_at FROM pages p JOIN blobs b ON b.hash = p.hash WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return zlib.decompress(body), etag, last_modified, fetched_at
+
+    def put(self, url, source, body, etag=None, last_modified=None):
+        digest = hashlib.sha256(body).hexdigest()
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO blobs (hash, body, size) VALUES (?, ?, ?)",
+                (digest, compressed, len(compressed)),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, source, hash, etag, last_modified, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, source, digest, etag, last_modified, now, now),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def bodies(self, source=None):
+        """(url, body) of every cached page, optionally only those from `source`."""
+        query = "SELECT p.url, b.body FROM pages p JOIN blobs b ON b.hash = p.hash"
+        params = ()
+        if source is not None:
+            query += " WHERE p.source = ?"
+            params = (source,)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY p.url", params).fetchall()
+        return [(url, zlib.decompress(body)) for url, body in rows]
+
+    def touch(self, url):
+        """Mark a cached page as freshly validated (after a 304)."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def _count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute(
+            "SELECT p.url, p.hash, b.size FROM pages p JOIN blobs b ON b.hash = p.hash ORDER BY p.accessed_at"
+        ).fetchall()
+        # A blob's bytes are only freed once the last page sharing it is gone
+        refs = dict(self.conn.execute("SELECT hash, COUNT(*) FROM pages GROUP BY hash").fetchall())
+        for url, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                total -= size
+        self.conn.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM pages)")
+
+    def fetch(self, url, source, headers=None):
+        """Return the body of `url`, going to the network only when needed.
+
+        Fresh entries (younger than the source TTL) are served directly.
+        Stale entries are revalidated with If-None-Match/If-Modified-Since,
+        and a 304 just refreshes the entry's timestamp. A 304 for a URL that
+        is not cached is retried without conditional headers.
+        """
+        cached = self.get(url)
+        if cached is not None:
+            body, etag, last_modified, fetched_at = cached
+            if time.time() - fetched_at < self.ttls.get(source, DEFAULT_TTL):
+                self._count('hits')
+                return body
+            headers = dict(headers or {})
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = get_client().get(url, headers=headers)
+        if response.status_code == 304:
+            if cached is not None:
+                self._count('revalidated')
+                self.touch(url)
+                return cached[0]
+            # Nothing cached to revalidate against: ask for the full page
+            headers = {name: value for name, value in (headers or {}).items()
+                       if name.lower() not in CONDITIONAL_HEADERS}
+            response = get_client().get(url, headers=headers)
+
+        self._count('misses')
+        if response.status_code == 200:
+            self.put(url, source, response.content,
+                     response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.content
+
+    def report(self):
+        print(f"Page cache: {self.hits} fresh hits, {self.revalidated} revalidated (304), {self.misses} fetched")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Process-wide PageCache at PAGE_CACHE_PATH (default page_cache.db)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache(os.getenv("PAGE_CACHE_PATH", "page_cache.db"))
+        return _cache
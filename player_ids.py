@@ -0,0 +1,76 @@
+import re
+
+import pandas as pd
+
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Alternate spellings of the same player across sources, keyed by normalized
+# name and mapping to one canonical normalized spelling
+NAME_ALIASES = {
+    'gabe davis': 'gabriel davis',
+    'hollywood brown': 'marquise brown',
+    'chig okonkwo': 'chigoziem okonkwo',
+    'mitch trubisky': 'mitchell trubisky',
+    'joshua palmer': 'josh palmer',
+    'tank dell': 'nathaniel dell',
+}
+
+# FantasyPros note-page slugs that do not follow the usual name-to-slug rule,
+# keyed by normalized name
+FANTASY_PROS_SLUGS = {
+    'kenneth walker': 'kenneth-walker-rb',
+    'amonra st brown': 'amonra-stbrown',
+}
+
+
+def normalize_name(name):
+    """Lower-case a player name and drop punctuation and generational suffixes."""
+    words = re.sub(r'[^a-z0-9\s]', '', str(name).lower()).split()
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def name_key(name):
+    """Normalized name with known aliases folded onto one canonical spelling.
+
+    The canonical form is only a join key (not necessarily how ESPN spells
+    the name), so both sides of a join must go through name_key.
+    """
+    normalized = normalize_name(name)
+    return NAME_ALIASES.get(normalized, normalized)
+
+
+def fantasy_pros_slug(name):
+    slug = FANTASY_PROS_SLUGS.get(normalize_name(name))
+    if slug:
+        return slug
+    cleaned_name = re.sub(r'[^a-zA-Z0-9\s]', '', name)
+    return cleaned_name.replace(' ', '-').lower()
+
+
+def roster_frame(roster):
+    """playerId/name frame for a list of espn_api players, in roster order."""
+    return pd.DataFrame({
+        'playerId': [int(player.playerId) for player in roster],
+        'name_key': [name_key(player.name) for player in roster],
+    })
+
+
+def resolve_rows(live, index):
+    """Row positions of `live` players in a stored players table.
+
+    `live` has playerId and name_key columns; `index` has playerId, name_key
+    and row (position in the stored table). Players are joined on playerId in
+    one merge, and only the ones that miss fall back to a second merge on
+    name_key. Returns an array aligned with `live`, -1 where nothing matched.
+    """
+    by_id = index.drop_duplicates('playerId')[['playerId', 'row']]
+    matched = live.merge(by_id, on='playerId', how='left')['row']
+    missing = matched.isna()
+    if missing.any():
+        by_name = index.drop_duplicates('name_key')[['name_key', 'row']]
+        fallback = live.loc[missing.values, ['name_key']].merge(by_name, on='name_key', how='left')['row']
+        matched[missing.values] = fallback.values
+    return matched.fillna(-1).astype(int).to_numpy()
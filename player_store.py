@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sentiment_schema import SENTIMENT_DTYPES, SENTIMENT_FIELDS, expand_sentiment, row_sentiment
+from player_ids import name_key, roster_frame, resolve_rows
+
+
+PLAYERS_PATH = 'players.parquet'
+LEGACY_PLAYERS_PATH = 'players.csv'
+
+# Low-cardinality string columns, stored dictionary-encoded
+CATEGORICAL_COLUMNS = ['position', 'proTeam', 'injuryStatus', 'lineupSlot', 'acquisitionType']
+
+# Large free-text columns; views load these only when they display them
+TEXT_COLUMNS = ['reddit_text', 'fantasy_pros_text', 'espn_text', 'stats']
+
+
+def build_players_table(df_stats, df_scraped_info):
+    """Join the stats and scraped tables (both indexed by playerId) into one frame."""
+    players = df_stats.join(df_scraped_info.drop(columns=['name']), how='left').reset_index()
+    players['name_key'] = players['name'].map(name_key)
+    for column in CATEGORICAL_COLUMNS:
+        if column in players.columns:
+            players[column] = players[column].fillna('').astype(str).astype('category')
+    return players
+
+
+def write_players(players, path=PLAYERS_PATH):
+    """Write the players frame as Parquet, replacing `path` atomically."""
+    table = pa.Table.from_pandas(players, preserve_index=False)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression='zstd', use_dictionary=True)
+    os.replace(tmp_path, path)
+
+
+def available_columns(path=PLAYERS_PATH):
+    if os.path.exists(path):
+        return pq.read_schema(path).names
+    return pd.read_csv(LEGACY_PLAYERS_PATH, nrows=0).columns.tolist()
+
+
+def load_players(columns=None, player_ids=None, path=PLAYERS_PATH):
+    """Load players, reading only `columns` (all if None) and, optionally, only `player_ids`.
+
+    The Parquet file is memory-mapped and column-pruned, so loading the
+    numeric columns never touches the scraped text. Falls back to the legacy
+    players.csv export when no Parquet file exists.
+    """
+    if columns is not None:
+        existing = set(available_columns(path))
+        columns = [column for column in columns if column in existing]
+
+    if os.path.exists(path):
+        filters = [('playerId', 'in', list(player_ids))] if player_ids is not None else None
+        table = pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+        return table.to_pandas()
+
+    dtypes = {field: dtype for field, dtype in SENTIMENT_DTYPES.items() if columns is None or field in columns}
+    usecols = None if columns is None else list(dict.fromkeys(['playerId'] + columns))
+    df = pd.read_csv(LEGACY_PLAYERS_PATH, usecols=usecols, dtype=dtypes)
+    if player_ids is not None:
+        df = df[df['playerId'].isin(list(player_ids))]
+    return df if columns is None else df[columns]
+
+
+def resident_columns(path=PLAYERS_PATH):
+    """Every column except the large text ones."""
+    return [column for column in available_columns(path) if column not in TEXT_COLUMNS]
+
+
+def data_version(path=PLAYERS_PATH):
+    """Modification time of the current players file, used to invalidate caches."""
+    if os.path.exists(path):
+        return os.stat(path).st_mtime_ns
+    return os.stat(LEGACY_PLAYERS_PATH).st_mtime_ns
+
+
+class PlayerStore:
+    """Read-only players table with hash indexes and pre-parsed sentiment.
+
+    Lookups by playerId or name key (see player_ids.name_key) are dict hits,
+    and whole rosters resolve with one vectorized merge, so the cost of
+    rendering a player does not depend on the size of the table.
+    """
+
+    def __init__(self, df):
+        if 'sentiment' in df.columns:
+            # Older exports only have the raw model response; expand it once here
+            df = expand_sentiment(df)
+        if 'name_key' not in df.columns:
+            df = df.assign(name_key=df['name'].map(name_key))
+        self.df = df.reset_index(drop=True)
+        self.index = pd.DataFrame({
+            'playerId': self.df['playerId'].astype(int),
+            'name_key': self.df['name_key'],
+            'row': np.arange(len(self.df)),
+        })
+        self.by_id = {}
+        self.by_name = {}
+        for index, (player_id, key) in enumerate(zip(self.index['playerId'], self.index['name_key'])):
+            self.by_id.setdefault(player_id, index)
+            self.by_name.setdefault(key, index)
+        sentiment_columns = [field for field in SENTIMENT_FIELDS if field in self.df.columns]
+        self.sentiments = [row_sentiment(row) for row in self.df[sentiment_columns].to_dict('records')]
+
+    def find(self, player_id=None, name=None):
+        """Row position for a player, matching playerId first and then name."""
+        if player_id is not None and int(player_id) in self.by_id:
+            return self.by_id[int(player_id)]
+        if name is not None:
+            return self.by_name.get(name_key(name))
+        return None
+
+    def resolve(self, roster):
+        """Row positions for a list of espn_api players (-1 where unmatched)."""
+        if not roster:
+            return np.array([], dtype=int)
+        return resolve_rows(roster_frame(roster), self.index)
+
+    def roster_sentiments(self, roster):
+        """Pre-parsed sentiment for each player in `roster`, in order."""
+        return [self.sentiments[row] if row >= 0 else None for row in self.resolve(roster)]
+
+    def get(self, player_id=None, name=None):
+        index = self.find(player_id, name)
+        return None if index is None else self.df.iloc[index]
+
+    def sentiment(self, player_id=None, name=None):
+        index = self.find(player_id, name)
+        return None if index is None else self.sentiments[index]
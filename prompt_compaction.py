@@ -0,0 +1,100 @@
+import re
+
+from sentiment_batch import estimate_tokens
+
+
+# Scraped text field of each source
+SOURCE_FIELDS = {
+    'reddit': 'reddit_text',
+    'fantasypros': 'fantasy_pros_text',
+    'espn': 'espn_text',
+}
+# Max estimated tokens of each source's text in a sentiment prompt (None for no limit)
+SOURCE_TOKEN_BUDGETS = {
+    'reddit': 1500,
+    'fantasypros': 1000,
+    'espn': 600,
+}
+
+# Lines that carry no player news: site chrome, calls to action, legal text.
+# A pattern must match the whole line, and only lines up to
+# BOILERPLATE_MAX_CHARS are checked, so a post or comment line that merely
+# mentions one of these words is kept.
+BOILERPLATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(advertisement|sponsored( content)?|ad)',
+    r'((we|this (site|website)) uses? )?cookies?\b.*\b(policy|settings|consent|preferences)\b.*',
+    r'(sign up|log in|subscribe|download (the|our) app)\b.*',
+    r'(get )?(our|the) newsletter\b.*',
+    r'(©|copyright\b).*|[\w .,&-]{0,40}\ball rights reserved\b\.?',
+    r'(read|see|view|show) (more|all)\b.*',
+]]
+BOILERPLATE_MAX_CHARS = 100
+URL_PATTERN = re.compile(r'https?://\S+')
+# Separator between Reddit posts; kept even though it repeats
+POST_SEPARATOR = '---'
+# A budget remainder smaller than this is not worth a truncated line
+MIN_PARTIAL_TOKENS = 16
+
+
+def _is_boilerplate(line):
+    return len(line) <= BOILERPLATE_MAX_CHARS and any(pattern.fullmatch(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def _truncate(line, tokens):
+    cut = line[:tokens * 4]
+    return cut.rsplit(' ', 1)[0] if ' ' in cut else cut
+
+
+def compact_text(text, budget=None):
+    """Trim one source's text to roughly `budget` estimated tokens.
+
+    Bare URLs, blank lines, short boilerplate lines and repeated lines
+    (ignoring case and punctuation) are dropped. The remaining lines are
+    kept in page order, which is newest first for FantasyPros notes and
+    ESPN news and most relevant first for Reddit, until the budget runs
+    out. The line that crosses it is cut at a word boundary.
+    """
+    if not isinstance(text, str):
+        return text
+    kept = []
+    seen = set()
+    used = 0
+    for line in text.splitlines():
+        line = ' '.join(URL_PATTERN.sub('', line).split())
+        if not line or _is_boilerplate(line):
+            continue
+        if line != POST_SEPARATOR:
+            key = re.sub(r'\W+', ' ', line.lower()).strip()
+            if key in seen:
+                continue
+            seen.add(key)
+        cost = estimate_tokens(line)
+        if budget is not None and used + cost > budget:
+            if budget - used >= MIN_PARTIAL_TOKENS:
+                kept.append(_truncate(line, budget - used))
+            break
+        kept.append(line)
+        used += cost
+    while kept and kept[-1] == POST_SEPARATOR:
+        kept.pop()
+    return '\n'.join(kept)
+
+
+def compact_sources(texts, budgets=None):
+    """Compact the source text fields of `texts` (a scraped row or batch item).
+
+    Returns a copy with each source field trimmed to its budget (default
+    SOURCE_TOKEN_BUDGETS) and the estimated prompt tokens of the source
+    text before and after, as {'prompt_tokens_before', 'prompt_tokens_after'}.
+    """
+    budgets = SOURCE_TOKEN_BUDGETS if budgets is None else budgets
+    compacted = dict(texts)
+    before = after = 0
+    for source, field in SOURCE_FIELDS.items():
+        text = texts.get(field)
+        if not isinstance(text, str):
+            continue
+        compacted[field] = compact_text(text, budgets.get(source))
+        before += estimate_tokens(text)
+        after += estimate_tokens(compacted[field])
+    return compacted, {'prompt_tokens_before': before, 'prompt_tokens_after': after}
@@ -0,0 +1,150 @@
+import os
+import re
+import threading
+import time
+
+import praw
+
+from player_ids import NAME_ALIASES, normalize_name
+
+
+SUBREDDIT = 'fantasyfootball'
+USER_AGENT = "ff-copilot-bot/0.1 by /u/lilskanny"
+# Reddit listings stop at about 1000 items
+BULK_LIMIT = 1000
+MAX_POST_AGE = 30 * 24 * 3600
+POSTS_PER_PLAYER = 3
+COMMENTS_PER_POST = 5
+
+_local = threading.local()
+
+
+def _new_reddit():
+    return praw.Reddit(
+        client_id=os.getenv("REDDIT_CLIENT"),
+        client_secret=os.getenv("REDDIT_SECRET"),
+        user_agent=USER_AGENT,
+    )
+
+
+def get_reddit():
+    """Long-lived Reddit client for the calling thread.
+
+    PRAW clients are not thread-safe, so each worker thread keeps its own
+    instead of building a new one per player.
+    """
+    reddit = getattr(_local, 'reddit', None)
+    if reddit is None:
+        reddit = _new_reddit()
+        _local.reddit = reddit
+    return reddit
+
+
+def _normalize_text(text):
+    return re.sub(r'[^a-z0-9\s]', '', text.lower()).split()
+
+
+def _post_data(submission, comments):
+    return {
+        'title': submission.title,
+        'selftext': submission.selftext,
+        'url': submission.url,
+        'score': submission.score,
+        'comments': comments,
+    }
+
+
+def _top_comments(submission):
+    submission.comments.replace_more(limit=0)
+    return [comment.body for comment in submission.comments.list()[:COMMENTS_PER_POST]]
+
+
+def search_posts(player, limit=POSTS_PER_PLAYER):
+    """Per-player subreddit search, one API round trip per hit for comments."""
+    subreddit = get_reddit().subreddit(SUBREDDIT)
+    search_results = subreddit.search(player, limit=limit, sort='relevance', time_filter="month")
+    return [_post_data(post, _top_comments(post)) for post in search_results]
+
+
+class RedditIndex:
+    """Recent r/fantasyfootball submissions, fetched once and matched locally.
+
+    Submissions are indexed by every adjacent word pair of their normalized
+    title and body, so finding the posts that mention a player is a dict
+    lookup on the first two words of the player's name. Comments are loaded
+    only for posts that are returned, and at most once per post.
+
+    The submissions belong to a client of the index's own, which no
+    thread's get_reddit() search shares. Every comment load through it
+    holds the index lock, so that client is used by one thread at a time.
+    """
+
+    def __init__(self, submissions):
+        self.submissions = sorted(submissions, key=lambda submission: submission.score, reverse=True)
+        self.texts = []
+        self.pairs = {}
+        for index, submission in enumerate(self.submissions):
+            words = _normalize_text(f"{submission.title} {submission.selftext}")
+            self.texts.append(f" {' '.join(words)} ")
+            for pair in zip(words, words[1:]):
+                self.pairs.setdefault(pair, set()).add(index)
+        self.comments = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def fetch(cls, limit=BULK_LIMIT, max_age=MAX_POST_AGE):
+        """Index the newest `limit` submissions younger than `max_age` seconds.
+
+        The listing is read through a new client that is then only used for
+        the index's comment loads.
+        """
+        cutoff = time.time() - max_age
+        submissions = _new_reddit().subreddit(SUBREDDIT).new(limit=limit)
+        return cls([submission for submission in submissions if submission.created_utc >= cutoff])
+
+    def _spellings(self, player):
+        normalized = normalize_name(player)
+        canonical = NAME_ALIASES.get(normalized, normalized)
+        return {canonical} | {alias for alias, name in NAME_ALIASES.items() if name == canonical}
+
+    def match(self, player):
+        """Indexes of submissions mentioning `player`, highest score first."""
+        found = set()
+        for spelling in self._spellings(player):
+            words = spelling.split()
+            if len(words) > 1:
+                candidates = self.pairs.get((words[0], words[1]), ())
+            else:
+                candidates = range(len(self.submissions))
+            phrase = f" {spelling} "
+            found.update(index for index in candidates if phrase in self.texts[index])
+        return sorted(found)
+
+    def posts(self, player, limit=POSTS_PER_PLAYER):
+        """Post dicts in get_reddit_posts format for the best `limit` matches."""
+        posts = []
+        for index in self.match(player)[:limit]:
+            submission = self.submissions[index]
+            # Indexed submissions share the index's client, so their comments
+            # are loaded one at a time
+            with self.lock:
+                comments = self.comments.get(submission.id)
+                if comments is None:
+                    comments = _top_comments(submission)
+                    self.comments[submission.id] = comments
+            posts.append(_post_data(submission, comments))
+        return posts
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_reddit_index(limit=BULK_LIMIT):
+    """Process-wide RedditIndex, fetched on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RedditIndex.fetch(limit)
+            print(f"Indexed {len(_index.submissions)} r/{SUBREDDIT} submissions")
+        return _index
@@ -1,74 +1,74 @@
 import pandas as pd
 import numpy as np
 import json
-import requests
 import time
 from espn_api.football import League
-import praw
 import os
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-import re
-from openai import OpenAI
+import argparse
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http_client import get_client
+from page_cache import get_page_cache
+from sentiment_cache import get_sentiment_cache, sentiment_key
+from sentiment_batch import OUTPUT_TOKENS_PER_PLAYER, analyze_sentiment_packed, analyze_sentiment_batch_api, estimate_tokens
+from openai_scheduler import get_openai_scheduler
+from prompt_compaction import SOURCE_TOKEN_BUDGETS, compact_sources
+from sentiment_schema import SENTIMENT_RESPONSE_FORMAT, expand_sentiment
+from player_store import build_players_table, write_players
+from player_ids import fantasy_pros_slug
+from text_store import TextStore
+from weekly_stats import build_weekly_stats, write_weekly_stats
+from reddit_index import BULK_LIMIT, get_reddit_index, search_posts
+from html_extract import DEFAULT_HTML_PARSER, HTML_PARSERS, extract_espn, extract_fantasy_pros
+from checkpoint import CHECKPOINT_MAX_AGE, CHECKPOINT_PATH, Checkpoint, run_checkpointed
+from delta_scrape import DEFAULT_MAX_AGE, load_snapshot, save_snapshot, split_changed, update_snapshot
 
 
 
 load_dotenv()
 
-def get_fantasy_pros_text(player):
-    cleaned_name = re.sub(r'[^a-zA-Z0-9\s]', '', player)
-    formatted_name = cleaned_name.replace(' ', '-')
-    formatted_name = formatted_name.lower()
-    
-    if player == "Kenneth Walker III":
-        formatted_name = "kenneth-walker-rb"
-    if player == "Amon-Ra St. Brown":
-        formatted_name = "amonra-stbrown"
+FANTASY_PROS_BASE_URL = os.getenv("FANTASY_PROS_BASE_URL", "https://www.fantasypros.com")
+ESPN_BASE_URL = os.getenv("ESPN_BASE_URL", "https://www.espn.com")
 
-    url = f"https://www.fantasypros.com/nfl/notes/{formatted_name}.php"
-    # print(url)
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+# Max in-flight calls per source when running the async pipeline. OpenAI
+# calls are further paced by the scheduler's per-model RPM/TPM budgets.
+SOURCE_CONCURRENCY = {
+    'reddit': 4,
+    'fantasypros': 8,
+    'espn': 8,
+    'openai': 16,
+}
 
-    p_tags = soup.find_all('p')
+# How fetched pages are turned into text (see html_extract)
+PARSE_OPTIONS = {'parser': DEFAULT_HTML_PARSER, 'targeted': False}
+# Pipeline-mode parser processes, and pages allowed between the start of
+# their fetch and the end of their parse (by default the page fetch limits,
+# so parsing never slows fetching down)
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+PARSE_QUEUE_SIZE = SOURCE_CONCURRENCY['fantasypros'] + SOURCE_CONCURRENCY['espn']
+# Match players against one fetch of recent subreddit posts before searching
+REDDIT_OPTIONS = {'bulk': False, 'bulk_limit': BULK_LIMIT}
 
-    res = []
-    for p in p_tags:
-        res.append(p.get_text().strip())
-    text_content = '\n'.join(res)
+def fetch_fantasy_pros_page(player):
+    formatted_name = fantasy_pros_slug(player)
 
-    return text_content
+    url = f"{FANTASY_PROS_BASE_URL}/nfl/notes/{formatted_name}.php"
+    # print(url)
+    return get_page_cache().fetch(url, 'fantasypros')
 
-def get_reddit_posts(player):
-    reddit = praw.Reddit(
-        client_id=os.getenv("REDDIT_CLIENT"),
-        client_secret=os.getenv("REDDIT_SECRET"),
-        user_agent="ff-copilot-bot/0.1 by /u/lilskanny"
-    )
-    subreddit = reddit.subreddit("fantasyfootball")
+def get_fantasy_pros_text(player):
+    return extract_fantasy_pros(fetch_fantasy_pros_page(player), **PARSE_OPTIONS)
 
-    
-    search_results = subreddit.search(player, limit=3, sort='relevance', time_filter="month")
-    
-    posts = []
-    for post in search_results:
-        post_data = {
-            'title': post.title,
-            'selftext': post.selftext,
-            'url': post.url,
-            'score': post.score,
-            'comments': []
-        }
-        
-        post.comments.replace_more(limit=0)  
-        for comment in post.comments.list()[:5]:
-            post_data['comments'].append(comment.body)
-        
-        posts.append(post_data)
-    
-    return posts
+def get_reddit_posts(player):
+    if REDDIT_OPTIONS['bulk']:
+        posts = get_reddit_index(REDDIT_OPTIONS['bulk_limit']).posts(player)
+        if posts:
+            return posts
+    return search_posts(player)
 
-def get_espn_text(playerId, playerName):
+def fetch_espn_page(playerId, playerName):
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -85,21 +85,20 @@ def get_espn_text(playerId, playerName):
 
     formatted_name = playerName.replace(' ', '-')
     formatted_name = formatted_name.lower()
-    url = f"https://www.espn.com/nfl/player/_/id/{playerId}/{formatted_name}"
+    url = f"{ESPN_BASE_URL}/nfl/player/_/id/{playerId}/{formatted_name}"
 
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    return get_page_cache().fetch(url, 'espn', headers=headers)
 
-    news = soup.find('div', class_='FantasyOverview__News pa4')
-    if news:
-        news_text = news.get_text(strip=True, separator='\n\n')
-    else:
-        news_text = "No news found"
-    return news_text
+def get_espn_text(playerId, playerName):
+    return extract_espn(fetch_espn_page(playerId, playerName), **PARSE_OPTIONS)
 
-def analyze_sentiment(player, reddit_text, fantasy_pros_text, espn_text):
-    client = OpenAI()
-    prompt = f"""
+SENTIMENT_MODELS = [
+    "gpt-4o-mini", 
+    "gpt-4.1-mini", 
+    "gpt-4.1-nano",
+]
+
+SENTIMENT_PROMPT = """
     For {player}, analyze the following fantasy football discussion and provide a sentiment score from 1-10:
 
     REDDIT DISCUSSION:
@@ -123,27 +122,45 @@ def analyze_sentiment(player, reddit_text, fantasy_pros_text, espn_text):
         "overall_sentiment_score": <1-10>,
     }}
     """
-    models = [
-        "gpt-4o-mini", 
-        "gpt-4.1-mini", 
-        "gpt-4.1-nano",
-    ]
-    for model in models:
-        try:
-            response = client.responses.create(
-                model=model,
-                input=prompt
-            )
-            return response.output_text
-        except Exception as e:
-            print(f"Error with model {model}: {e}")
-            continue
-
-    # print(response.output_text)
-    return "Error"
-
-def scrape_player_data(player):
-    posts = get_reddit_posts(player.name)
+
+def analyze_sentiment(player, reddit_text, fantasy_pros_text, espn_text):
+    texts, _ = compact_sources({
+        'reddit_text': reddit_text,
+        'fantasy_pros_text': fantasy_pros_text,
+        'espn_text': espn_text,
+    })
+    reddit_text, fantasy_pros_text, espn_text = texts['reddit_text'], texts['fantasy_pros_text'], texts['espn_text']
+
+    cache = get_sentiment_cache()
+    keys = {
+        model: sentiment_key(player, model, SENTIMENT_PROMPT, SENTIMENT_RESPONSE_FORMAT,
+                             reddit_text, fantasy_pros_text, espn_text)
+        for model in SENTIMENT_MODELS
+    }
+    cached = cache.get(keys.values())
+    if cached is not None:
+        return cached
+
+    prompt = SENTIMENT_PROMPT.format(
+        player=player,
+        reddit_text=reddit_text,
+        fantasy_pros_text=fantasy_pros_text,
+        espn_text=espn_text,
+    )
+    try:
+        model, response = get_openai_scheduler().create(
+            SENTIMENT_MODELS,
+            estimate_tokens(prompt) + OUTPUT_TOKENS_PER_PLAYER,
+            input=prompt,
+            text={"format": SENTIMENT_RESPONSE_FORMAT},
+        )
+    except Exception:
+        return "Error"
+    cache.put(keys[model], player, model, response.output_text)
+    return response.output_text
+
+def get_reddit_text(player_name):
+    posts = get_reddit_posts(player_name)
     reddit_text_parts = []
     for post in posts:
         reddit_text_parts.append(f"Title: {post['title']}")
@@ -153,18 +170,69 @@ def scrape_player_data(player):
             reddit_text_parts.append(f"Comments: {' '.join(post['comments'])}")
         reddit_text_parts.append("---")  
     
-    reddit_text = "\n".join(reddit_text_parts)
-    fantasy_pros_text = get_fantasy_pros_text(player.name)
-    espn_text = get_espn_text(player.playerId, player.name)
+    return "\n".join(reddit_text_parts)
 
-    return {
+def build_scraped_info(player, reddit_text, fantasy_pros_text, espn_text, sentiment):
+    scraped_info = {
         'name': player.name,
         'playerId': player.playerId,
         'reddit_text': reddit_text,
         'fantasy_pros_text': fantasy_pros_text,
         'espn_text': espn_text,
-        'sentiment': analyze_sentiment(player.name, reddit_text, fantasy_pros_text, espn_text),
+        'sentiment': sentiment,
     }
+    # Size of the source text in the sentiment prompt, before and after compaction
+    scraped_info.update(compact_sources(scraped_info)[1])
+    return scraped_info
+
+def scrape_player_data(player, with_sentiment=True):
+    reddit_text = get_reddit_text(player.name)
+    fantasy_pros_text = get_fantasy_pros_text(player.name)
+    espn_text = get_espn_text(player.playerId, player.name)
+    sentiment = None
+    if with_sentiment:
+        sentiment = analyze_sentiment(player.name, reddit_text, fantasy_pros_text, espn_text)
+
+    return build_scraped_info(player, reddit_text, fantasy_pros_text, espn_text, sentiment)
+
+async def scrape_player_data_async(player, limits, executor, with_sentiment=True, parse_executor=None):
+    """Async counterpart of scrape_player_data: the three sources are fetched
+    concurrently, then the sentiment call runs once all of them are back.
+
+    With a `parse_executor`, fetch threads only download pages; the HTML is
+    parsed in that (process) pool. limits['parse'] caps the pages that are
+    being fetched, waiting for a parser or being parsed at any one time.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def call(source, fn, *args):
+        async with limits[source]:
+            return await loop.run_in_executor(executor, fn, *args)
+
+    async def fetch_and_parse(source, fetch, extract, *args):
+        # The parse slot is taken before fetching, so fetched pages waiting
+        # for a parser can never outnumber the slots
+        async with limits['parse']:
+            content = await call(source, fetch, *args)
+            return await loop.run_in_executor(parse_executor, functools.partial(extract, **PARSE_OPTIONS), content)
+
+    if parse_executor is None:
+        fantasy_pros = call('fantasypros', get_fantasy_pros_text, player.name)
+        espn = call('espn', get_espn_text, player.playerId, player.name)
+    else:
+        fantasy_pros = fetch_and_parse('fantasypros', fetch_fantasy_pros_page, extract_fantasy_pros, player.name)
+        espn = fetch_and_parse('espn', fetch_espn_page, extract_espn, player.playerId, player.name)
+
+    reddit_text, fantasy_pros_text, espn_text = await asyncio.gather(
+        call('reddit', get_reddit_text, player.name),
+        fantasy_pros,
+        espn,
+    )
+    sentiment = None
+    if with_sentiment:
+        sentiment = await call('openai', analyze_sentiment, player.name, reddit_text, fantasy_pros_text, espn_text)
+
+    return build_scraped_info(player, reddit_text, fantasy_pros_text, espn_text, sentiment)
 
 def get_player_stats(player, on_team_id=None):
     return {
@@ -190,34 +258,221 @@ def get_player_stats(player, on_team_id=None):
     }
 
 
-if __name__ == "__main__":
-    league = League(league_id=600021088, year=2025)
+def score_sentiment_batched(scraped_info, mode='packed', token_budget=12000, max_players=10):
+    """Fill in the sentiment of every scraped row using batched LLM requests.
+
+    'packed' sends several players per request; 'batch-api' submits one
+    JSONL job to the provider's Batch endpoint. Players the batch could not
+    answer fall back to a single analyze_sentiment call.
+    """
+    items = [
+        compact_sources({
+            'player_id': info['playerId'],
+            'player': info['name'],
+            'reddit_text': info['reddit_text'],
+            'fantasy_pros_text': info['fantasy_pros_text'],
+            'espn_text': info['espn_text'],
+        })[0]
+        for info in scraped_info
+    ]
+    if mode == 'batch-api':
+        results = analyze_sentiment_batch_api(items, SENTIMENT_MODELS[0], token_budget, max_players, single_prompt=SENTIMENT_PROMPT)
+    else:
+        results = analyze_sentiment_packed(items, SENTIMENT_MODELS, token_budget, max_players, single_prompt=SENTIMENT_PROMPT)
 
+    for info in scraped_info:
+        sentiment = results.get(info['playerId'])
+        if sentiment is None:
+            sentiment = analyze_sentiment(info['name'], info['reddit_text'], info['fantasy_pros_text'], info['espn_text'])
+        info['sentiment'] = sentiment
+
+def run_serial(jobs, with_sentiment=True, checkpoint=None):
     stats = []
     scraped_info = []
-    for team in league.teams:
-        for player in team.roster:
-            player_data = get_player_stats(player, on_team_id=league.teams[0].team_id)
-            player_scraped_info = scrape_player_data(player)
-            print(player, " processed")
-            stats.append(player_data)
-            scraped_info.append(player_scraped_info)
-
-    for player in league.free_agents():
-        player_data = get_player_stats(player, on_team_id=None)
-        player_scraped_info = scrape_player_data(player)
+    for player, on_team_id in jobs:
+        player_data = get_player_stats(player, on_team_id=on_team_id)
+        player_scraped_info = scrape_player_data(player, with_sentiment)
+        if checkpoint is not None:
+            checkpoint.add(player_data, player_scraped_info)
         print(player, " processed")
         stats.append(player_data)
         scraped_info.append(player_scraped_info)
+    return stats, scraped_info
+
+async def run_pipeline(jobs, max_players=16, source_limits=None, with_sentiment=True, checkpoint=None,
+                       parse_workers=PARSE_WORKERS, parse_queue_size=PARSE_QUEUE_SIZE):
+    """Scrape many players at once, capping in-flight calls per source.
+
+    Results come back in job order, so the output tables match run_serial.
+    With a checkpoint, each player is recorded as soon as it finishes.
+    Pages are parsed in `parse_workers` processes (0 parses in the fetch
+    threads instead).
+    """
+    source_limits = {**SOURCE_CONCURRENCY, **(source_limits or {})}
+    limits = {source: asyncio.Semaphore(n) for source, n in source_limits.items()}
+    limits['parse'] = asyncio.Semaphore(parse_queue_size)
+    player_slots = asyncio.Semaphore(max_players)
+    parse_executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+
+    async def process(player, on_team_id):
+        async with player_slots:
+            player_data = get_player_stats(player, on_team_id=on_team_id)
+            player_scraped_info = await scrape_player_data_async(player, limits, executor, with_sentiment, parse_executor)
+            if checkpoint is not None:
+                checkpoint.add(player_data, player_scraped_info)
+            print(player, " processed")
+            return player_data, player_scraped_info
+
+    try:
+        with ThreadPoolExecutor(max_workers=sum(source_limits.values())) as executor:
+            results = await asyncio.gather(*(process(player, on_team_id) for player, on_team_id in jobs))
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    stats = [player_data for player_data, _ in results]
+    scraped_info = [player_scraped_info for _, player_scraped_info in results]
+    return stats, scraped_info
+
+def reuse_scraped_info(jobs, with_sentiment=True):
+    """Scraped rows for players whose text is already in the text store.
+
+    Sentiment is recomputed from the stored text, which the sentiment
+    cache answers without a model call when the text is unchanged.
+    """
+    if not jobs:
+        return []
+    texts = TextStore().get_many([player.playerId for player, _ in jobs])
+    scraped_info = []
+    for player, _ in jobs:
+        text = texts.loc[int(player.playerId)]
+        reddit_text, fantasy_pros_text, espn_text = text['reddit_text'], text['fantasy_pros_text'], text['espn_text']
+        sentiment = None
+        if with_sentiment:
+            sentiment = analyze_sentiment(player.name, reddit_text, fantasy_pros_text, espn_text)
+        scraped_info.append(build_scraped_info(player, reddit_text, fantasy_pros_text, espn_text, sentiment))
+    return scraped_info
 
+def run_delta(jobs, scrape, snapshot, max_age=DEFAULT_MAX_AGE, with_sentiment=True):
+    """Scrape only players whose ESPN state changed since the last run.
+
+    `scrape` runs the usual serial or pipeline scrape over a list of jobs.
+    Players with an unchanged fingerprint and a recent enough scrape reuse
+    their stored text. Returns stats and scraped rows in job order and
+    updates `snapshot` in place.
+    """
+    stats = [get_player_stats(player, on_team_id=on_team_id) for player, on_team_id in jobs]
+    changed, unchanged = split_changed(stats, snapshot, TextStore().player_ids(), max_age)
+    print(f"Delta scrape: {len(changed)} changed or stale, {len(unchanged)} reused")
+
+    _, fresh = scrape([jobs[i] for i in changed])
+    reused = reuse_scraped_info([jobs[i] for i in unchanged], with_sentiment)
+    scraped_info = [None] * len(jobs)
+    for index, info in zip(changed + unchanged, fresh + reused):
+        scraped_info[index] = info
+
+    update_snapshot(snapshot, stats, changed)
+    return stats, scraped_info
+
+def get_league_jobs(league):
+    jobs = []
+    for team in league.teams:
+        for player in team.roster:
+            jobs.append((player, league.teams[0].team_id))
+    for player in league.free_agents():
+        jobs.append((player, None))
+    return jobs
+
+def write_csv(df, path):
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
+def write_outputs(stats, scraped_info):
     df_stats = pd.DataFrame(stats)
     df_stats.set_index('playerId', inplace=True)
     df_stats.index.name = 'playerId'
 
-    df_stats.to_csv('player_stats.csv')
+    write_csv(df_stats, 'player_stats.csv')
 
-    df_scraped_info = pd.DataFrame(scraped_info)
+    df_scraped_info = expand_sentiment(pd.DataFrame(scraped_info))
     df_scraped_info.set_index('playerId', inplace=True)
     df_scraped_info.index.name = 'playerId'
 
-    df_scraped_info.to_csv('player_scraped_info.csv')
\ No newline at end of file
+    write_csv(df_scraped_info, 'player_scraped_info.csv')
+
+    write_players(build_players_table(df_stats, df_scraped_info))
+    write_weekly_stats(build_weekly_stats(stats))
+    TextStore().write(scraped_info, full=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape ESPN league players and score sentiment")
+    parser.add_argument('--pipeline', action='store_true', help="run the concurrent asyncio pipeline instead of one player at a time")
+    parser.add_argument('--max-players', type=int, default=16, help="players processed at once in pipeline mode")
+    for source, default in SOURCE_CONCURRENCY.items():
+        parser.add_argument(f'--{source}-concurrency', type=int, default=default, help=f"max concurrent {source} calls in pipeline mode")
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS, help="HTML parser processes in pipeline mode (0 parses in the fetch threads)")
+    parser.add_argument('--parse-queue-size', type=int, default=PARSE_QUEUE_SIZE, help="pages fetched or waiting for a parser at once in pipeline mode")
+    parser.add_argument('--html-parser', choices=HTML_PARSERS, default=DEFAULT_HTML_PARSER, help="BeautifulSoup parser backend")
+    parser.add_argument('--targeted-parse', action='store_true', help="build only the elements the extractors read instead of the full page tree")
+    parser.add_argument('--reddit-bulk', action='store_true', help="match players against recent r/fantasyfootball posts fetched once, searching only for players with no match")
+    parser.add_argument('--reddit-bulk-limit', type=int, default=BULK_LIMIT, help="recent submissions fetched in --reddit-bulk mode")
+    for source, default in SOURCE_TOKEN_BUDGETS.items():
+        parser.add_argument(f'--{source}-token-budget', type=int, default=default, help=f"max estimated tokens of {source} text in a sentiment prompt")
+    parser.add_argument('--batch-sentiment', choices=['packed', 'batch-api'], help="score sentiment in batches after scraping instead of once per player")
+    parser.add_argument('--batch-token-budget', type=int, default=12000, help="max prompt + expected output tokens per sentiment batch")
+    parser.add_argument('--batch-max-players', type=int, default=10, help="max players per sentiment batch")
+    parser.add_argument('--checkpoint', action='store_true', help="record each finished player and resume an interrupted run")
+    parser.add_argument('--checkpoint-path', default=CHECKPOINT_PATH, help="checkpoint database used with --checkpoint")
+    parser.add_argument('--checkpoint-max-age-hours', type=float, default=CHECKPOINT_MAX_AGE / 3600, help="discard a checkpoint started longer ago than this instead of resuming it")
+    parser.add_argument('--fresh', action='store_true', help="discard any existing checkpoint and start the run from scratch")
+    parser.add_argument('--delta', action='store_true', help="only re-scrape players whose ESPN state changed since the last run")
+    parser.add_argument('--max-age-hours', type=float, default=DEFAULT_MAX_AGE / 3600, help="re-scrape players last scraped longer ago than this in delta mode")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    league = League(league_id=600021088, year=2025)
+    jobs = get_league_jobs(league)
+    with_sentiment = args.batch_sentiment is None
+    PARSE_OPTIONS.update(parser=args.html_parser, targeted=args.targeted_parse)
+    REDDIT_OPTIONS.update(bulk=args.reddit_bulk, bulk_limit=args.reddit_bulk_limit)
+    SOURCE_TOKEN_BUDGETS.update({source: getattr(args, f'{source}_token_budget') for source in SOURCE_TOKEN_BUDGETS})
+
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint_path, league.league_id, league.year,
+                                args.checkpoint_max_age_hours * 3600, args.fresh)
+    if args.pipeline:
+        source_limits = {source: getattr(args, f'{source}_concurrency') for source in SOURCE_CONCURRENCY}
+        scrape = lambda jobs: asyncio.run(run_pipeline(jobs, args.max_players, source_limits, with_sentiment, checkpoint,
+                                                       args.parse_workers, args.parse_queue_size))
+    else:
+        scrape = lambda jobs: run_serial(jobs, with_sentiment, checkpoint)
+    if checkpoint is not None:
+        scrape_all = scrape
+        scrape = lambda jobs: run_checkpointed(jobs, scrape_all, checkpoint)
+
+    if args.delta:
+        snapshot = load_snapshot()
+        stats, scraped_info = run_delta(jobs, scrape, snapshot, args.max_age_hours * 3600, with_sentiment)
+    else:
+        stats, scraped_info = scrape(jobs)
+
+    if not with_sentiment:
+        score_sentiment_batched(scraped_info, args.batch_sentiment, args.batch_token_budget, args.batch_max_players)
+
+    write_outputs(stats, scraped_info)
+    if args.delta:
+        save_snapshot(snapshot)
+    if checkpoint is not None:
+        # Outputs are written, so the next run starts from scratch
+        checkpoint.clear()
+    get_client().report()
+    get_page_cache().report()
+    get_sentiment_cache().report()
+    get_openai_scheduler().report()
+    before = sum(info.get('prompt_tokens_before', 0) for info in scraped_info)
+    after = sum(info.get('prompt_tokens_after', 0) for info in scraped_info)
+    print(f"Prompt source text: {before} tokens before compaction, {after} after")
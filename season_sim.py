@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lineup import optimize_roster
+from weekly_stats import consistency, load_weekly_stats
+
+
+DEFAULT_SIMULATIONS = 20000
+# Simulations per task; results depend only on the seed, not on the worker count
+CHUNK_SIZE = 5000
+SIM_WORKERS = min(4, os.cpu_count() or 1)
+# Players with fewer games use DEFAULT_CV x projection as their weekly spread
+MIN_GAMES = 3
+DEFAULT_CV = 0.5
+
+
+def _remaining_weeks(league, start):
+    """Regular season weeks from `start` that some team has not finished."""
+    weeks = []
+    for week in range(start, league.settings.reg_season_count + 1):
+        outcomes = [getattr(team, 'outcomes', None) or [] for team in league.teams]
+        if any(len(team_outcomes) < week or team_outcomes[week - 1] not in ('W', 'L', 'T')
+               for team_outcomes in outcomes):
+            weeks.append(week)
+    return weeks
+
+
+def season_inputs(league, week=None):
+    """Arrays describing the rest of the regular season.
+
+    Each team starts its optimal lineup every remaining week. A starter
+    scores normally around their weekly projection, with the standard
+    deviation of their actual weekly points (DEFAULT_CV x projection with
+    fewer than MIN_GAMES games). Returns a dict with the simulated `weeks`,
+    `means` and `stds` (weeks x teams x seats), `opponents` (weeks x teams,
+    -1 on a bye), current `wins` (ties count half) and `points` per team.
+    """
+    if week is None:
+        week = getattr(league, 'current_week', None) or 1
+    teams = league.teams
+    weeks = _remaining_weeks(league, week)
+    slot_counts = league.settings.position_slot_counts
+    team_index = {team.team_id: index for index, team in enumerate(teams)}
+
+    lineups = [[optimize_roster(team.roster, slot_counts, w)['lineup'] for team in teams] for w in weeks]
+    player_ids = {int(player.playerId) for week_lineups in lineups for lineup in week_lineups
+                  for _, player, _ in lineup if player is not None}
+    history = consistency(load_weekly_stats(player_ids=player_ids, stats=['points'], kind='actual'))
+    spread = history.loc[history['games'] >= MIN_GAMES, 'std']
+
+    n_seats = max((len(lineup) for week_lineups in lineups for lineup in week_lineups), default=0)
+    means = np.zeros((len(weeks), len(teams), n_seats))
+    stds = np.zeros_like(means)
+    opponents = np.full((len(weeks), len(teams)), -1)
+    for w, (sim_week, week_lineups) in enumerate(zip(weeks, lineups)):
+        for t, (team, lineup) in enumerate(zip(teams, week_lineups)):
+            for s, (_, player, projection) in enumerate(lineup):
+                if player is None or projection <= 0:
+                    continue
+                means[w, t, s] = projection
+                stds[w, t, s] = spread.get(int(player.playerId), DEFAULT_CV * projection)
+            schedule = getattr(team, 'schedule', None) or []
+            if len(schedule) >= sim_week:
+                opponents[w, t] = team_index.get(schedule[sim_week - 1].team_id, -1)
+
+    return {
+        'weeks': weeks,
+        'means': means,
+        'stds': stds,
+        'opponents': opponents,
+        'wins': np.array([team.wins + 0.5 * (getattr(team, 'ties', 0) or 0) for team in teams], dtype=float),
+        'points': np.array([team.points_for for team in teams], dtype=float),
+    }
+
+
+def _simulate_chunk(inputs, playoff_teams, n_sims, seed):
+    """Totals over `n_sims` simulated seasons: next-week wins, season wins, playoff and top seeds."""
+    rng = np.random.default_rng(seed)
+    means, stds, opponents = inputs['means'], inputs['stds'], inputs['opponents']
+    n_weeks, n_teams = opponents.shape
+    # Simulations x weeks x teams team scores
+    scores = np.clip(rng.normal(means, stds, size=(n_sims,) + means.shape), 0, None).sum(axis=3)
+    has_game = opponents >= 0
+    opponent_scores = scores[:, np.arange(n_weeks)[:, None], np.where(has_game, opponents, 0)]
+    results = np.where(has_game, (scores > opponent_scores) + 0.5 * (scores == opponent_scores), 0.0)
+
+    wins = inputs['wins'] + results.sum(axis=1)
+    points = inputs['points'] + scores.sum(axis=1)
+    # Seed by wins, then points for; order[i] lists sim i's teams best first
+    order = np.lexsort((-points, -wins))
+    seeds = np.empty_like(order)
+    np.put_along_axis(seeds, order, np.arange(n_teams)[None, :], axis=1)
+    return {
+        'next_wins': results[:, 0].sum(axis=0) if n_weeks else np.zeros(n_teams),
+        'wins': wins.sum(axis=0),
+        'playoffs': (seeds < playoff_teams).sum(axis=0),
+        'top_seed': (seeds == 0).sum(axis=0),
+    }
+
+
+def simulate_season(league, n_sims=DEFAULT_SIMULATIONS, seed=None, workers=SIM_WORKERS, week=None):
+    """Monte Carlo odds for the next matchup and the rest of the regular season.
+
+    Simulations run in chunks of CHUNK_SIZE, each with its own child of
+    SeedSequence(seed), spread over `workers` processes (inline with one
+    worker). The same seed gives the same result for any worker count.
+
+    Returns a frame indexed by team_id with team_name, wins, opponent,
+    next_win_prob (ties count half), projected_wins, playoff_prob and
+    top_seed_prob, best playoff odds first. Playoff seeding ranks teams
+    by wins, then points for.
+    """
+    if n_sims < 1:
+        raise ValueError(f"n_sims must be at least 1, got {n_sims}")
+    inputs = season_inputs(league, week)
+    playoff_teams = league.settings.playoff_team_count
+    sizes = [min(CHUNK_SIZE, n_sims - start) for start in range(0, n_sims, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([inputs] * len(sizes), [playoff_teams] * len(sizes), sizes, seeds)
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            chunks = list(pool.map(_simulate_chunk, *args))
+    else:
+        chunks = list(map(_simulate_chunk, *args))
+    totals = {key: sum(chunk[key] for chunk in chunks) / n_sims for key in chunks[0]}
+
+    teams = league.teams
+    opponents = inputs['opponents'][0] if inputs['weeks'] else np.full(len(teams), -1)
+    outlook = pd.DataFrame({
+        'team_id': [team.team_id for team in teams],
+        'team_name': [team.team_name for team in teams],
+        'wins': [team.wins for team in teams],
+        'opponent': [teams[opponent].team_name if opponent >= 0 else None for opponent in opponents],
+        'next_win_prob': np.where(opponents >= 0, totals['next_wins'], np.nan),
+        'projected_wins': totals['wins'],
+        'playoff_prob': totals['playoffs'],
+        'top_seed_prob': totals['top_seed'],
+    }).set_index('team_id')
+    return outlook.sort_values(['playoff_prob', 'projected_wins'], ascending=False)
@@ -0,0 +1,229 @@
+import json
+import time
+
+from openai_scheduler import get_openai_client, get_openai_scheduler
+from sentiment_cache import get_sentiment_cache, sentiment_key
+from sentiment_schema import BATCH_RESPONSE_FORMAT, SENTIMENT_RESPONSE_FORMAT, validate_sentiment
+
+
+BATCH_PROMPT = """
+    Analyze the fantasy football discussion for each player below and provide sentiment scores from 1-10.
+
+    {players}
+
+    Respond with a JSON object {{"players": [...]}} holding one entry per player, each with its player id (as a string) and:
+    {{
+        "player_id": "<player id>",
+        "reddit_summary": "brief analysis", # 1-2 sentences
+        "reddit_sentiment_score": <1-10>, # 1-10
+        "fantasypros_summary": "brief analysis", # 1-2 sentences
+        "fantasypros_sentiment_score": <1-10>, # 1-10
+        "espn_summary": "brief analysis", # 1-2 sentences
+        "espn_sentiment_score": <1-10>, # 1-10
+        "overall_summary": "brief analysis", # 2-3 sentences
+        "overall_sentiment_score": <1-10>,
+    }}
+    """
+
+PLAYER_SECTION = """
+    === PLAYER {player_id}: {player} ===
+    REDDIT DISCUSSION:
+    {reddit_text}
+
+    FANTASYPROS ANALYSIS:
+    {fantasy_pros_text}
+
+    ESPN ANALYSIS:
+    {espn_text}
+"""
+
+# Rough allowance for one player's JSON answer in the response
+OUTPUT_TOKENS_PER_PLAYER = 300
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def player_section(item):
+    return PLAYER_SECTION.format(**item)
+
+
+def pack_batches(items, token_budget=12000, max_players=10):
+    """Greedily pack player items into batches that fit `token_budget`.
+
+    Each item is a dict with player_id, player, reddit_text, fantasy_pros_text
+    and espn_text. The budget covers the prompt plus the expected output; a
+    player that does not fit on its own still gets a batch of one.
+    """
+    overhead = estimate_tokens(BATCH_PROMPT)
+    batches = []
+    current = []
+    used = overhead
+    for item in items:
+        cost = estimate_tokens(player_section(item)) + OUTPUT_TOKENS_PER_PLAYER
+        if current and (used + cost > token_budget or len(current) >= max_players):
+            batches.append(current)
+            current = []
+            used = overhead
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(batch):
+    return BATCH_PROMPT.format(players="".join(player_section(item) for item in batch))
+
+
+def split_batch_response(batch, output_text):
+    """Map each player_id in `batch` to its JSON sentiment string.
+
+    Players missing from the response, entries that fail schema validation
+    and responses that are not valid JSON are left out so the caller can
+    fall back to single-player calls.
+    """
+    text = output_text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.endswith('```'):
+        text = text[:-3]
+    try:
+        data = json.loads(text.strip())
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get('players'), list):
+        return {}
+
+    entries = {}
+    for entry in data['players']:
+        if isinstance(entry, dict) and 'player_id' in entry:
+            entries[str(entry['player_id'])] = validate_sentiment(entry)
+
+    results = {}
+    for item in batch:
+        entry = entries.get(str(item['player_id']))
+        if entry is not None:
+            results[item['player_id']] = json.dumps(entry)
+    return results
+
+
+def _cache_keys(item, models, template=BATCH_PROMPT, response_format=BATCH_RESPONSE_FORMAT):
+    return {
+        model: sentiment_key(item['player'], model, template, response_format,
+                             item['reddit_text'], item['fantasy_pros_text'], item['espn_text'])
+        for model in models
+    }
+
+
+def _split_cached(items, models, single_prompt):
+    """Separate items already in the sentiment cache from those still to score.
+
+    Responses stored by single-player calls (keyed on `single_prompt`) count
+    as hits too, so switching between modes does not re-score anyone.
+    """
+    cache = get_sentiment_cache()
+    results = {}
+    pending = []
+    for item in items:
+        keys = list(_cache_keys(item, models).values())
+        if single_prompt:
+            keys += _cache_keys(item, models, single_prompt, SENTIMENT_RESPONSE_FORMAT).values()
+        cached = cache.get(keys)
+        if cached is not None:
+            results[item['player_id']] = cached
+        else:
+            pending.append(item)
+    return results, pending
+
+
+def analyze_sentiment_packed(items, models, token_budget=12000, max_players=10, scheduler=None, single_prompt=None):
+    """Score many players with one request per packed batch.
+
+    Returns {player_id: sentiment_json}. Cached players are answered from the
+    sentiment cache; the rest are packed under `token_budget` and all batches
+    are handed to the OpenAI scheduler at once, which runs them concurrently
+    and falls back across `models` like analyze_sentiment does.
+    """
+    cache = get_sentiment_cache()
+    results, pending = _split_cached(items, models, single_prompt)
+
+    scheduler = scheduler or get_openai_scheduler()
+    submitted = []
+    for batch in pack_batches(pending, token_budget, max_players):
+        prompt = build_batch_prompt(batch)
+        tokens = estimate_tokens(prompt) + OUTPUT_TOKENS_PER_PLAYER * len(batch)
+        submitted.append((batch, scheduler.submit(models, tokens, input=prompt, text={"format": BATCH_RESPONSE_FORMAT})))
+
+    for batch, future in submitted:
+        try:
+            model, response = future.result()
+        except Exception:
+            continue
+        batch_results = split_batch_response(batch, response.output_text)
+        for item in batch:
+            if item['player_id'] in batch_results:
+                cache.put(_cache_keys(item, [model])[model], item['player'], model, batch_results[item['player_id']])
+        results.update(batch_results)
+    return results
+
+
+def analyze_sentiment_batch_api(items, model, token_budget=12000, max_players=10,
+                                client=None, poll_interval=30, single_prompt=None):
+    """Score players through the provider's asynchronous Batch API.
+
+    Packed prompts are written as a JSONL job (one /v1/responses request per
+    batch), submitted, polled until the job finishes, and the output file is
+    split back into {player_id: sentiment_json}.
+    """
+    cache = get_sentiment_cache()
+    results, pending = _split_cached(items, [model], single_prompt)
+    if not pending:
+        return results
+
+    client = client or get_openai_client()
+    batches = pack_batches(pending, token_budget, max_players)
+    lines = []
+    for i, batch in enumerate(batches):
+        lines.append(json.dumps({
+            'custom_id': f'batch-{i}',
+            'method': 'POST',
+            'url': '/v1/responses',
+            'body': {
+                'model': model,
+                'input': build_batch_prompt(batch),
+                'text': {'format': BATCH_RESPONSE_FORMAT},
+            },
+        }))
+    input_file = client.files.create(file=('sentiment_batch.jsonl', "\n".join(lines).encode('utf-8')), purpose='batch')
+    job = client.batches.create(input_file_id=input_file.id, endpoint='/v1/responses', completion_window='24h')
+
+    while job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+        time.sleep(poll_interval)
+        job = client.batches.retrieve(job.id)
+    if job.status != 'completed' or not job.output_file_id:
+        print(f"Batch job {job.id} ended with status {job.status}")
+        return results
+
+    output = client.files.content(job.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        batch = batches[int(record['custom_id'].split('-')[1])]
+        body = (record.get('response') or {}).get('body') or {}
+        output_text = "".join(
+            part.get('text', '')
+            for message in body.get('output', [])
+            if message.get('type') == 'message'
+            for part in message.get('content', [])
+            if part.get('type') == 'output_text'
+        )
+        batch_results = split_batch_response(batch, output_text)
+        for item in batch:
+            if item['player_id'] in batch_results:
+                cache.put(_cache_keys(item, [model])[model], item['player'], model, batch_results[item['player_id']])
+        results.update(batch_results)
+    return results
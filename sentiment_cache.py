@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from sentiment_schema import parse_sentiment_text
+
+
+def sentiment_key(player, model, prompt_template, response_format, reddit_text, fantasy_pros_text, espn_text):
+    """Hash of everything that determines a sentiment response.
+
+    `response_format` is the request's `text.format`, so responses cached
+    before a schema change (or free-form ones) are never served for it.
+    """
+    payload = json.dumps([player, model, prompt_template, response_format, reddit_text, fantasy_pros_text, espn_text],
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """SQLite memo of model responses, so unchanged source text is never re-scored."""
+
+    def __init__(self, path='sentiment_cache.db'):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment (
+                key TEXT PRIMARY KEY,
+                player TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, keys):
+        """Return the first stored response among `keys` (in order), or None."""
+        with self.lock:
+            for key in keys:
+                row = self.conn.execute("SELECT response FROM sentiment WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, player, model, response):
+        """Store `response` unless it fails parse_sentiment_text; returns whether it was stored."""
+        if parse_sentiment_text(response) is None:
+            return False
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sentiment (key, player, model, response, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, player, model, response, time.time()),
+            )
+            self.conn.commit()
+        return True
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        print(f"Sentiment cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache():
+    """Process-wide SentimentCache at SENTIMENT_CACHE_PATH (default sentiment_cache.db)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SentimentCache(os.getenv("SENTIMENT_CACHE_PATH", "sentiment_cache.db"))
+        return _cache
@@ -0,0 +1,123 @@
+import json
+
+import pandas as pd
+
+
+SCORE_FIELDS = [
+    'reddit_sentiment_score',
+    'fantasypros_sentiment_score',
+    'espn_sentiment_score',
+    'overall_sentiment_score',
+]
+SUMMARY_FIELDS = [
+    'reddit_summary',
+    'fantasypros_summary',
+    'espn_summary',
+    'overall_summary',
+]
+SENTIMENT_FIELDS = SUMMARY_FIELDS + SCORE_FIELDS
+
+# Column dtypes for the typed sentiment columns in the player tables
+SENTIMENT_DTYPES = {
+    **{field: 'Int8' for field in SCORE_FIELDS},
+    **{field: 'string' for field in SUMMARY_FIELDS},
+}
+
+SENTIMENT_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        **{field: {'type': 'string'} for field in SUMMARY_FIELDS},
+        **{field: {'type': 'integer', 'minimum': 1, 'maximum': 10} for field in SCORE_FIELDS},
+    },
+    'required': SENTIMENT_FIELDS,
+    'additionalProperties': False,
+}
+
+# `text.format` for a single-player Responses API call
+SENTIMENT_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'name': 'player_sentiment',
+    'schema': SENTIMENT_SCHEMA,
+    'strict': True,
+}
+
+# `text.format` for a packed multi-player call: {"players": [{"player_id": ..., <fields>}]}
+BATCH_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'name': 'player_sentiment_batch',
+    'schema': {
+        'type': 'object',
+        'properties': {
+            'players': {
+                'type': 'array',
+                'items': {
+                    **SENTIMENT_SCHEMA,
+                    'properties': {'player_id': {'type': 'string'}, **SENTIMENT_SCHEMA['properties']},
+                    'required': ['player_id'] + SENTIMENT_FIELDS,
+                },
+            },
+        },
+        'required': ['players'],
+        'additionalProperties': False,
+    },
+    'strict': True,
+}
+
+
+def validate_sentiment(data):
+    """Return `data` reduced to the schema fields, or None if it does not conform.
+
+    Scores must be integers from 1 to 10 (integral floats and digit strings
+    are accepted from older free-form responses); summaries must be strings.
+    """
+    if not isinstance(data, dict):
+        return None
+    result = {}
+    for field in SCORE_FIELDS:
+        score = data.get(field)
+        if isinstance(score, str) and score.strip().isdigit():
+            score = int(score)
+        if isinstance(score, float) and score.is_integer():
+            score = int(score)
+        if isinstance(score, bool) or not isinstance(score, int) or not 1 <= score <= 10:
+            return None
+        result[field] = score
+    for field in SUMMARY_FIELDS:
+        summary = data.get(field)
+        if not isinstance(summary, str):
+            return None
+        result[field] = summary
+    return result
+
+
+def parse_sentiment_text(sentiment_text):
+    """Parse and validate one model response; None if it is missing or malformed."""
+    if not isinstance(sentiment_text, str):
+        return None
+    text = sentiment_text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.endswith('```'):
+        text = text[:-3]
+    try:
+        return validate_sentiment(json.loads(text.strip()))
+    except json.JSONDecodeError:
+        return None
+
+
+def expand_sentiment(df, column='sentiment'):
+    """Replace the raw `column` of model responses with typed sentiment columns."""
+    parsed = [parse_sentiment_text(text) or {} for text in df[column]]
+    df = df.drop(columns=[column])
+    for field in SENTIMENT_FIELDS:
+        df[field] = pd.array([entry.get(field) for entry in parsed], dtype=SENTIMENT_DTYPES[field])
+    return df
+
+
+def row_sentiment(row):
+    """Collect the typed sentiment columns of a player row (None if there are none)."""
+    sentiment_data = {}
+    for field in SENTIMENT_FIELDS:
+        if field in row and pd.notna(row[field]):
+            sentiment_data[field] = row[field]
+    return sentiment_data or None
@@ -0,0 +1,61 @@
+"""Small espn_api-like leagues for tests."""
+import random
+from types import SimpleNamespace
+
+
+POSITION_SLOTS = {
+    'QB': ['QB', 'OP', 'BE', 'IR'],
+    'RB': ['RB', 'RB/WR', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+    'WR': ['WR', 'RB/WR', 'WR/TE', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+    'TE': ['TE', 'WR/TE', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+    'K': ['K', 'BE', 'IR'],
+    'D/ST': ['D/ST', 'BE', 'IR'],
+}
+SLOT_COUNTS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1, 'D/ST': 1, 'K': 1, 'BE': 6, 'IR': 1}
+
+
+def make_player(rng, player_id, position):
+    stats = {}
+    for week in range(1, 15):
+        stats[week] = {'projected_points': round(rng.uniform(2, 25), 1)}
+        if week < 9:
+            stats[week]['points'] = round(rng.uniform(0, 30), 1)
+    return SimpleNamespace(
+        name=f"Player {player_id}", playerId=player_id, position=position,
+        eligibleSlots=POSITION_SLOTS[position], lineupSlot='BE', stats=stats,
+        injuryStatus=rng.choice(['ACTIVE', 'ACTIVE', 'ACTIVE', 'OUT']),
+        projected_avg_points=round(rng.uniform(2, 20), 1), percent_owned=round(rng.uniform(0, 100), 1),
+    )
+
+
+def make_league(n_teams=4, per_team=12, free_agents=20, seed=0, current_week=9):
+    """League with a round-robin schedule and weeks before `current_week` played."""
+    rng = random.Random(seed)
+    positions = list(POSITION_SLOTS)
+    players = [make_player(rng, 1000 + i, positions[i % len(positions)])
+               for i in range(n_teams * per_team + free_agents)]
+    teams = [
+        SimpleNamespace(team_id=t + 1, team_name=f"Team {t + 1}", roster=players[t * per_team:(t + 1) * per_team],
+                        wins=0, losses=0, ties=0, points_for=0.0, schedule=[], outcomes=[])
+        for t in range(n_teams)
+    ]
+    for week in range(14):
+        order = [0] + [(i + week) % (n_teams - 1) + 1 for i in range(n_teams - 1)]
+        for i in range(n_teams // 2):
+            home, away = teams[order[i]], teams[order[-1 - i]]
+            home.schedule.append(away)
+            away.schedule.append(home)
+            if week + 1 < current_week:
+                winner, loser = (home, away) if rng.random() < 0.5 else (away, home)
+                winner.wins += 1
+                loser.losses += 1
+                winner.outcomes.append('W')
+                loser.outcomes.append('L')
+                home.points_for += rng.uniform(80, 140)
+                away.points_for += rng.uniform(80, 140)
+            else:
+                home.outcomes.append('U')
+                away.outcomes.append('U')
+    settings = SimpleNamespace(position_slot_counts=SLOT_COUNTS, reg_season_count=14, playoff_team_count=2)
+    league = SimpleNamespace(league_id=1, year=2025, current_week=current_week, settings=settings, teams=teams)
+    return league, players[n_teams * per_team:]
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from checkpoint import Checkpoint, run_checkpointed
+
+
+def make_jobs(n):
+    return [(SimpleNamespace(playerId=i, name=f"Player {i}"), None) for i in range(n)]
+
+
+def fake_scrape(checkpoint, scraped, fail_after=None):
+    def scrape(jobs):
+        for count, (player, _) in enumerate(jobs):
+            if fail_after is not None and count == fail_after:
+                raise RuntimeError('crash')
+            scraped.append(player.playerId)
+            checkpoint.add({'playerId': player.playerId}, {'playerId': player.playerId, 'name': player.name})
+    return scrape
+
+
+def test_resume_scrapes_only_pending_players(tmp_path):
+    path = str(tmp_path / 'checkpoint.db')
+    jobs = make_jobs(6)
+    scraped = []
+    checkpoint = Checkpoint(path, 1, 2025)
+    try:
+        run_checkpointed(jobs, fake_scrape(checkpoint, scraped, fail_after=4), checkpoint)
+    except RuntimeError:
+        pass
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path, 1, 2025)
+    stats, scraped_info = run_checkpointed(jobs, fake_scrape(checkpoint, scraped), checkpoint)
+    assert scraped == [0, 1, 2, 3, 4, 5]
+    assert [row['playerId'] for row in stats] == [0, 1, 2, 3, 4, 5]
+    assert [row['name'] for row in scraped_info] == [f"Player {i}" for i in range(6)]
+
+
+def test_stale_or_foreign_checkpoint_is_discarded(tmp_path):
+    path = str(tmp_path / 'checkpoint.db')
+    checkpoint = Checkpoint(path, 1, 2025)
+    checkpoint.add({'playerId': 7}, {'playerId': 7})
+    checkpoint.close()
+
+    assert list(Checkpoint(path, 1, 2025).load()) == [7]
+    assert Checkpoint(path, 2, 2025).load() == {}
+
+    checkpoint = Checkpoint(path, 2, 2025)
+    checkpoint.add({'playerId': 7}, {'playerId': 7})
+    checkpoint.close()
+    assert Checkpoint(path, 2, 2025, fresh=True).load() == {}
+
+    checkpoint = Checkpoint(path, 2, 2025)
+    checkpoint.add({'playerId': 7}, {'playerId': 7})
+    checkpoint.close()
+    assert Checkpoint(path, 2, 2025, max_age=-1).load() == {}
@@ -0,0 +1,90 @@
+import pytest
+
+from delta_scrape import (DEFAULT_MAX_AGE, PERCENT_BUCKET, load_snapshot, player_fingerprint, save_snapshot,
+                          split_changed, update_snapshot)
+
+
+NOW = 1_000_000.0
+
+
+def player(player_id, **fields):
+    return {'playerId': player_id, 'name': f"Player {player_id}", 'injuryStatus': 'ACTIVE', 'lineupSlot': 'RB',
+            'proTeam': 'KC', 'position': 'RB', 'projected_avg_points': 12.3, 'percent_owned': 61.0,
+            'percent_started': 40.0, 'stats': {}, **fields}
+
+
+@pytest.fixture
+def stats():
+    return [player(1), player(2), player(3), player(4)]
+
+
+@pytest.fixture
+def snapshot(stats):
+    return update_snapshot({}, stats, range(len(stats)), now=NOW)
+
+
+def test_unchanged_players_are_skipped(stats, snapshot):
+    assert split_changed(stats, snapshot, {1, 2, 3, 4}, now=NOW + 60) == ([], [0, 1, 2, 3])
+
+
+def test_new_player_is_scraped(stats, snapshot):
+    stats.append(player(5))
+    assert split_changed(stats, snapshot, {1, 2, 3, 4, 5}, now=NOW) == ([4], [0, 1, 2, 3])
+
+
+@pytest.mark.parametrize('field, value', [
+    ('injuryStatus', 'QUESTIONABLE'),
+    ('lineupSlot', 'BE'),
+    ('proTeam', 'BUF'),
+    ('projected_avg_points', 14.0),
+    ('percent_owned', 61.0 + PERCENT_BUCKET),
+])
+def test_changed_player_is_scraped(stats, snapshot, field, value):
+    stats[1][field] = value
+    assert split_changed(stats, snapshot, {1, 2, 3, 4}, now=NOW) == ([1], [0, 2, 3])
+
+
+def test_stale_player_is_scraped(stats, snapshot):
+    snapshot['3']['scraped_at'] = NOW - DEFAULT_MAX_AGE - 1
+    assert split_changed(stats, snapshot, {1, 2, 3, 4}, now=NOW) == ([2], [0, 1, 3])
+    assert split_changed(stats, snapshot, {1, 2, 3, 4}, max_age=2 * DEFAULT_MAX_AGE, now=NOW) == ([], [0, 1, 2, 3])
+
+
+def test_player_missing_from_text_store_is_scraped(stats, snapshot):
+    assert split_changed(stats, snapshot, {1, 2, 4}, now=NOW) == ([2], [0, 1, 3])
+
+
+@pytest.mark.parametrize('before, after, same', [
+    (61.0, 62.4, True),
+    (61.0, 59.9, True),
+    (61.0, 63.0, False),
+    (0.0, 2.0, True),
+    (0.0, 3.0, False),
+    (None, 0.0, False),
+])
+def test_percent_owned_is_bucketed(before, after, same):
+    assert (player_fingerprint(player(1, percent_owned=before))
+            == player_fingerprint(player(1, percent_owned=after))) == same
+
+
+def test_fingerprint_ignores_other_fields_and_float_noise():
+    base = player_fingerprint(player(1))
+    assert player_fingerprint(player(1, name='Someone Else', stats={'1': {'points': 3}})) == base
+    assert player_fingerprint(player(1, projected_avg_points=12.3000001)) == base
+    assert player_fingerprint(player(1, projected_avg_points=12.4)) != base
+
+
+def test_update_snapshot_records_only_rescraped_rows(stats, snapshot):
+    stats[0]['injuryStatus'] = 'OUT'
+    changed, _ = split_changed(stats, snapshot, {1, 2, 3, 4}, now=NOW + 10)
+    update_snapshot(snapshot, stats, changed, now=NOW + 10)
+    assert snapshot['1']['scraped_at'] == NOW + 10
+    assert snapshot['2']['scraped_at'] == NOW
+    assert split_changed(stats, snapshot, {1, 2, 3, 4}, now=NOW + 20) == ([], [0, 1, 2, 3])
+
+
+def test_snapshot_round_trip(tmp_path, snapshot):
+    path = str(tmp_path / 'snapshot.json')
+    assert load_snapshot(path) == {}
+    save_snapshot(snapshot, path)
+    assert load_snapshot(path) == snapshot
@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import http_client
+from http_client import HttpClient, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleep advances monotonic() instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSession:
+    """Replays `responses` in order: a status code, (status, headers) or an exception to raise."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        status, response_headers = response if isinstance(response, tuple) else (response, {})
+        return SimpleNamespace(status_code=status, headers=response_headers, url=url)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_client, 'time', clock)
+    monkeypatch.setattr(http_client.random, 'uniform', lambda low, high: high)
+    return clock
+
+
+def client_with(responses, **options):
+    client = HttpClient(host_rates={'example.test': 1000.0}, **options)
+    client._host_state('example.test')
+    client.sessions['example.test'] = FakeSession(responses)
+    return client, client.sessions['example.test']
+
+
+def test_bucket_allows_a_burst_then_paces_to_the_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.now == 0
+    for _ in range(6):
+        bucket.acquire()
+    assert clock.now == pytest.approx(3.0)
+
+
+def test_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    for _ in range(4):
+        bucket.acquire()
+    clock.now += 10
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.now == 10
+
+
+def test_each_host_is_throttled_separately(clock):
+    client = HttpClient(host_rates={'a.test': 2.0, 'b.test': 2.0}, burst=1)
+    for host in ('a.test', 'b.test'):
+        client._host_state(host)
+        client.sessions[host] = FakeSession([200] * 3)
+    for _ in range(3):
+        client.get('http://a.test/page')
+        client.get('http://b.test/page')
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_retries_server_errors_with_exponential_backoff(clock):
+    client, session = client_with([503, 500, 200], backoff=0.5)
+    assert client.get('http://example.test/page').status_code == 200
+    assert session.calls == 3
+    assert [sleep for sleep in clock.sleeps if sleep >= 0.5] == [0.5, 1.0]
+    assert client.latency_stats()['example.test']['retries'] == 2
+
+
+def test_backoff_is_capped(clock):
+    client, _ = client_with([502] * 4 + [200], backoff=4.0, max_backoff=10.0, max_retries=4)
+    client.get('http://example.test/page')
+    assert [sleep for sleep in clock.sleeps if sleep >= 1] == [4.0, 8.0, 10.0, 10.0]
+
+
+def test_honours_retry_after(clock):
+    client, _ = client_with([(429, {'Retry-After': '7'}), (429, {'Retry-After': '120'}), (429, {'Retry-After': 'soon'}),
+                             200], backoff=0.5, max_backoff=30.0)
+    assert client.get('http://example.test/page').status_code == 200
+    assert [sleep for sleep in clock.sleeps if sleep >= 1] == [7.0, 30.0, 2.0]
+
+
+def test_returns_the_last_response_when_retries_run_out(clock):
+    client, session = client_with([503] * 3, max_retries=2)
+    assert client.get('http://example.test/page').status_code == 503
+    assert session.calls == 3
+    assert client.latency_stats()['example.test']['retries'] == 2
+
+
+def test_does_not_retry_other_statuses(clock):
+    client, session = client_with([404])
+    assert client.get('http://example.test/page').status_code == 404
+    assert session.calls == 1
+    assert clock.sleeps == []
+
+
+def test_retries_connection_errors_then_raises(clock):
+    client, session = client_with([requests.ConnectionError(), 200])
+    assert client.get('http://example.test/page').status_code == 200
+
+    client, session = client_with([requests.Timeout()] * 3, max_retries=2)
+    with pytest.raises(requests.Timeout):
+        client.get('http://example.test/page')
+    assert session.calls == 3
+    assert client.latency_stats()['example.test']['errors'] == 3
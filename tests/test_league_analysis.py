@@ -0,0 +1,27 @@
+import json
+
+from fakes import make_league
+from league_analysis import league_projections
+from league_cache import league_from_snapshot, snapshot_league
+
+
+def test_projections_match_between_live_and_snapshot():
+    league, _ = make_league()
+    snapshot = league_from_snapshot(json.loads(json.dumps(snapshot_league(league))))
+    assert league_projections(snapshot, 9) == league_projections(league, 9)
+
+
+def test_projections_change_with_injury_and_projection():
+    league, _ = make_league()
+    before = league_projections(league, 9)
+    hash(before)
+
+    player = next(player for player in league.teams[0].roster if player.injuryStatus == 'ACTIVE')
+    player.injuryStatus = 'OUT'
+    ruled_out = league_projections(league, 9)
+    assert ruled_out != before
+
+    player.injuryStatus = 'ACTIVE'
+    assert league_projections(league, 9) == before
+    player.stats[9]['projected_points'] += 1
+    assert league_projections(league, 9) != before
@@ -0,0 +1,31 @@
+import json
+
+import pandas as pd
+
+from fakes import make_league
+from league_cache import LeagueCache, league_from_snapshot, snapshot_league
+from lineup import optimize_league, optimize_roster
+
+
+def lineup_ids(result):
+    return [(slot, player.playerId if player else None, projection) for slot, player, projection in result['lineup']]
+
+
+def test_snapshot_league_gives_the_live_lineups():
+    league, _ = make_league()
+    snapshot = league_from_snapshot(json.loads(json.dumps(snapshot_league(league))))
+    slot_counts = league.settings.position_slot_counts
+    for live_team, snapshot_team in zip(league.teams, snapshot.teams):
+        assert (lineup_ids(optimize_roster(snapshot_team.roster, slot_counts, league.current_week))
+                == lineup_ids(optimize_roster(live_team.roster, slot_counts, league.current_week)))
+    pd.testing.assert_frame_equal(optimize_league(snapshot), optimize_league(league))
+
+
+def test_fresh_cache_serves_the_snapshot_while_loading(tmp_path):
+    league, _ = make_league()
+    LeagueCache(snapshot_dir=str(tmp_path), loader=lambda league_id, year: league).refresh(1, 2025)
+
+    cached = LeagueCache(snapshot_dir=str(tmp_path), loader=lambda league_id, year: league).get(1, 2025)
+    assert cached.is_snapshot
+    assert [team.schedule[0].team_id for team in cached.teams] == [team.schedule[0].team_id for team in league.teams]
+    pd.testing.assert_frame_equal(optimize_league(cached), optimize_league(league))
@@ -0,0 +1,59 @@
+from itertools import permutations
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lineup import _assign, lineup_value, optimize_roster, starting_slots
+
+
+def brute_force_assignment(cost):
+    n_rows, n_columns = cost.shape
+    return min(cost[np.arange(n_rows), list(columns)].sum() for columns in permutations(range(n_columns), n_rows))
+
+
+def brute_force_lineup(eligible, projections):
+    # Every way of giving each seat a distinct player or leaving it empty
+    n_slots, n_players = eligible.shape
+    best = 0.0
+    for choice in permutations(list(range(n_players)) + [-1] * n_slots, n_slots):
+        if all(player < 0 or eligible[seat, player] for seat, player in enumerate(choice)):
+            best = max(best, sum(projections[player] for player in choice if player >= 0))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_assign_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n_rows = rng.integers(1, 5)
+    cost = rng.integers(-20, 20, size=(n_rows, rng.integers(n_rows, 7))).astype(float)
+    assignment = _assign(cost)
+    assert len(set(assignment)) == n_rows
+    assert cost[np.arange(n_rows), assignment].sum() == brute_force_assignment(cost)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_lineup_value_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    eligible = rng.random((rng.integers(1, 5), rng.integers(0, 6))) < 0.5
+    projections = rng.uniform(0, 30, eligible.shape[1]).round(1)
+    assert lineup_value(eligible, projections) == pytest.approx(brute_force_lineup(eligible, projections))
+
+
+def test_optimize_roster_fills_flex_and_leaves_injured_on_bench():
+    def player(name, slots, projection, status='ACTIVE', lineup_slot='BE'):
+        return SimpleNamespace(name=name, eligibleSlots=slots + ['BE'], projected_avg_points=projection,
+                               injuryStatus=status, lineupSlot=lineup_slot, stats={})
+
+    roster = [
+        player('rb1', ['RB', 'RB/WR/TE'], 15, lineup_slot='RB'),
+        player('rb2', ['RB', 'RB/WR/TE'], 12),
+        player('wr1', ['WR', 'RB/WR/TE'], 14, lineup_slot='WR'),
+        player('wr2', ['WR', 'RB/WR/TE'], 20, status='OUT', lineup_slot='RB/WR/TE'),
+        player('te1', ['TE', 'RB/WR/TE'], 9),
+    ]
+    result = optimize_roster(roster, {'RB': 1, 'WR': 1, 'RB/WR/TE': 1, 'BE': 5})
+    assert [(slot, starter.name) for slot, starter, _ in result['lineup']] == [('RB', 'rb1'), ('WR', 'wr1'), ('RB/WR/TE', 'rb2')]
+    assert result['total'] == 41
+    assert result['current_total'] == 29
+    assert starting_slots({'WR': 2, 'QB': 1, 'BE': 6, 'IR': 1}) == ['QB', 'WR', 'WR']
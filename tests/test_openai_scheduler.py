@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from openai_scheduler import AllModelsFailed, OpenAIScheduler
+
+
+def rate_limit_error(code=None, retry_after='0'):
+    request = httpx.Request('POST', 'https://api.openai.test/v1/responses')
+    response = httpx.Response(429, request=request, headers={'retry-after': retry_after})
+    return RateLimitError('rate limited', response=response, body={'code': code} if code else None)
+
+
+class FakeClient:
+    """Answers each model from a script of outcomes (an exception or 'ok'), repeating the last one."""
+
+    def __init__(self, script):
+        self.script = script
+        self.calls = []
+        self.responses = SimpleNamespace(create=self.create)
+
+    def with_options(self, **options):
+        return self
+
+    def create(self, model, **request):
+        self.calls.append(model)
+        outcomes = self.script[model]
+        outcome = outcomes[min(self.calls.count(model), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(output_text=f"{model} ok", usage=None)
+
+
+def test_throttled_model_routes_to_fallback():
+    client = FakeClient({'a': [rate_limit_error(retry_after='60'), 'ok'], 'b': ['ok']})
+    scheduler = OpenAIScheduler(client)
+    model, response = scheduler.create(['a', 'b'], 100, input='x')
+    assert (model, response.output_text) == ('b', 'b ok')
+
+
+def test_persistent_429_gives_up():
+    client = FakeClient({'a': [rate_limit_error()], 'b': [rate_limit_error()]})
+    scheduler = OpenAIScheduler(client, max_throttles=3)
+    with pytest.raises(AllModelsFailed):
+        scheduler.create(['a', 'b'], 100, input='x')
+    assert client.calls.count('a') == 3 and client.calls.count('b') == 3
+
+
+def test_insufficient_quota_fails_the_model_at_once():
+    client = FakeClient({'a': [rate_limit_error('insufficient_quota')], 'b': [ValueError('boom')]})
+    scheduler = OpenAIScheduler(client)
+    with pytest.raises(AllModelsFailed) as error:
+        scheduler.create(['a', 'b'], 100, input='x')
+    assert client.calls == ['a', 'b']
+    assert isinstance(error.value.__cause__, ValueError)
+
+
+def test_empty_model_list_raises_all_models_failed():
+    with pytest.raises(AllModelsFailed):
+        OpenAIScheduler(FakeClient({})).create([], 100, input='x')
@@ -0,0 +1,59 @@
+import os
+import zlib
+from types import SimpleNamespace
+
+import page_cache
+from page_cache import PageCache
+
+
+def stored_bytes(cache):
+    return cache.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+
+def test_evict_counts_shared_blobs_once(tmp_path):
+    body = os.urandom(2000)
+    size = len(zlib.compress(body))
+    cache = PageCache(str(tmp_path / 'pages.db'), max_bytes=2 * size + size // 2)
+    # Two URLs share one blob, then two more distinct pages overflow the cache
+    cache.put('a', 'espn', body)
+    cache.put('b', 'espn', body)
+    cache.put('c', 'espn', os.urandom(2000))
+    cache.put('d', 'espn', os.urandom(2000))
+
+    urls = [row[0] for row in cache.conn.execute("SELECT url FROM pages ORDER BY url")]
+    # Deleting 'a' alone frees nothing, so 'b' must go too
+    assert urls == ['c', 'd']
+    assert stored_bytes(cache) <= cache.max_bytes
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        status, content = self.responses.pop(0)
+        return SimpleNamespace(status_code=status, content=content, headers={})
+
+
+def test_304_without_cache_entry_refetches(tmp_path, monkeypatch):
+    client = FakeClient([(304, b''), (200, b'<html>page</html>')])
+    monkeypatch.setattr(page_cache, 'get_client', lambda: client)
+    cache = PageCache(str(tmp_path / 'pages.db'))
+
+    body = cache.fetch('http://example.test/p', 'espn', headers={'If-None-Match': '"x"', 'User-Agent': 'test'})
+    assert body == b'<html>page</html>'
+    assert client.requests[1] == {'User-Agent': 'test'}
+    assert cache.get('http://example.test/p')[0] == body
+
+
+def test_304_revalidates_cached_entry(tmp_path, monkeypatch):
+    client = FakeClient([(304, b'')])
+    monkeypatch.setattr(page_cache, 'get_client', lambda: client)
+    cache = PageCache(str(tmp_path / 'pages.db'), ttls={'espn': 0})
+    cache.put('http://example.test/p', 'espn', b'cached', etag='"v1"')
+
+    assert cache.fetch('http://example.test/p', 'espn') == b'cached'
+    assert client.requests == [{'If-None-Match': '"v1"'}]
+    assert cache.revalidated == 1
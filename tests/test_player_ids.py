@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from player_ids import fantasy_pros_slug, name_key, normalize_name, resolve_rows, roster_frame
+
+
+@pytest.mark.parametrize('name, normalized', [
+    ("Patrick Mahomes II", 'patrick mahomes'),
+    ("Odell Beckham Jr.", 'odell beckham'),
+    ("Marvin Harrison Jr", 'marvin harrison'),
+    ("Ken Griffey Sr. III", 'ken griffey'),
+    ("Amon-Ra St. Brown", 'amonra st brown'),
+    ("Ja'Marr Chase", 'jamarr chase'),
+    ("D.J. Moore", 'dj moore'),
+    ("  Josh   ALLEN ", 'josh allen'),
+    ("Jr", 'jr'),
+    ("Michael Pittman Jr. ", 'michael pittman'),
+    ("49ers D/ST", '49ers dst'),
+])
+def test_normalize_name(name, normalized):
+    assert normalize_name(name) == normalized
+
+
+@pytest.mark.parametrize('left, right', [
+    ("Gabe Davis", "Gabriel Davis"),
+    ("Hollywood Brown", "Marquise Brown"),
+    ("Tank Dell", "Nathaniel Dell"),
+    ("Joshua Palmer", "Josh Palmer"),
+    ("Mitch Trubisky", "Mitchell Trubisky"),
+    ("Chig Okonkwo Jr.", "Chigoziem Okonkwo"),
+])
+def test_name_key_folds_aliases(left, right):
+    assert name_key(left) == name_key(right)
+
+
+def test_name_key_without_alias_is_the_normalized_name():
+    assert name_key("Ja'Marr Chase") == 'jamarr chase'
+    assert name_key("Gabriel Davis") == 'gabriel davis'
+
+
+def test_fantasy_pros_slug():
+    assert fantasy_pros_slug("Ja'Marr Chase") == 'jamarr-chase'
+    assert fantasy_pros_slug("Kenneth Walker III") == 'kenneth-walker-rb'
+    assert fantasy_pros_slug("Amon-Ra St. Brown") == 'amonra-stbrown'
+
+
+def stored_index(rows):
+    return pd.DataFrame(rows, columns=['playerId', 'name_key', 'row'])
+
+
+def test_resolve_rows_prefers_player_id():
+    live = roster_frame([SimpleNamespace(playerId='10', name="Gabe Davis"),
+                         SimpleNamespace(playerId=20, name="Josh Allen")])
+    index = stored_index([(20, 'someone else', 0), (10, 'gabriel davis', 1), (30, 'josh allen', 2)])
+    assert resolve_rows(live, index).tolist() == [1, 0]
+
+
+def test_resolve_rows_falls_back_to_name_key():
+    live = roster_frame([SimpleNamespace(playerId=11, name="Gabe Davis"),
+                         SimpleNamespace(playerId=20, name="Josh Allen"),
+                         SimpleNamespace(playerId=12, name="Nobody Known"),
+                         SimpleNamespace(playerId=13, name="Tank Dell")])
+    index = stored_index([(99, 'gabriel davis', 0), (20, 'josh allen', 1), (98, 'nathaniel dell', 2),
+                          (97, 'nathaniel dell', 3)])
+    assert resolve_rows(live, index).tolist() == [0, 1, -1, 2]
+
+
+def test_resolve_rows_uses_the_first_duplicate_id():
+    live = roster_frame([SimpleNamespace(playerId=10, name="Josh Allen")])
+    index = stored_index([(10, 'josh allen', 4), (10, 'josh allen', 5)])
+    assert resolve_rows(live, index).tolist() == [4]
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from prompt_compaction import MIN_PARTIAL_TOKENS, compact_sources, compact_text
+from sentiment_batch import estimate_tokens
+
+
+REDDIT_TEXT = '\n'.join([
+    "Title: Is he worth a waiver claim?",
+    "Post: Subscribe to the injury report, he's back at practice and should log in full snaps",
+    "Comments: I'd log in and claim him now. Great newsletter take. He's the RB1 next week",
+    "---",
+    "Title: Start/sit week 9",
+    "Comments: Sign up for our newsletter",
+    "---",
+])
+
+
+@pytest.mark.parametrize('line', [
+    'Advertisement',
+    'Sponsored Content',
+    'We use cookies. See our cookie policy',
+    'Sign up for our newsletter',
+    'Log in',
+    'Subscribe',
+    'Download the app',
+    'Get our newsletter for daily updates',
+    '© 2025 ESPN Enterprises, Inc.',
+    'Copyright FantasyPros',
+    'ESPN Enterprises, Inc. All rights reserved.',
+    'Read more',
+    'See all news',
+])
+def test_drops_boilerplate_lines(line):
+    assert compact_text(f"Questionable with a hamstring injury\n{line}") == "Questionable with a hamstring injury"
+
+
+def test_keeps_reddit_lines_that_mention_boilerplate_words():
+    compacted = compact_text(REDDIT_TEXT)
+    assert compacted.splitlines() == REDDIT_TEXT.splitlines()[:-1]
+
+
+def test_keeps_long_lines_that_look_like_boilerplate():
+    line = "Subscribe " + "to the idea that he is the best handcuff in the league " * 3
+    assert compact_text(line) == ' '.join(line.split())
+
+
+def test_drops_urls_blank_and_repeated_lines():
+    text = "Limited in practice https://example.com/news\n\n  \nLIMITED in practice!\n---\n---\nOut for week 9\n---"
+    assert compact_text(text) == "Limited in practice\n---\n---\nOut for week 9"
+
+
+def test_budget_keeps_whole_lines_then_cuts_at_a_word():
+    lines = [f"Note {i}: " + "word " * 30 for i in range(5)]
+    budget = 2 * estimate_tokens(' '.join(lines[0].split())) + MIN_PARTIAL_TOKENS
+    kept = compact_text('\n'.join(lines), budget).splitlines()
+    assert len(kept) == 3
+    assert kept[:2] == [' '.join(line.split()) for line in lines[:2]]
+    assert ' '.join(lines[2].split()).startswith(kept[2])
+    assert not kept[2].endswith(' ')
+    assert sum(estimate_tokens(line) for line in kept) <= budget + 1
+
+
+def test_budget_skips_a_partial_line_too_short_to_matter():
+    lines = ["word " * 40, "word " * 40 + "again"]
+    budget = estimate_tokens(' '.join(lines[0].split())) + MIN_PARTIAL_TOKENS - 1
+    assert compact_text('\n'.join(lines), budget) == ' '.join(lines[0].split())
+
+
+def test_is_idempotent():
+    once = compact_text(REDDIT_TEXT + "\nRead more\n" + "Note " * 400, 200)
+    assert compact_text(once, 200) == once
+
+
+def test_non_text_passes_through():
+    assert compact_text(None) is None
+    assert compact_text(pd.NA) is pd.NA
+
+
+def test_compact_sources_trims_each_field_and_counts_tokens():
+    row = {
+        'name': 'Player',
+        'reddit_text': REDDIT_TEXT,
+        'fantasy_pros_text': "Ruled out\nRead more\n" + "Note " * 400,
+        'espn_text': None,
+    }
+    compacted, tokens = compact_sources(row, {'reddit': None, 'fantasypros': 50, 'espn': 10})
+    assert compacted['name'] == 'Player'
+    assert compacted['espn_text'] is None
+    assert compacted['reddit_text'] == compact_text(REDDIT_TEXT)
+    assert compacted['fantasy_pros_text'].startswith("Ruled out\nNote")
+    assert tokens == {
+        'prompt_tokens_before': estimate_tokens(row['reddit_text']) + estimate_tokens(row['fantasy_pros_text']),
+        'prompt_tokens_after': (estimate_tokens(compacted['reddit_text'])
+                                + estimate_tokens(compacted['fantasy_pros_text'])),
+    }
+    assert row['fantasy_pros_text'].startswith("Ruled out\nRead more")
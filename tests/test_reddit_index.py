@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import reddit_index
+from reddit_index import RedditIndex
+
+
+class Comments:
+    def __init__(self, loads, submission_id):
+        self.loads = loads
+        self.submission_id = submission_id
+
+    def replace_more(self, limit):
+        pass
+
+    def list(self):
+        self.loads.append(self.submission_id)
+        return [SimpleNamespace(body=f"comment {i}") for i in range(8)]
+
+
+def submission(loads, submission_id, title, body='', score=1):
+    return SimpleNamespace(id=submission_id, title=title, selftext=body, url='', score=score,
+                           created_utc=9e9, comments=Comments(loads, submission_id))
+
+
+def test_posts_match_names_and_aliases_and_load_comments_once():
+    loads = []
+    index = RedditIndex([
+        submission(loads, 'a', "Ja'Marr Chase looks great", score=10),
+        submission(loads, 'b', "Start Gabe Davis?", "or Ja'Marr Chase", score=50),
+        submission(loads, 'c', "Chase Claypool", score=5),
+    ])
+    assert [post['title'] for post in index.posts("Ja'Marr Chase")] == ["Start Gabe Davis?", "Ja'Marr Chase looks great"]
+    assert [post['title'] for post in index.posts("Gabriel Davis")] == ["Start Gabe Davis?"]
+    assert index.posts("Nobody Here") == []
+    assert len(index.posts("Ja'Marr Chase")[0]['comments']) == reddit_index.COMMENTS_PER_POST
+    assert sorted(loads) == ['a', 'b']
+
+
+def test_fetch_uses_a_client_of_its_own(monkeypatch):
+    listing = [submission([], 'a', "Old post"), submission([], 'b', "New post")]
+    listing[0].created_utc = 0
+    clients = []
+
+    def new_reddit():
+        client = SimpleNamespace(subreddit=lambda name: SimpleNamespace(new=lambda limit: iter(listing)))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(reddit_index, '_new_reddit', new_reddit)
+    monkeypatch.setattr(reddit_index, '_local', SimpleNamespace())
+    thread_client = reddit_index.get_reddit()
+    index = RedditIndex.fetch(limit=10)
+    assert [item.id for item in index.submissions] == ['b']
+    assert len(clients) == 2 and clients[1] is not thread_client
@@ -0,0 +1,86 @@
+import asyncio
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import scrape_players
+from html_extract import ESPN_NEWS_CLASS
+
+
+class SourceStub:
+    """Fake source call that records how many calls overlap."""
+
+    def __init__(self, name):
+        self.name = name
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(random.random() * 0.01)
+        with self.lock:
+            self.active -= 1
+        return f"{self.name}:{'|'.join(str(arg) for arg in args)}"
+
+
+def stub_sources(monkeypatch):
+    stubs = {source: SourceStub(source) for source in scrape_players.SOURCE_CONCURRENCY}
+    monkeypatch.setattr(scrape_players, 'get_reddit_text', stubs['reddit'])
+    monkeypatch.setattr(scrape_players, 'get_fantasy_pros_text', stubs['fantasypros'])
+    monkeypatch.setattr(scrape_players, 'get_espn_text', stubs['espn'])
+    monkeypatch.setattr(scrape_players, 'analyze_sentiment', stubs['openai'])
+    return stubs
+
+
+def make_jobs(n):
+    return [(SimpleNamespace(name=f"Player {i}", playerId=i, position='RB', stats={}), i % 3 or None)
+            for i in range(n)]
+
+
+def test_pipeline_matches_serial(monkeypatch):
+    stub_sources(monkeypatch)
+    jobs = make_jobs(30)
+    serial = scrape_players.run_serial(jobs)
+    pipeline = asyncio.run(scrape_players.run_pipeline(jobs, max_players=8, parse_workers=0))
+    assert pipeline == serial
+    assert [info['playerId'] for info in pipeline[1]] == list(range(30))
+
+
+def test_pipeline_respects_source_limits(monkeypatch):
+    stubs = stub_sources(monkeypatch)
+    limits = {'reddit': 2, 'fantasypros': 3, 'espn': 3, 'openai': 1}
+    asyncio.run(scrape_players.run_pipeline(make_jobs(40), max_players=10, source_limits=limits, parse_workers=0))
+    for source, limit in limits.items():
+        assert 1 <= stubs[source].peak <= limit
+
+
+def test_pipeline_skips_sentiment(monkeypatch):
+    stubs = stub_sources(monkeypatch)
+    _, scraped_info = asyncio.run(scrape_players.run_pipeline(make_jobs(5), with_sentiment=False, parse_workers=0))
+    assert all(info['sentiment'] is None for info in scraped_info)
+    assert stubs['openai'].peak == 0
+
+
+def fake_page(name):
+    return (f"<html><body><p>{name} notes</p>"
+            f"<div class='{ESPN_NEWS_CLASS}'><span>{name} news</span></div></body></html>").encode()
+
+
+def test_parse_pool_matches_serial(monkeypatch):
+    stubs = stub_sources(monkeypatch)
+    monkeypatch.setattr(scrape_players, 'get_fantasy_pros_text',
+                        lambda name: scrape_players.extract_fantasy_pros(fake_page(name), **scrape_players.PARSE_OPTIONS))
+    monkeypatch.setattr(scrape_players, 'get_espn_text',
+                        lambda player_id, name: scrape_players.extract_espn(fake_page(name), **scrape_players.PARSE_OPTIONS))
+    monkeypatch.setattr(scrape_players, 'fetch_fantasy_pros_page', fake_page)
+    monkeypatch.setattr(scrape_players, 'fetch_espn_page', lambda player_id, name: fake_page(name))
+    jobs = make_jobs(12)
+    serial = scrape_players.run_serial(jobs)
+    pipeline = asyncio.run(scrape_players.run_pipeline(jobs, max_players=6, parse_workers=1, parse_queue_size=2))
+    assert pipeline == serial
+    assert 'Player 3 notes' in pipeline[1][3]['fantasy_pros_text']
+    assert stubs['openai'].peak >= 1
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from fakes import make_league
+from season_sim import CHUNK_SIZE, simulate_season
+from weekly_stats import write_weekly_stats
+
+
+@pytest.fixture
+def league(tmp_path, monkeypatch):
+    league, _ = make_league(n_teams=4, per_team=10, free_agents=0)
+    rows = [(player.playerId, week, 'points', 'actual', stats['points'])
+            for team in league.teams for player in team.roster
+            for week, stats in player.stats.items() if 'points' in stats]
+    long = pd.DataFrame(rows, columns=['playerId', 'week', 'stat', 'kind', 'value']).astype({
+        'playerId': 'int32', 'week': 'int16', 'stat': 'category', 'kind': 'category', 'value': 'float32'})
+    write_weekly_stats(long, str(tmp_path / 'weekly_stats.parquet'))
+    monkeypatch.chdir(tmp_path)
+    return league
+
+
+def test_same_seed_same_odds_for_any_worker_count(league):
+    n_sims = 2 * CHUNK_SIZE + 1
+    inline = simulate_season(league, n_sims=n_sims, seed=0, workers=1)
+    pooled = simulate_season(league, n_sims=n_sims, seed=0, workers=2)
+    pd.testing.assert_frame_equal(inline, pooled)
+
+    assert inline['playoff_prob'].sum() == pytest.approx(league.settings.playoff_team_count)
+    assert inline['top_seed_prob'].sum() == pytest.approx(1)
+    assert (inline['projected_wins'] >= inline['wins']).all()
+
+
+def test_rejects_no_simulations(league):
+    with pytest.raises(ValueError):
+        simulate_season(league, n_sims=0, seed=0)
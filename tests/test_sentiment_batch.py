@@ -0,0 +1,128 @@
+import json
+import re
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+import sentiment_cache
+from sentiment_batch import analyze_sentiment_batch_api, analyze_sentiment_packed, split_batch_response
+from sentiment_schema import SCORE_FIELDS, SUMMARY_FIELDS
+
+
+def entry(player_id, score=7):
+    return {'player_id': str(player_id), **{field: score for field in SCORE_FIELDS},
+            **{field: 'ok' for field in SUMMARY_FIELDS}}
+
+
+def item(player_id):
+    return {'player_id': player_id, 'player': f"Player {player_id}", 'reddit_text': 'r' * 400,
+            'fantasy_pros_text': 'f', 'espn_text': 'e'}
+
+
+def prompt_ids(prompt):
+    return [int(player_id) for player_id in re.findall(r'=== PLAYER (\d+):', prompt)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_sentiment_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('SENTIMENT_CACHE_PATH', str(tmp_path / 'sentiment.db'))
+    monkeypatch.setattr(sentiment_cache, '_cache', None)
+
+
+def test_split_keeps_valid_entries_only():
+    batch = [item(1), item(2), item(3), item(4)]
+    bad_score = {**entry(3), 'overall_sentiment_score': 11}
+    text = '```json\n' + json.dumps({'players': [entry(1), entry(2, score=4), bad_score, entry(99)]}) + '\n```'
+    results = split_batch_response(batch, text)
+    # 3 fails validation, 4 is missing and 99 was not asked for
+    assert sorted(results) == [1, 2]
+    assert json.loads(results[2])['overall_sentiment_score'] == 4
+
+
+@pytest.mark.parametrize('text', ['not json', '[]', '{"players": {}}', '{"other": []}'])
+def test_split_malformed_response(text):
+    assert split_batch_response([item(1)], text) == {}
+
+
+class StubScheduler:
+    """Answers each packed prompt for every player but the last; one batch fails."""
+
+    def __init__(self, fail_batch=None):
+        self.prompts = []
+        self.fail_batch = fail_batch
+
+    def submit(self, models, tokens, **request):
+        self.prompts.append(request['input'])
+        future = Future()
+        if len(self.prompts) - 1 == self.fail_batch:
+            future.set_exception(RuntimeError('model error'))
+        else:
+            ids = prompt_ids(request['input'])
+            output = json.dumps({'players': [entry(player_id) for player_id in ids[:-1]]})
+            future.set_result((models[0], SimpleNamespace(output_text=output)))
+        return future
+
+
+def test_packed_returns_partial_results_and_caches_them():
+    items = [item(i) for i in range(12)]
+    scheduler = StubScheduler(fail_batch=1)
+    results = analyze_sentiment_packed(items, ['model-a'], token_budget=2000, max_players=4, scheduler=scheduler)
+
+    batches = [prompt_ids(prompt) for prompt in scheduler.prompts]
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+    # Batch 1 failed and the last player of each other batch was left out
+    assert sorted(results) == [0, 1, 2, 8, 9, 10]
+
+    again = StubScheduler()
+    cached = analyze_sentiment_packed(items, ['model-a'], token_budget=2000, max_players=4, scheduler=again)
+    assert [prompt_ids(prompt) for prompt in again.prompts] == [[3, 4, 5, 6], [7, 11]]
+    assert sorted(cached) == [0, 1, 2, 3, 4, 5, 7, 8, 9, 10]
+
+
+class StubBatchClient:
+    def __init__(self, status='completed'):
+        self.status = status
+        self.jsonl = None
+        self.files = SimpleNamespace(create=self.create_file, content=self.content)
+        self.batches = SimpleNamespace(create=self.create_batch, retrieve=self.retrieve)
+
+    def create_file(self, file, purpose):
+        self.jsonl = file[1].decode('utf-8')
+        return SimpleNamespace(id='file-in')
+
+    def create_batch(self, **kwargs):
+        return SimpleNamespace(id='batch-1', status='in_progress', output_file_id=None)
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status=self.status,
+                               output_file_id='file-out' if self.status == 'completed' else None)
+
+    def content(self, file_id):
+        lines = []
+        for line in self.jsonl.splitlines():
+            request = json.loads(line)
+            ids = prompt_ids(request['body']['input'])
+            if request['custom_id'] == 'batch-1':
+                # A request that errored has no response body
+                lines.append(json.dumps({'custom_id': 'batch-1', 'response': None, 'error': {'code': 'x'}}))
+                continue
+            text = json.dumps({'players': [entry(player_id) for player_id in ids[1:]]})
+            body = {'output': [{'type': 'message', 'content': [{'type': 'output_text', 'text': text}]}]}
+            lines.append(json.dumps({'custom_id': request['custom_id'], 'response': {'body': body}}))
+        return SimpleNamespace(text="\n".join(lines) + "\n")
+
+
+def test_batch_api_parses_output_file():
+    items = [item(i) for i in range(6)]
+    client = StubBatchClient()
+    results = analyze_sentiment_batch_api(items, 'model-a', token_budget=2000, max_players=2,
+                                          client=client, poll_interval=0)
+    # Batches are [0, 1], [2, 3], [4, 5]; the first player of each answer is
+    # missing and the second batch errored
+    assert sorted(results) == [1, 5]
+
+
+def test_batch_api_failed_job_returns_cached_only():
+    results = analyze_sentiment_batch_api([item(1)], 'model-a', client=StubBatchClient('failed'), poll_interval=0)
+    assert results == {}
@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import scrape_players
+import sentiment_cache
+from sentiment_cache import SentimentCache, sentiment_key
+from sentiment_schema import BATCH_RESPONSE_FORMAT, SCORE_FIELDS, SENTIMENT_RESPONSE_FORMAT, SUMMARY_FIELDS
+
+
+VALID = json.dumps({**{field: 6 for field in SCORE_FIELDS}, **{field: 'ok' for field in SUMMARY_FIELDS}})
+
+
+class StubScheduler:
+    def __init__(self, output_text):
+        self.output_text = output_text
+        self.calls = 0
+
+    def create(self, models, tokens, **request):
+        self.calls += 1
+        return models[0], SimpleNamespace(output_text=self.output_text)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('SENTIMENT_CACHE_PATH', str(tmp_path / 'sentiment.db'))
+    monkeypatch.setattr(sentiment_cache, '_cache', None)
+    return sentiment_cache.get_sentiment_cache()
+
+
+def test_key_depends_on_response_format():
+    args = ('Player', 'model', 'prompt')
+    texts = ('reddit', 'fantasypros', 'espn')
+    single = sentiment_key(*args, SENTIMENT_RESPONSE_FORMAT, *texts)
+    assert single == sentiment_key(*args, json.loads(json.dumps(SENTIMENT_RESPONSE_FORMAT)), *texts)
+    assert single != sentiment_key(*args, BATCH_RESPONSE_FORMAT, *texts)
+    assert single != sentiment_key(*args, None, *texts)
+    changed = {**SENTIMENT_RESPONSE_FORMAT, 'schema': {**SENTIMENT_RESPONSE_FORMAT['schema'], 'required': []}}
+    assert single != sentiment_key(*args, changed, *texts)
+
+
+@pytest.mark.parametrize('response', [None, '', 'Error', 'The player looks good', '{"overall_sentiment_score": 11}'])
+def test_put_skips_responses_that_do_not_parse(tmp_path, response):
+    cache = SentimentCache(str(tmp_path / 'sentiment.db'))
+    assert not cache.put('key', 'Player', 'model', response)
+    assert cache.get(['key']) is None
+
+
+def test_put_stores_valid_responses(tmp_path):
+    cache = SentimentCache(str(tmp_path / 'sentiment.db'))
+    assert cache.put('key', 'Player', 'model', '```json\n' + VALID + '\n```')
+    assert cache.get(['other', 'key']) == '```json\n' + VALID + '\n```'
+
+
+def test_unparseable_response_is_asked_again(cache, monkeypatch):
+    scheduler = StubScheduler('not json')
+    monkeypatch.setattr(scrape_players, 'get_openai_scheduler', lambda: scheduler)
+    assert scrape_players.analyze_sentiment('Player', 'r', 'f', 'e') == 'not json'
+    assert scrape_players.analyze_sentiment('Player', 'r', 'f', 'e') == 'not json'
+    assert scheduler.calls == 2
+
+    scheduler.output_text = VALID
+    assert scrape_players.analyze_sentiment('Player', 'r', 'f', 'e') == VALID
+    assert scrape_players.analyze_sentiment('Player', 'r', 'f', 'e') == VALID
+    assert scheduler.calls == 3
+
+
+def test_responses_cached_under_another_format_are_not_served(cache, monkeypatch):
+    for model in scrape_players.SENTIMENT_MODELS:
+        cache.put(sentiment_key('Player', model, scrape_players.SENTIMENT_PROMPT, None, 'r', 'f', 'e'),
+                  'Player', model, VALID.replace('6', '2'))
+    scheduler = StubScheduler(VALID)
+    monkeypatch.setattr(scrape_players, 'get_openai_scheduler', lambda: scheduler)
+    assert scrape_players.analyze_sentiment('Player', 'r', 'f', 'e') == VALID
+    assert scheduler.calls == 1
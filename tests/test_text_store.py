@@ -0,0 +1,20 @@
+from text_store import TextStore
+
+
+def text_row(player_id, name, reddit_text):
+    return {'playerId': player_id, 'name': name, 'reddit_text': reddit_text,
+            'fantasy_pros_text': 'notes', 'espn_text': 'news'}
+
+
+def test_full_write_prunes_dropped_players(tmp_path):
+    store = TextStore(str(tmp_path / 'text.db'))
+    store.write([text_row(1, 'Ann Able', 'hamstring tweak'), text_row(2, 'Bo Baker', 'hamstring injury')])
+    assert sorted(store.search('hamstring')['playerId']) == [1, 2]
+
+    # An incremental write keeps everyone; a full write drops player 1
+    store.write([text_row(2, 'Bo Baker', 'hamstring injury')])
+    assert store.player_ids() == {1, 2}
+    store.write([text_row(2, 'Bo Baker', 'hamstring injury'), text_row(3, 'Cy Cole', 'snap count')], full=True)
+    assert store.player_ids() == {2, 3}
+    assert list(store.search('hamstring')['playerId']) == [2]
+    assert list(store.search('tweak')['playerId']) == []
@@ -0,0 +1,52 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakes import make_league
+from lineup import starting_slots
+from player_store import PlayerStore
+from trade_analysis import TOLERANCE, _Pair, _roster_arrays, evaluate_trades
+
+
+def sentiment_store(league):
+    players = [player for team in league.teams for player in team.roster]
+    return PlayerStore(pd.DataFrame({
+        'playerId': [player.playerId for player in players],
+        'name': [player.name for player in players],
+        'overall_sentiment_score': pd.array([player.playerId % 10 + 1 for player in players], dtype='Int8'),
+    }))
+
+
+def exhaustive_scores(league, store, top_k, min_partner_gain, weight=0.5):
+    slots = starting_slots(league.settings.position_slot_counts)
+    me = league.teams[0]
+    mine = _roster_arrays(me.roster, slots, league.current_week, store)
+    scores = []
+    for team in league.teams[1:]:
+        pair = _Pair(mine, _roster_arrays(team.roster, slots, league.current_week, store))
+        for size in (1, 2):
+            for give in combinations(range(len(me.roster)), size):
+                for get in combinations(range(len(team.roster)), size):
+                    score = (pair.value(pair.my_roster(give, get)) - pair.base_mine
+                             + weight * (pair.theirs[2][list(get)].sum() - mine[2][list(give)].sum()))
+                    if score <= 0:
+                        continue
+                    if (min_partner_gain is not None
+                            and pair.value(pair.their_roster(give, get)) - pair.base_theirs < min_partner_gain - TOLERANCE):
+                        continue
+                    scores.append(score)
+    return sorted(scores, reverse=True)[:top_k]
+
+
+@pytest.mark.parametrize('min_partner_gain', [None, 0, 3])
+@pytest.mark.parametrize('seed', range(2))
+def test_pruned_search_matches_exhaustive(seed, min_partner_gain):
+    league, _ = make_league(n_teams=3, per_team=8, seed=seed)
+    store = sentiment_store(league)
+    trades = evaluate_trades(league, league.teams[0], store, top_k=8, min_partner_gain=min_partner_gain)
+    expected = exhaustive_scores(league, store, 8, min_partner_gain)
+    assert np.allclose(trades['score'].to_numpy(), expected)
+    if min_partner_gain is not None:
+        assert (trades['partner_gain'] >= min_partner_gain - TOLERANCE).all()
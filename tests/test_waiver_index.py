@@ -0,0 +1,114 @@
+import pandas as pd
+
+from fakes import make_league
+from lineup import BENCH_SLOTS, INACTIVE_STATUSES
+from waiver_index import WaiverIndex, waiver_targets
+
+
+def league_features(league, free_agents):
+    players = [player for team in league.teams for player in team.roster] + free_agents
+    return pd.DataFrame({
+        'name': [player.name for player in players],
+        'position': [player.position for player in players],
+        'eligible': [list(player.eligibleSlots) for player in players],
+        'injuryStatus': [player.injuryStatus for player in players],
+        'projection': [player.projected_avg_points for player in players],
+        'sentiment': [float(player.playerId % 10 + 1) for player in players],
+        'percent_owned': [player.percent_owned for player in players],
+        'recent': [player.stats[8]['points'] for player in players],
+    }, index=pd.Index([player.playerId for player in players], name='playerId'))
+
+
+def rostered_ids(league):
+    return frozenset(player.playerId for team in league.teams for player in team.roster)
+
+
+def expected_top(index, key, k, rostered):
+    features = index.features
+    eligible = [player_id for player_id, position, slots, status
+                in zip(features.index, features['position'], features['eligible'], features['injuryStatus'])
+                if player_id not in rostered and status not in INACTIVE_STATUSES
+                and (key == position or (key in slots and key not in BENCH_SLOTS))]
+    return features.loc[eligible].sort_values('score', ascending=False, kind='stable').index[:k].tolist()
+
+
+def test_top_matches_filtered_sort():
+    league, free_agents = make_league(free_agents=40)
+    index = WaiverIndex(league_features(league, free_agents))
+    rostered = rostered_ids(league)
+    for key in index.positions() + ['RB/WR/TE']:
+        for k in (1, 3, 100):
+            assert index.top(key, k, rostered).index.tolist() == expected_top(index, key, k, rostered)
+
+
+def test_one_index_serves_several_leagues():
+    league, free_agents = make_league(free_agents=40)
+    index = WaiverIndex(league_features(league, free_agents))
+    lists = {key: list(player_ids) for key, player_ids in index.lists.items()}
+    everyone, nobody = rostered_ids(league), frozenset()
+
+    for key in index.positions():
+        mine = index.top(key, 50, everyone).index
+        theirs = index.top(key, 50, nobody).index
+        assert not set(mine) & everyone
+        assert set(mine) <= set(theirs)
+        assert theirs.tolist() == expected_top(index, key, 50, nobody)
+    assert index.lists == lists
+
+
+def test_waiver_targets_only_suggests_free_agents():
+    league, free_agents = make_league(free_agents=40)
+    index = WaiverIndex(league_features(league, free_agents))
+    rostered = rostered_ids(league)
+    targets = waiver_targets(index, league.teams[0].roster, league.settings.position_slot_counts,
+                             rostered, league.current_week, per_slot=2)
+    free_agent_names = {player.name for player in free_agents}
+    assert not targets.empty
+    assert set(targets['add']) <= free_agent_names
+    best = targets.groupby('starter', sort=False)['upgrade'].max().tolist()
+    assert best == sorted(best, reverse=True)
+
+
+def ranked_lists(index):
+    """Lists a full sort of `index.features` (with its current scores) gives."""
+    lists = {}
+    for player_id in index.features.index:
+        for key in index._player_keys(player_id):
+            lists.setdefault(key, []).append((-index.features.at[player_id, 'score'], player_id))
+    return {key: sorted(ranked) for key, ranked in lists.items()}
+
+
+def test_updated_moves_only_changed_players():
+    league, free_agents = make_league(free_agents=40)
+    features = league_features(league, free_agents)
+    index = WaiverIndex(features)
+    lists = {key: list(ranked) for key, ranked in index.lists.items()}
+
+    new = features.drop(index=features.index[:2])
+    changed = new.index[[0, 5, 9]]
+    new.loc[changed[0], 'projection'] += 8
+    new.loc[changed[1], 'injuryStatus'] = 'OUT' if new.at[changed[1], 'injuryStatus'] != 'OUT' else 'ACTIVE'
+    new.at[changed[2], 'eligible'] = ['OP']
+    added = league_features(*make_league(n_teams=2, per_team=1, free_agents=0, seed=5)).rename(index=lambda i: i + 5000)
+    new = pd.concat([new, added])
+
+    updated = index.updated(new)
+    assert updated is not index
+    assert index.lists == lists
+    assert sorted(index._changed(new)) == sorted(list(changed) + list(added.index))
+    assert updated.means is index.means
+    unchanged = new.index.difference(changed).difference(added.index)
+    assert (updated.features.loc[unchanged, 'score'] == index.features.loc[unchanged, 'score']).all()
+    assert updated.lists == ranked_lists(updated)
+    assert set(updated.features.index) == set(new.index)
+
+
+def test_updated_rebuilds_when_most_players_changed():
+    league, free_agents = make_league(free_agents=40)
+    features = league_features(league, free_agents)
+    index = WaiverIndex(features)
+    new = features.assign(projection=features['projection'] * 2)
+    updated = index.updated(new)
+    assert updated.means is not index.means
+    assert updated.lists == WaiverIndex(new).lists
+    assert index.updated(features).lists == index.lists
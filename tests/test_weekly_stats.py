@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from weekly_stats import (boom_bust, build_weekly_stats, consistency, decode_stats, load_weekly_stats,
+                          player_trends, rolling_average, weekly_points, write_weekly_stats)
+
+
+def long_table(actual, projected=None):
+    """Long table from {playerId: [points per week from 1]}; None marks a week without a game."""
+    rows = []
+    for player_id, weeks in actual.items():
+        stats = {0: {'points': sum(points for points in weeks if points is not None)}}
+        for week, points in enumerate(weeks, start=1):
+            stats[week] = {} if points is None else {'points': points}
+            if projected is not None:
+                stats[week]['projected_points'] = projected[player_id][week - 1]
+        rows.append({'playerId': player_id, 'stats': stats})
+    return build_weekly_stats(rows)
+
+
+def test_decode_values_and_breakdowns():
+    stats = {
+        0: {'points': 100.5, 'avg_points': 12.5, 'projected_points': 110.0},
+        3: {'points': 20.0, 'projected_points': 15.5, 'breakdown': {'rushingYards': 80, 'receivingTouchdowns': 1},
+            'projected_breakdown': {'rushingYards': 65.5}, 'avg_points': 0},
+    }
+    rows = decode_stats(7, stats)
+    assert sorted(rows) == sorted([
+        (7, 0, 'points', 'actual', 100.5),
+        (7, 0, 'avg_points', 'actual', 12.5),
+        (7, 0, 'points', 'projected', 110.0),
+        (7, 3, 'points', 'actual', 20.0),
+        (7, 3, 'points', 'projected', 15.5),
+        (7, 3, 'rushingYards', 'actual', 80),
+        (7, 3, 'receivingTouchdowns', 'actual', 1),
+        (7, 3, 'rushingYards', 'projected', 65.5),
+        (7, 3, 'avg_points', 'actual', 0),
+    ])
+    assert sorted(decode_stats(7, json.dumps(stats))) == sorted(rows)
+
+
+@pytest.mark.parametrize('stats', [None, '', {}, {'1': 'bye'}, {'1': {'points': None, 'breakdown': [1, 2]}},
+                                   {'1': {'points': True, 'projected_points': 'n/a', 'team': 'KC'}}])
+def test_decode_skips_missing_and_non_numeric(stats):
+    assert decode_stats(7, stats) == []
+
+
+def test_build_types_and_order():
+    long = build_weekly_stats([{'playerId': '2', 'stats': {'2': {'points': 3}}},
+                               {'playerId': 1, 'stats': json.dumps({'1': {'projected_points': 4, 'points': 5}})}])
+    assert long.dtypes.astype(str).to_dict() == {'playerId': 'int32', 'week': 'int16', 'stat': 'category',
+                                                 'kind': 'category', 'value': 'float32'}
+    assert list(zip(long['playerId'], long['week'], long['kind'])) == [(1, 1, 'actual'), (1, 1, 'projected'),
+                                                                      (2, 2, 'actual')]
+
+
+def test_weekly_points_excludes_the_season_total():
+    points = weekly_points(long_table({1: [10, None, 30]}, {1: [12, 12, 12]}))
+    assert points['week'].tolist() == [1, 2, 3]
+    assert points['actual'].tolist()[::2] == [10, 30]
+    assert np.isnan(points['actual'][1])
+    assert points['projected'].tolist() == [12, 12, 12]
+
+
+def test_rolling_average_skips_weeks_without_a_game():
+    rolling = rolling_average(long_table({1: [10, None, 20, 30, 60], 2: [5]}), window=3)
+    assert rolling[rolling['playerId'] == 1]['week'].tolist() == [1, 3, 4, 5]
+    assert rolling[rolling['playerId'] == 1]['rolling_avg'].tolist() == pytest.approx([10, 15, 20, 110 / 3])
+    assert rolling[rolling['playerId'] == 2]['rolling_avg'].tolist() == [5]
+
+
+def test_consistency():
+    summary = consistency(long_table({1: [10, 20, None, 30], 2: [8], 3: [0, 0]}))
+    assert summary.loc[1, 'games'] == 3
+    assert summary.loc[1, 'mean'] == pytest.approx(20)
+    assert summary.loc[1, 'std'] == pytest.approx(10)
+    assert summary.loc[1, 'cv'] == pytest.approx(0.5)
+    assert summary.loc[2, 'std'] == 0
+    assert np.isnan(summary.loc[3, 'cv'])
+
+
+def test_boom_bust_against_each_weeks_projection():
+    long = long_table({1: [30, 5, 10, 15, None], 2: [10, 10]}, {1: [20, 10, 10, 0, 10], 2: [0, 0]})
+    rates = boom_bust(long)
+    # Week 4 has no projection and week 5 no game; weeks 1-3 are boom, bust and neither
+    assert rates.loc[1].tolist() == pytest.approx([1 / 3, 1 / 3])
+    assert 2 not in rates.index
+    assert boom_bust(long, boom_ratio=1.0, bust_ratio=0.4).loc[1].tolist() == pytest.approx([2 / 3, 0])
+
+
+def test_player_trends_joins_the_summaries():
+    trends = player_trends(long_table({1: [10, 20, 30]}, {1: [10, 10, 10]}), window=2)
+    assert trends.loc[1, 'rolling_avg'] == pytest.approx(25)
+    assert trends.loc[1, 'boom_rate'] == pytest.approx(2 / 3)
+    assert trends['games'].dtype != np.float32
+
+
+def test_load_pushes_filters_down(tmp_path):
+    path = str(tmp_path / 'weekly.parquet')
+    long = long_table({1: [10, 20], 2: [5, 6]}, {1: [9, 9], 2: [4, 4]})
+    write_weekly_stats(long, path)
+    loaded = load_weekly_stats(player_ids=[2], stats=['points'], kind='projected', path=path)
+    assert set(loaded['playerId']) == {2}
+    assert set(loaded['kind']) == {'projected'}
+    assert loaded['value'].tolist() == [4, 4]
+    pd.testing.assert_frame_equal(load_weekly_stats(path=path), long, check_categorical=False)
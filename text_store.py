@@ -0,0 +1,154 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+from player_store import load_players
+
+
+TEXT_DB_PATH = 'player_text.db'
+TEXT_FIELDS = ['reddit_text', 'fantasy_pros_text', 'espn_text']
+
+
+class TextStore:
+    """SQLite table of each player's scraped text, keyed by playerId.
+
+    The app keeps only numeric and score columns in memory and reads a
+    player's text from here when a view displays it. Reads are primary-key
+    lookups, so their cost does not grow with the number of players.
+    """
+
+    def __init__(self, path=TEXT_DB_PATH):
+        self.path = path
+
+    def _connect(self, readonly=False):
+        if readonly:
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        conn = sqlite3.connect(self.path)
+        has_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_text_fts'"
+        ).fetchone()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS player_text (
+                playerId INTEGER PRIMARY KEY,
+                name TEXT,
+                reddit_text TEXT,
+                fantasy_pros_text TEXT,
+                espn_text TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS player_text_fts USING fts5(
+                name, reddit_text, fantasy_pros_text, espn_text,
+                content='player_text', content_rowid='playerId', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS player_text_ai AFTER INSERT ON player_text BEGIN
+                INSERT INTO player_text_fts (rowid, name, reddit_text, fantasy_pros_text, espn_text)
+                VALUES (new.playerId, new.name, new.reddit_text, new.fantasy_pros_text, new.espn_text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS player_text_ad AFTER DELETE ON player_text BEGIN
+                INSERT INTO player_text_fts (player_text_fts, rowid, name, reddit_text, fantasy_pros_text, espn_text)
+                VALUES ('delete', old.playerId, old.name, old.reddit_text, old.fantasy_pros_text, old.espn_text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS player_text_au AFTER UPDATE ON player_text BEGIN
+                INSERT INTO player_text_fts (player_text_fts, rowid, name, reddit_text, fantasy_pros_text, espn_text)
+                VALUES ('delete', old.playerId, old.name, old.reddit_text, old.fantasy_pros_text, old.espn_text);
+                INSERT INTO player_text_fts (rowid, name, reddit_text, fantasy_pros_text, espn_text)
+                VALUES (new.playerId, new.name, new.reddit_text, new.fantasy_pros_text, new.espn_text);
+            END;
+        """)
+        if not has_index:
+            # Text stores written before the search index existed
+            conn.execute("INSERT INTO player_text_fts (player_text_fts) VALUES ('rebuild')")
+            conn.commit()
+        return conn
+
+    def write(self, rows, full=False):
+        """Upsert text rows (dicts with playerId, name and TEXT_FIELDS).
+
+        Triggers keep the full-text index in step, so only the rows written
+        are re-indexed. With `full`, `rows` is the whole scrape and players
+        missing from it are deleted, so search stops returning them.
+        """
+        rows = [{'playerId': int(row['playerId']), 'name': row['name'],
+                 **{field: row.get(field) for field in TEXT_FIELDS}} for row in rows]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO player_text (playerId, name, reddit_text, fantasy_pros_text, espn_text) "
+                "VALUES (:playerId, :name, :reddit_text, :fantasy_pros_text, :espn_text) "
+                "ON CONFLICT (playerId) DO UPDATE SET name = excluded.name, reddit_text = excluded.reddit_text, "
+                "fantasy_pros_text = excluded.fantasy_pros_text, espn_text = excluded.espn_text",
+                rows,
+            )
+            if full:
+                conn.execute("CREATE TEMP TABLE written (playerId INTEGER PRIMARY KEY)")
+                conn.executemany("INSERT OR IGNORE INTO written (playerId) VALUES (?)",
+                                 [(row['playerId'],) for row in rows])
+                conn.execute("DELETE FROM player_text WHERE playerId NOT IN (SELECT playerId FROM written)")
+        conn.close()
+
+    def get_many(self, player_ids, columns=TEXT_FIELDS):
+        """Text columns for `player_ids` as a frame indexed by playerId."""
+        columns = [column for column in columns if column in TEXT_FIELDS]
+        player_ids = [int(player_id) for player_id in player_ids]
+        conn = self._connect(readonly=True)
+        try:
+            placeholders = ','.join('?' * len(player_ids))
+            rows = conn.execute(
+                f"SELECT playerId, {', '.join(columns)} FROM player_text WHERE playerId IN ({placeholders})",
+                player_ids,
+            ).fetchall() if player_ids else []
+        finally:
+            conn.close()
+        return pd.DataFrame(rows, columns=['playerId'] + columns).set_index('playerId')
+
+    def player_ids(self):
+        """Set of playerIds that have stored text (empty before the first write)."""
+        if not os.path.exists(self.path):
+            return set()
+        conn = self._connect(readonly=True)
+        try:
+            return {row[0] for row in conn.execute("SELECT playerId FROM player_text")}
+        finally:
+            conn.close()
+
+    def get(self, player_id, columns=TEXT_FIELDS):
+        texts = self.get_many([player_id], columns)
+        return texts.iloc[0] if len(texts) else None
+
+    def search(self, query, sources=TEXT_FIELDS, limit=25):
+        """BM25-ranked players whose text in `sources` contains the phrase `query`.
+
+        Returns a frame with playerId, name, rank (lower is better) and a
+        highlighted snippet from the best-matching column.
+        """
+        sources = [source for source in sources if source in TEXT_FIELDS]
+        terms = query.strip()
+        if not terms or not sources:
+            return pd.DataFrame(columns=['playerId', 'name', 'rank', 'snippet'])
+        phrase = '"' + terms.replace('"', '""') + '"'
+        match = f"{{{' '.join(sources)}}} : {phrase}"
+        conn = self._connect(readonly=True)
+        try:
+            rows = conn.execute(
+                "SELECT rowid, name, bm25(player_text_fts) AS rank, "
+                "snippet(player_text_fts, -1, '**', '**', '...', 16) "
+                "FROM player_text_fts WHERE player_text_fts MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return pd.DataFrame(rows, columns=['playerId', 'name', 'rank', 'snippet'])
+
+
+def load_player_text(player_ids, columns=TEXT_FIELDS, path=TEXT_DB_PATH):
+    """Text for `player_ids` indexed by playerId (NaN rows for unknown ids).
+
+    Reads from the text store when it exists, otherwise falls back to the
+    text columns of the players file (exports made before the text store).
+    """
+    player_ids = [int(player_id) for player_id in player_ids]
+    if os.path.exists(path):
+        texts = TextStore(path).get_many(player_ids, columns)
+    else:
+        texts = load_players(columns=['playerId'] + list(columns), player_ids=player_ids).set_index('playerId')
+    return texts[~texts.index.duplicated()].reindex(player_ids)
@@ -0,0 +1,170 @@
+import heapq
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from lineup import lineup_value, slot_eligibility, starting_slots, weekly_projection
+
+
+# Projected points a trade is credited per point of overall sentiment gained
+SENTIMENT_WEIGHT = 0.5
+# Score assumed for players without sentiment
+NEUTRAL_SENTIMENT = 5.0
+TOP_TRADES = 20
+TRADE_SIZES = (1, 2)
+# Slack for float rounding when comparing lineup values summed in different orders
+TOLERANCE = 1e-9
+
+
+def _roster_arrays(roster, slots, week, store):
+    """Seat eligibility, projections and overall sentiment for a roster.
+
+    Projections are clipped at zero so the lineup value stays monotone and
+    submodular in the set of players, which the pruning bounds rely on.
+    """
+    eligible = slot_eligibility([getattr(player, 'eligibleSlots', None) or [] for player in roster], slots)
+    projections = np.array([max(weekly_projection(player, week), 0.0) for player in roster])
+    sentiment = np.full(len(roster), NEUTRAL_SENTIMENT)
+    if store is not None and 'overall_sentiment_score' in store.df.columns and roster:
+        rows = store.resolve(roster)
+        scores = store.df['overall_sentiment_score'].to_numpy(dtype=float, na_value=np.nan)
+        found = rows >= 0
+        sentiment[found] = np.nan_to_num(scores[rows[found]], nan=NEUTRAL_SENTIMENT)
+    return eligible, projections, sentiment
+
+
+class _Pair:
+    """Lineup values for my roster and one partner's roster, with players swapped."""
+
+    def __init__(self, mine, theirs):
+        self.mine = mine
+        self.theirs = theirs
+        self.eligible = np.hstack([mine[0], theirs[0]])
+        self.projections = np.concatenate([mine[1], theirs[1]])
+        self.offset = len(mine[1])
+        self.base_mine = self.value(self.my_roster())
+        self.base_theirs = self.value(self.their_roster())
+        # Candidate give/get index sets, by trade size
+        self.sets = {}
+
+    def value(self, players):
+        players = np.asarray(players, dtype=int)
+        return lineup_value(self.eligible[:, players], self.projections[players])
+
+    def my_roster(self, give=(), get=()):
+        kept = np.setdiff1d(np.arange(self.offset), give)
+        return np.concatenate([kept, self.offset + np.asarray(get, dtype=int)])
+
+    def their_roster(self, give=(), get=()):
+        kept = np.setdiff1d(np.arange(len(self.theirs[1])), get)
+        return np.concatenate([self.offset + kept, np.asarray(give, dtype=int)])
+
+
+def evaluate_trades(league, my_team, store=None, week=None, top_k=TOP_TRADES, sizes=TRADE_SIZES,
+                    sentiment_weight=SENTIMENT_WEIGHT, min_partner_gain=None, teams=None):
+    """Best 1-for-1 and 2-for-2 trades between `my_team` and the other teams.
+
+    A trade's score is the change in my optimal lineup projection plus
+    `sentiment_weight` times the overall sentiment gained. With
+    `min_partner_gain`, trades whose partner's lineup changes by less are
+    dropped.
+
+    Every candidate gets upper bounds in bulk with NumPy, from single-player
+    solves only. The lineup value is monotone, submodular and subadditive
+    in the set of players, so a side's change is at most both
+    - the sum of each incoming player's marginal gain to the current roster
+    - the sum of each outgoing player's loss from it (losing players together
+      costs at least as much as losing them one at a time) plus the sum of
+      the incoming players' values on their own.
+    Candidates whose partner bound is below `min_partner_gain` are dropped
+    unsolved; the rest are solved exactly in order of my bound, stopping
+    once no remaining bound can beat the top `top_k`.
+
+    Returns a frame with team_id, team_name, give, get, my_gain,
+    partner_gain, sentiment_delta and score, best first.
+    """
+    week = getattr(league, 'current_week', None) if week is None else week
+    slots = starting_slots(league.settings.position_slot_counts)
+    mine = _roster_arrays(my_team.roster, slots, week, store)
+    partners = [team for team in (teams or league.teams) if team.team_id != my_team.team_id]
+
+    pairs = []
+    candidates = []
+    for team_index, team in enumerate(partners):
+        pair = _Pair(mine, _roster_arrays(team.roster, slots, week, store))
+        n_mine, n_theirs = len(mine[1]), len(pair.theirs[1])
+        # Marginal gain of each single incoming player and loss of each
+        # single outgoing player, for each side, and each player's value alone
+        gain_mine = np.array([pair.value(pair.my_roster(get=[b])) - pair.base_mine for b in range(n_theirs)])
+        gain_theirs = np.array([pair.value(pair.their_roster(give=[a])) - pair.base_theirs for a in range(n_mine)])
+        loss_mine = np.array([pair.value(pair.my_roster(give=[a])) - pair.base_mine for a in range(n_mine)])
+        loss_theirs = np.array([pair.value(pair.their_roster(get=[b])) - pair.base_theirs for b in range(n_theirs)])
+        alone = pair.projections * pair.eligible.any(axis=0)
+        alone_mine, alone_theirs = alone[:n_mine], alone[n_mine:]
+        pairs.append(pair)
+
+        for size in sizes:
+            if size > min(n_mine, n_theirs):
+                continue
+            give = np.array(list(combinations(range(n_mine), size)), dtype=int)
+            get = np.array(list(combinations(range(n_theirs), size)), dtype=int)
+            sentiment_delta = pair.theirs[2][get].sum(axis=1)[None, :] - mine[2][give].sum(axis=1)[:, None]
+            my_bound = np.minimum(gain_mine[get].sum(axis=1)[None, :],
+                                  loss_mine[give].sum(axis=1)[:, None] + alone_theirs[get].sum(axis=1)[None, :])
+            bound = my_bound + sentiment_weight * sentiment_delta
+            keep = bound > 0
+            if min_partner_gain is not None:
+                partner_bound = np.minimum(gain_theirs[give].sum(axis=1)[:, None],
+                                           loss_theirs[get].sum(axis=1)[None, :] + alone_mine[give].sum(axis=1)[:, None])
+                keep &= partner_bound >= min_partner_gain - TOLERANCE
+            give_rows, get_rows = np.nonzero(keep)
+            candidates.append(pd.DataFrame({
+                'pair': team_index,
+                'size': size,
+                'give_row': give_rows,
+                'get_row': get_rows,
+                'bound': bound[give_rows, get_rows],
+                'sentiment_delta': sentiment_delta[give_rows, get_rows],
+            }))
+            pair.sets[size] = (give, get)
+
+    columns = ['team_id', 'team_name', 'give', 'get', 'my_gain', 'partner_gain', 'sentiment_delta', 'score']
+    if not candidates:
+        return pd.DataFrame(columns=columns)
+    candidates = pd.concat(candidates, ignore_index=True).sort_values('bound', ascending=False)
+
+    best = []
+    for candidate in candidates.itertuples(index=False):
+        if len(best) == top_k and candidate.bound <= best[0][0]:
+            break
+        pair = pairs[candidate.pair]
+        give_sets, get_sets = pair.sets[candidate.size]
+        give, get = give_sets[candidate.give_row], get_sets[candidate.get_row]
+        my_gain = pair.value(pair.my_roster(give, get)) - pair.base_mine
+        score = my_gain + sentiment_weight * candidate.sentiment_delta
+        if score <= 0 or (len(best) == top_k and score <= best[0][0]):
+            continue
+        partner_gain = pair.value(pair.their_roster(give, get)) - pair.base_theirs
+        if min_partner_gain is not None and partner_gain < min_partner_gain - TOLERANCE:
+            continue
+        entry = (score, candidate.pair, tuple(give), tuple(get), my_gain, partner_gain, candidate.sentiment_delta)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        else:
+            heapq.heapreplace(best, entry)
+
+    rows = []
+    for score, team_index, give, get, my_gain, partner_gain, sentiment_delta in sorted(best, reverse=True):
+        team = partners[team_index]
+        rows.append({
+            'team_id': team.team_id,
+            'team_name': team.team_name,
+            'give': ', '.join(my_team.roster[a].name for a in give),
+            'get': ', '.join(team.roster[b].name for b in get),
+            'my_gain': my_gain,
+            'partner_gain': partner_gain,
+            'sentiment_delta': sentiment_delta,
+            'score': score,
+        })
+    return pd.DataFrame(rows, columns=columns)
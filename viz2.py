@@ -1,11 +1,19 @@
 # viz2.py
 import streamlit as st
 import pandas as pd
-import json
-from espn_api.football import League
 import os
 from dotenv import load_dotenv
 import re
+import sqlite3
+import time
+from player_store import PlayerStore, data_version, load_players, resident_columns
+from league_cache import LEAGUE_TTL, LeagueCache
+from text_store import TEXT_DB_PATH, TextStore, load_player_text
+from lineup import optimize_league, optimize_roster
+from season_sim import simulate_season
+from trade_analysis import evaluate_trades
+from waiver_index import WaiverIndex, waiver_features, waiver_targets
+from league_analysis import league_projections, league_rosters, position_sentiment_summary
 
 load_dotenv()
 
@@ -18,9 +26,72 @@ if 'league' not in st.session_state:
     st.session_state.league = None
 if 'selected_team' not in st.session_state:
     st.session_state.selected_team = None
+if 'league_key' not in st.session_state:
+    st.session_state.league_key = None
 
-# Load data
-df = pd.read_csv('players.csv')
+@st.cache_resource
+def get_league_cache():
+    """League cache shared by every session in this process"""
+    return LeagueCache()
+
+@st.cache_resource(max_entries=1)
+def get_player_store(version):
+    """Build the indexed player store once per version of the players file"""
+    return PlayerStore(load_players(columns=resident_columns()))
+
+@st.cache_data(max_entries=8)
+def get_position_summaries(version, rosters):
+    """League-wide position sentiment averages, recomputed only when the data or rosters change"""
+    return position_sentiment_summary(get_player_store(version), rosters)
+
+@st.cache_data(max_entries=32)
+def get_filtered_order(version, position, sort_by, ascending):
+    """Row positions for a Position Filter selection, filtered and sorted once per data version"""
+    players = get_player_store(version).df
+    if position != "All":
+        players = players[players['position'] == position]
+    return players.sort_values(sort_by, ascending=ascending).index.to_numpy()
+
+@st.cache_data(max_entries=32, ttl=LEAGUE_TTL)
+def get_trade_ideas(version, league_key, week, rosters, projections, team_id, partner_id, mutual_only, _league):
+    """Trade ideas for one team, recomputed only when the data, rosters, projections or options change"""
+    teams = {team.team_id: team for team in _league.teams}
+    return evaluate_trades(
+        _league,
+        teams[team_id],
+        get_player_store(version),
+        week=week,
+        min_partner_gain=0 if mutual_only else None,
+        teams=None if partner_id is None else [teams[partner_id]],
+    )
+
+@st.cache_resource
+def get_latest_waiver_indexes():
+    """Most recent waiver index per week, so a new data version only re-ranks the players that changed"""
+    return {}
+
+@st.cache_resource(max_entries=2)
+def get_waiver_index(version, week):
+    """Read-only ranked player index, built once per data version and week and shared by all sessions"""
+    features = waiver_features(get_player_store(version), week)
+    latest = get_latest_waiver_indexes()
+    index = latest[week].updated(features) if week in latest else WaiverIndex(features)
+    latest[week] = index
+    return index
+
+# Later weeks' projections are not in the key, so outlooks expire with the league
+@st.cache_data(max_entries=8, ttl=LEAGUE_TTL)
+def get_season_outlook(version, league_key, week, records, rosters, projections, _league):
+    """Season simulation, rerun only when the data, standings, rosters or projections change (fixed seed keeps reruns stable)"""
+    return simulate_season(_league, seed=0, week=week)
+
+# Load data (numeric and score columns only; views fetch scraped text as needed)
+store = get_player_store(data_version())
+df = store.df
+
+# Columns shown in the Position Filter table view
+FILTER_TABLE_COLUMNS = ['name', 'position', 'proTeam', 'total_points', 'avg_points', 'projected_total_points',
+                        'percent_owned', 'injuryStatus', 'overall_sentiment_score']
 
 def extract_league_id_from_url(url):
     """Extract league ID from ESPN fantasy URL"""
@@ -34,23 +105,91 @@ def extract_league_id_from_url(url):
         return match.group(1)
     return None
 
-def parse_sentiment(sentiment_text):
-    """Parse sentiment JSON and return structured data"""
-    try:
-        if pd.notna(sentiment_text) and sentiment_text != "Analysis failed":
-            # Remove markdown code blocks if present
-            text = sentiment_text.strip()
-            if text.startswith('```json'):
-                text = text[7:]
-            if text.endswith('```'):
-                text = text[:-3]
-            
-            sentiment_data = json.loads(text.strip())
-            return sentiment_data
+def show_filtered_player(player, player_text, sentiment_data):
+    """Stats, truncated source text and sentiment for one Position Filter row"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Stats:**")
+        st.write(f"Total Points: {player['total_points']:.1f}")
+        st.write(f"Average Points: {player['avg_points']:.1f}")
+        st.write(f"Projected Points: {player['projected_total_points']:.1f}")
+        st.write(f"Percent Owned: {player['percent_owned']:.1f}%")
+        st.write(f"Team: {player['proTeam']}")
+        st.write(f"Injury Status: {player['injuryStatus'] if player['injuryStatus'] else 'Healthy'}")
+    
+    with col2:
+        st.write("**Analysis:**")
+        reddit_text = player_text['reddit_text'] if pd.notna(player_text['reddit_text']) else "No Reddit discussion"
+        fantasy_pros_text = player_text['fantasy_pros_text'] if pd.notna(player_text['fantasy_pros_text']) else "No FantasyPros analysis"
+        
+        if len(reddit_text) > 100:
+            st.write("**Reddit (truncated):**")
+            st.write(reddit_text[:100] + "...")
         else:
-            return None
-    except Exception as e:
-        return None
+            st.write("**Reddit:**")
+            st.write(reddit_text)
+        
+        if len(fantasy_pros_text) > 100:
+            st.write("**FantasyPros (truncated):**")
+            st.write(fantasy_pros_text[:100] + "...")
+        else:
+            st.write("**FantasyPros:**")
+            st.write(fantasy_pros_text)
+        
+        # Add sentiment analysis to expandable sections
+        if sentiment_data:
+            st.write("**Sentiment Analysis:**")
+            col3, col4, col5 = st.columns(3)
+                
+            with col3:
+                reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
+                if reddit_score != 'N/A' and reddit_score is not None:
+                    if reddit_score >= 7:
+                        st.success(f"Reddit: {reddit_score}/10")
+                    elif reddit_score >= 5:
+                        st.warning(f"Reddit: {reddit_score}/10")
+                    else:
+                        st.error(f"Reddit: {reddit_score}/10")
+                else:
+                    st.info("Reddit: N/A")
+                
+            with col4:
+                fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
+                if fantasypros_score != 'N/A' and fantasypros_score is not None:
+                    if fantasypros_score >= 7:
+                        st.success(f"FantasyPros: {fantasypros_score}/10")
+                    elif fantasypros_score >= 5:
+                        st.warning(f"FantasyPros: {fantasypros_score}/10")
+                    else:
+                        st.error(f"FantasyPros: {fantasypros_score}/10")
+                else:
+                    st.info("FantasyPros: N/A")
+                
+            with col5:
+                overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
+                if overall_score != 'N/A' and overall_score is not None:
+                    if overall_score >= 7:
+                        st.success(f"Overall: {overall_score}/10")
+                    elif overall_score >= 5:
+                        st.warning(f"Overall: {overall_score}/10")
+                    else:
+                        st.error(f"Overall: {overall_score}/10")
+                else:
+                    st.info("Overall: N/A")
+                
+            # Show summaries
+            if 'reddit_summary' in sentiment_data:
+                st.write("**Reddit Summary:**")
+                st.write(sentiment_data['reddit_summary'])
+                
+            if 'fantasypros_summary' in sentiment_data:
+                st.write("**FantasyPros Summary:**")
+                st.write(sentiment_data['fantasypros_summary'])
+                
+            if 'overall_summary' in sentiment_data:
+                st.write("**Overall Summary:**")
+                st.write(sentiment_data['overall_summary'])
 
 # Sign-in Page
 if not st.session_state.authenticated:
@@ -74,11 +213,12 @@ if not st.session_state.authenticated:
                 
                 if league_id:
                     try:
-                        # Test connection
-                        league = League(league_id=int(league_id), year=year)
+                        # Test connection (served from the shared cache when another session loaded it)
+                        league = get_league_cache().get(int(league_id), year)
                         
                         # Store in session state
                         st.session_state.league = league
+                        st.session_state.league_key = (int(league_id), year)
                         st.session_state.espn_connected = True
                         st.session_state.authenticated = True
                         
@@ -97,6 +237,15 @@ else:
     # Header
     st.title("Fantasy Football Copilot")
     
+    # Pick up background refreshes of the cached league on every rerun
+    if st.session_state.league_key:
+        st.session_state.league = get_league_cache().get(*st.session_state.league_key)
+        if st.session_state.selected_team is not None:
+            team_id = st.session_state.selected_team.team_id
+            for team in st.session_state.league.teams:
+                if team.team_id == team_id:
+                    st.session_state.selected_team = team
+    
     # Team Selection (if not already selected)
     if st.session_state.selected_team is None:
         st.subheader("Select Your Team")
@@ -126,6 +275,7 @@ else:
             st.session_state.authenticated = False
             st.session_state.espn_connected = False
             st.session_state.league = None
+            st.session_state.league_key = None
             st.session_state.selected_team = None
             st.rerun()
         
@@ -133,7 +283,7 @@ else:
         st.sidebar.header("Search Options")
         search_type = st.sidebar.selectbox(
             "Search Type",
-            ["My Team", "League Analysis", "Player Search", "Position Filter"]
+            ["My Team", "League Analysis", "Waiver Targets", "Player Search", "Position Filter", "News Search"]
         )
         
         # My Team View
@@ -158,9 +308,70 @@ else:
                 st.metric("Team ID", st.session_state.selected_team.team_id)
                 st.metric("Division", st.session_state.selected_team.division_id)
             
+            # Monte Carlo odds for this week's matchup and the rest of the season
+            st.subheader("Season Outlook")
+            league = st.session_state.league
+            week = getattr(league, 'current_week', None)
+            records = tuple((team.team_id, team.wins, team.losses, team.ties, team.points_for) for team in league.teams)
+            outlook = get_season_outlook(data_version(), st.session_state.league_key, week, records,
+                                         league_rosters(league), league_projections(league, week), league)
+            my_outlook = outlook.loc[st.session_state.selected_team.team_id]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if pd.notna(my_outlook['next_win_prob']):
+                    st.metric(f"Win Chance vs {my_outlook['opponent']}", f"{my_outlook['next_win_prob']:.0%}")
+                else:
+                    st.metric("Win Chance This Week", "No game")
+            with col2:
+                st.metric("Projected Wins", f"{my_outlook['projected_wins']:.1f}")
+            with col3:
+                st.metric("Playoff Chance", f"{my_outlook['playoff_prob']:.0%}")
+            
+            with st.expander("League Playoff Odds"):
+                st.dataframe(outlook.rename(columns={
+                    'team_name': 'Team', 'wins': 'Wins', 'opponent': 'Opponent', 'next_win_prob': 'Win This Week',
+                    'projected_wins': 'Projected Wins', 'playoff_prob': 'Playoffs', 'top_seed_prob': 'Top Seed',
+                }).round(3), hide_index=True)
+            
+            roster = st.session_state.selected_team.roster
+            
+            # Recommended lineup for this week's projections
+            st.subheader("Recommended Lineup")
+            week = getattr(st.session_state.league, 'current_week', None)
+            lineup_result = optimize_roster(roster, st.session_state.league.settings.position_slot_counts, week)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Optimal Projected", f"{lineup_result['total']:.1f}")
+            with col2:
+                st.metric("Current Projected", f"{lineup_result['current_total']:.1f}")
+            with col3:
+                st.metric("Points Left on Bench", f"{lineup_result['total'] - lineup_result['current_total']:.1f}")
+            
+            st.dataframe(pd.DataFrame([
+                {
+                    'Slot': slot,
+                    'Player': player.name if player else '(empty)',
+                    'Position': player.position if player else '',
+                    'Projected': round(projection, 1),
+                    'Current Slot': player.lineupSlot if player else '',
+                }
+                for slot, player, projection in lineup_result['lineup']
+            ]), hide_index=True)
+            
+            with st.expander("League Lineup Comparison"):
+                league_lineups = optimize_league(st.session_state.league, week)
+                st.dataframe(league_lineups.rename(columns={
+                    'team_name': 'Team', 'optimal': 'Optimal', 'current': 'Current', 'gain': 'Bench Points',
+                }).round(1), hide_index=True)
+            
             # Roster breakdown
             st.subheader("Your Roster")
             
+            # Join the roster to the scraped data in one pass
+            sentiment_by_id = dict(zip([player.playerId for player in roster], store.roster_sentiments(roster)))
+            
             # Group players by position
             position_counts = {}
             for player in st.session_state.selected_team.roster:
@@ -195,64 +406,59 @@ else:
                             st.write(f"Percent Started: {player.percent_started}")
                         
                         # Sentiment analysis
-                        csv_player = df[df['name'] == player.name]
-                        if not csv_player.empty:
-                            sentiment_text = csv_player['sentiment'].iloc[0]
-                            if pd.notna(sentiment_text):
-                                sentiment_data = parse_sentiment(sentiment_text)
-                                
-                                if sentiment_data:
-                                    st.write("**Sentiment Analysis:**")
-                                    col3, col4, col5 = st.columns(3)
+                        sentiment_data = sentiment_by_id[player.playerId]
+                        if sentiment_data:
+                            st.write("**Sentiment Analysis:**")
+                            col3, col4, col5 = st.columns(3)
                                     
-                                    with col3:
-                                        reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
-                                        if reddit_score != 'N/A' and reddit_score is not None:
-                                            if reddit_score >= 7:
-                                                st.success(f"Reddit: {reddit_score}/10")
-                                            elif reddit_score >= 5:
-                                                st.warning(f"Reddit: {reddit_score}/10")
-                                            else:
-                                                st.error(f"Reddit: {reddit_score}/10")
-                                        else:
-                                            st.info("Reddit: N/A")
+                            with col3:
+                                reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
+                                if reddit_score != 'N/A' and reddit_score is not None:
+                                    if reddit_score >= 7:
+                                        st.success(f"Reddit: {reddit_score}/10")
+                                    elif reddit_score >= 5:
+                                        st.warning(f"Reddit: {reddit_score}/10")
+                                    else:
+                                        st.error(f"Reddit: {reddit_score}/10")
+                                else:
+                                    st.info("Reddit: N/A")
                                     
-                                    with col4:
-                                        fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
-                                        if fantasypros_score != 'N/A' and fantasypros_score is not None:
-                                            if fantasypros_score >= 7:
-                                                st.success(f"FantasyPros: {fantasypros_score}/10")
-                                            elif fantasypros_score >= 5:
-                                                st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                            else:
-                                                st.error(f"FantasyPros: {fantasypros_score}/10")
-                                        else:
-                                            st.info("FantasyPros: N/A")
+                            with col4:
+                                fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
+                                if fantasypros_score != 'N/A' and fantasypros_score is not None:
+                                    if fantasypros_score >= 7:
+                                        st.success(f"FantasyPros: {fantasypros_score}/10")
+                                    elif fantasypros_score >= 5:
+                                        st.warning(f"FantasyPros: {fantasypros_score}/10")
+                                    else:
+                                        st.error(f"FantasyPros: {fantasypros_score}/10")
+                                else:
+                                    st.info("FantasyPros: N/A")
                                     
-                                    with col5:
-                                        overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
-                                        if overall_score != 'N/A' and overall_score is not None:
-                                            if overall_score >= 7:
-                                                st.success(f"Overall: {overall_score}/10")
-                                            elif overall_score >= 5:
-                                                st.warning(f"Overall: {overall_score}/10")
-                                            else:
-                                                st.error(f"Overall: {overall_score}/10")
-                                        else:
-                                            st.info("Overall: N/A")
+                            with col5:
+                                overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
+                                if overall_score != 'N/A' and overall_score is not None:
+                                    if overall_score >= 7:
+                                        st.success(f"Overall: {overall_score}/10")
+                                    elif overall_score >= 5:
+                                        st.warning(f"Overall: {overall_score}/10")
+                                    else:
+                                        st.error(f"Overall: {overall_score}/10")
+                                else:
+                                    st.info("Overall: N/A")
                                     
-                                    # Show summaries
-                                    if 'reddit_summary' in sentiment_data:
-                                        st.write("**Reddit Summary:**")
-                                        st.write(sentiment_data['reddit_summary'])
+                            # Show summaries
+                            if 'reddit_summary' in sentiment_data:
+                                st.write("**Reddit Summary:**")
+                                st.write(sentiment_data['reddit_summary'])
                                     
-                                    if 'fantasypros_summary' in sentiment_data:
-                                        st.write("**FantasyPros Summary:**")
-                                        st.write(sentiment_data['fantasypros_summary'])
+                            if 'fantasypros_summary' in sentiment_data:
+                                st.write("**FantasyPros Summary:**")
+                                st.write(sentiment_data['fantasypros_summary'])
                                     
-                                    if 'overall_summary' in sentiment_data:
-                                        st.write("**Overall Summary:**")
-                                        st.write(sentiment_data['overall_summary'])
+                            if 'overall_summary' in sentiment_data:
+                                st.write("**Overall Summary:**")
+                                st.write(sentiment_data['overall_summary'])
                         
                         st.divider()
         
@@ -283,6 +489,12 @@ else:
                         team = selected_team
                     st.subheader(f"{team.team_name} (Wins: {team.wins}, Losses: {team.losses}, Points For: {team.points_for:.1f})")
                     
+                    # Join the roster to the scraped data in one pass
+                    sentiment_by_id = dict(zip([player.playerId for player in team.roster], store.roster_sentiments(team.roster)))
+                    
+                    # Position averages for every team come from one cached, league-wide aggregation
+                    summary = get_position_summaries(data_version(), league_rosters(league))
+                    
                     # Group players by position
                     position_counts = {}
                     for player in team.roster:
@@ -293,358 +505,132 @@ else:
                     
                     # Display by position with sentiment scores
                     for position, players in position_counts.items():
-                        # Calculate average sentiment for this position
-                        reddit_scores = []
-                        fantasypros_scores = []
-                        overall_scores = []
-                        
-                        for player in players:
-                            csv_player = df[df['name'] == player.name]
-                            sentiment_data = None
-                            if not csv_player.empty:
-                                sentiment_data = parse_sentiment(csv_player['sentiment'].iloc[0])
-                            
-                            reddit_score = sentiment_data.get('reddit_sentiment_score', None) if sentiment_data else None
-                            fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', None) if sentiment_data else None
-                            overall_score = sentiment_data.get('overall_sentiment_score', None) if sentiment_data else None
-                            
-                            if reddit_score is not None and reddit_score != 'N/A':
-                                reddit_scores.append(reddit_score)
-                            if fantasypros_score is not None and fantasypros_score != 'N/A':
-                                fantasypros_scores.append(fantasypros_score)
-                            if overall_score is not None and overall_score != 'N/A':
-                                overall_scores.append(overall_score)
+                        position_summary = summary.loc[(team.team_id, position)]
+                        avg_reddit = position_summary['reddit_avg']
+                        avg_fantasypros = position_summary['fantasypros_avg']
+                        avg_overall = position_summary['overall_avg']
+                        avg_position_sentiment = position_summary['position_avg']
                         
                         # Create position header with averages
+                        averages = []
+                        if pd.notna(avg_reddit):
+                            averages.append(f"Reddit average: {avg_reddit:.1f}/10")
+                        if pd.notna(avg_fantasypros):
+                            averages.append(f"FantasyPros average: {avg_fantasypros:.1f}/10")
+                        if pd.notna(avg_overall):
+                            averages.append(f"Overall average: {avg_overall:.1f}/10")
+                        
                         avg_display = f"{position} ({len(players)} players)"
-                        if reddit_scores or fantasypros_scores or overall_scores:
-                            avg_display += " - "
-                            if reddit_scores:
-                                avg_reddit = sum(reddit_scores)/len(reddit_scores)
-                                if avg_reddit >= 7:
-                                    avg_display += f"Reddit average: {avg_reddit:.1f}/10"
-                                elif avg_reddit >= 5:
-                                    avg_display += f"Reddit average: {avg_reddit:.1f}/10"
-                                else:
-                                    avg_display += f"Reddit average: {avg_reddit:.1f}/10"
-                            if fantasypros_scores:
-                                avg_fantasypros = sum(fantasypros_scores)/len(fantasypros_scores)
-                                if avg_fantasypros >= 7:
-                                    avg_display += f" | FantasyPros average: {avg_fantasypros:.1f}/10"
-                                elif avg_fantasypros >= 5:
-                                    avg_display += f" | FantasyPros average: {avg_fantasypros:.1f}/10"
-                                else:
-                                    avg_display += f" | FantasyPros average: {avg_fantasypros:.1f}/10"
-                            if overall_scores:
-                                avg_overall = sum(overall_scores)/len(overall_scores)
-                                if avg_overall >= 7:
-                                    avg_display += f" | Overall average: {avg_overall:.1f}/10"
-                                elif avg_overall >= 5:
-                                    avg_display += f" | Overall average: {avg_overall:.1f}/10"
-                                else:
-                                    avg_display += f" | Overall average: {avg_overall:.1f}/10"
+                        if averages:
+                            avg_display += " - " + " | ".join(averages)
                         
                         # Display position header with color coding
-                        if reddit_scores or fantasypros_scores or overall_scores:
-                            # Calculate overall position sentiment
-                            all_scores = []
-                            if reddit_scores:
-                                all_scores.extend(reddit_scores)
-                            if fantasypros_scores:
-                                all_scores.extend(fantasypros_scores)
-                            if overall_scores:
-                                all_scores.extend(overall_scores)
-                            
-                            avg_position_sentiment = sum(all_scores) / len(all_scores) if all_scores else 0
-                            
-                            if avg_position_sentiment >= 7:
-                                with st.expander(avg_display):
-                                    st.success(f"Position sentiment: {avg_position_sentiment:.1f}/10")
-                                    for player in players:
-                                        st.write(f"**{player.name} ({player.position})**")
-                                        # Display player with colored sentiment scores
-                                        col1, col2, col3 = st.columns([1, 2, 1])
-                                        with col1:
-                                            pass  # Empty column for centering
-                                        
-                                        with col2:
-                                            # Create 2-column layout for scores and stats
-                                            score_col1, score_col2 = st.columns(2)
-                                            
-                                            with score_col1:
-                                                # Reddit score
-                                                if reddit_score and reddit_score != 'N/A':
-                                                    if reddit_score >= 7:
-                                                        st.success(f"Reddit: {reddit_score}/10")
-                                                    elif reddit_score >= 5:
-                                                        st.warning(f"Reddit: {reddit_score}/10")
-                                                    else:
-                                                        st.error(f"Reddit: {reddit_score}/10")
-                                                else:
-                                                    st.info("Reddit: N/A")
-                                                
-                                                # FantasyPros score
-                                                if fantasypros_score and fantasypros_score != 'N/A':
-                                                    if fantasypros_score >= 7:
-                                                        st.success(f"FantasyPros: {fantasypros_score}/10")
-                                                    elif fantasypros_score >= 5:
-                                                        st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                                    else:
-                                                        st.error(f"FantasyPros: {fantasypros_score}/10")
-                                                else:
-                                                    st.info("FantasyPros: N/A")
-                                                
-                                                # Overall score
-                                                if overall_score and overall_score != 'N/A':
-                                                    if overall_score >= 7:
-                                                        st.success(f"Overall: {overall_score}/10")
-                                                    elif overall_score >= 5:
-                                                        st.warning(f"Overall: {overall_score}/10")
-                                                    else:
-                                                        st.error(f"Overall: {overall_score}/10")
-                                                else:
-                                                    st.info("Overall: N/A")
-                                            
-                                            with score_col2:
-                                                # Stats in separate colored boxes
-                                                injury_status = player.injuryStatus if player.injuryStatus else "ACTIVE"
-                                                projected_points = player.projected_total_points
-                                                actual_points = player.total_points
-                                                
-                                                st.info(f"Injury: {injury_status}")
-                                                st.info(f"Projected: {projected_points:.1f}")
-                                                st.info(f"Actual: {actual_points:.1f}")
-                                        
-                                        with col3:
-                                            pass  # Empty column for centering
-                                        
-                                        # Re-calculate sentiment data for this specific player
-                                        csv_player = df[df['name'] == player.name]
-                                        sentiment_data = None
-                                        if not csv_player.empty:
-                                            sentiment_data = parse_sentiment(csv_player['sentiment'].iloc[0])
-                                        
-                                        reddit_score = sentiment_data.get('reddit_sentiment_score', None) if sentiment_data else None
-                                        fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', None) if sentiment_data else None
-                                        overall_score = sentiment_data.get('overall_sentiment_score', None) if sentiment_data else None
-                                        
-                                        st.divider()
+                        with st.expander(avg_display):
+                            if pd.isna(avg_position_sentiment):
+                                st.info("No sentiment data available")
+                            elif avg_position_sentiment >= 7:
+                                st.success(f"Position sentiment: {avg_position_sentiment:.1f}/10")
                             elif avg_position_sentiment >= 5:
-                                with st.expander(avg_display):
-                                    st.warning(f"Position sentiment: {avg_position_sentiment:.1f}/10")
-                                    for player in players:
-                                        st.write(f"**{player.name} ({player.position})**")
-                                        # Display player with colored sentiment scores
-                                        col1, col2, col3 = st.columns([1, 2, 1])
-                                        with col1:
-                                            pass  # Empty column for centering
-                                        
-                                        with col2:
-                                            # Create 2-column layout for scores and stats
-                                            score_col1, score_col2 = st.columns(2)
-                                            
-                                            with score_col1:
-                                                # Reddit score
-                                                if reddit_score and reddit_score != 'N/A':
-                                                    if reddit_score >= 7:
-                                                        st.success(f"Reddit: {reddit_score}/10")
-                                                    elif reddit_score >= 5:
-                                                        st.warning(f"Reddit: {reddit_score}/10")
-                                                    else:
-                                                        st.error(f"Reddit: {reddit_score}/10")
-                                                else:
-                                                    st.info("Reddit: N/A")
-                                                
-                                                # FantasyPros score
-                                                if fantasypros_score and fantasypros_score != 'N/A':
-                                                    if fantasypros_score >= 7:
-                                                        st.success(f"FantasyPros: {fantasypros_score}/10")
-                                                    elif fantasypros_score >= 5:
-                                                        st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                                    else:
-                                                        st.error(f"FantasyPros: {fantasypros_score}/10")
-                                                else:
-                                                    st.info("FantasyPros: N/A")
-                                                
-                                                # Overall score
-                                                if overall_score and overall_score != 'N/A':
-                                                    if overall_score >= 7:
-                                                        st.success(f"Overall: {overall_score}/10")
-                                                    elif overall_score >= 5:
-                                                        st.warning(f"Overall: {overall_score}/10")
-                                                    else:
-                                                        st.error(f"Overall: {overall_score}/10")
-                                                else:
-                                                    st.info("Overall: N/A")
-                                            
-                                            with score_col2:
-                                                # Stats in separate colored boxes
-                                                injury_status = player.injuryStatus if player.injuryStatus else "ACTIVE"
-                                                projected_points = player.projected_total_points
-                                                actual_points = player.total_points
-                                                
-                                                st.info(f"Injury: {injury_status}")
-                                                st.info(f"Projected: {projected_points:.1f}")
-                                                st.info(f"Actual: {actual_points:.1f}")
-                                        
-                                        with col3:
-                                            pass  # Empty column for centering
-                                        
-                                        # Re-calculate sentiment data for this specific player
-                                        csv_player = df[df['name'] == player.name]
-                                        sentiment_data = None
-                                        if not csv_player.empty:
-                                            sentiment_data = parse_sentiment(csv_player['sentiment'].iloc[0])
-                                        
-                                        reddit_score = sentiment_data.get('reddit_sentiment_score', None) if sentiment_data else None
-                                        fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', None) if sentiment_data else None
-                                        overall_score = sentiment_data.get('overall_sentiment_score', None) if sentiment_data else None
-                                        
-                                        st.divider()
+                                st.warning(f"Position sentiment: {avg_position_sentiment:.1f}/10")
                             else:
-                                with st.expander(avg_display):
-                                    st.error(f"Position sentiment: {avg_position_sentiment:.1f}/10")
-                                    for player in players:
-                                        st.write(f"**{player.name} ({player.position})**")
-                                        # Display player with colored sentiment scores
-                                        col1, col2, col3 = st.columns([1, 2, 1])
-                                        with col1:
-                                            pass  # Empty column for centering
-                                        
-                                        with col2:
-                                            # Create 2-column layout for scores and stats
-                                            score_col1, score_col2 = st.columns(2)
-                                            
-                                            with score_col1:
-                                                # Reddit score
-                                                if reddit_score and reddit_score != 'N/A':
-                                                    if reddit_score >= 7:
-                                                        st.success(f"Reddit: {reddit_score}/10")
-                                                    elif reddit_score >= 5:
-                                                        st.warning(f"Reddit: {reddit_score}/10")
-                                                    else:
-                                                        st.error(f"Reddit: {reddit_score}/10")
-                                                else:
-                                                    st.info("Reddit: N/A")
-                                                
-                                                # FantasyPros score
-                                                if fantasypros_score and fantasypros_score != 'N/A':
-                                                    if fantasypros_score >= 7:
-                                                        st.success(f"FantasyPros: {fantasypros_score}/10")
-                                                    elif fantasypros_score >= 5:
-                                                        st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                                    else:
-                                                        st.error(f"FantasyPros: {fantasypros_score}/10")
-                                                else:
-                                                    st.info("FantasyPros: N/A")
-                                                
-                                                # Overall score
-                                                if overall_score and overall_score != 'N/A':
-                                                    if overall_score >= 7:
-                                                        st.success(f"Overall: {overall_score}/10")
-                                                    elif overall_score >= 5:
-                                                        st.warning(f"Overall: {overall_score}/10")
-                                                    else:
-                                                        st.error(f"Overall: {overall_score}/10")
-                                                else:
-                                                    st.info("Overall: N/A")
-                                            
-                                            with score_col2:
-                                                # Stats in separate colored boxes
-                                                injury_status = player.injuryStatus if player.injuryStatus else "ACTIVE"
-                                                projected_points = player.projected_total_points
-                                                actual_points = player.total_points
-                                                
-                                                st.info(f"Injury: {injury_status}")
-                                                st.info(f"Projected: {projected_points:.1f}")
-                                                st.info(f"Actual: {actual_points:.1f}")
-                                        
-                                        with col3:
-                                            pass  # Empty column for centering
-                                        
-                                        # Re-calculate sentiment data for this specific player
-                                        csv_player = df[df['name'] == player.name]
-                                        sentiment_data = None
-                                        if not csv_player.empty:
-                                            sentiment_data = parse_sentiment(csv_player['sentiment'].iloc[0])
-                                        
-                                        reddit_score = sentiment_data.get('reddit_sentiment_score', None) if sentiment_data else None
-                                        fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', None) if sentiment_data else None
-                                        overall_score = sentiment_data.get('overall_sentiment_score', None) if sentiment_data else None
-                                        
-                                        st.divider()
-                        else:
-                            with st.expander(avg_display):
-                                st.info("No sentiment data available")
-                                for player in players:
-                                    st.write(f"**{player.name} ({player.position})**")
-                                    # Display player with colored sentiment scores
-                                    col1, col2, col3 = st.columns([1, 2, 1])
-                                    with col1:
-                                        pass  # Empty column for centering
+                                st.error(f"Position sentiment: {avg_position_sentiment:.1f}/10")
+                            
+                            for player in players:
+                                sentiment_data = sentiment_by_id[player.playerId] or {}
+                                
+                                st.write(f"**{player.name} ({player.position})**")
+                                # Display player with colored sentiment scores
+                                col1, col2, col3 = st.columns([1, 2, 1])
+                                with col1:
+                                    pass  # Empty column for centering
+                                
+                                with col2:
+                                    # Create 2-column layout for scores and stats
+                                    score_col1, score_col2 = st.columns(2)
                                     
-                                    with col2:
-                                        # Create 2-column layout for scores and stats
-                                        score_col1, score_col2 = st.columns(2)
-                                        
-                                        with score_col1:
-                                            # Reddit score
-                                            if reddit_score and reddit_score != 'N/A':
-                                                if reddit_score >= 7:
-                                                    st.success(f"Reddit: {reddit_score}/10")
-                                                elif reddit_score >= 5:
-                                                    st.warning(f"Reddit: {reddit_score}/10")
-                                                else:
-                                                    st.error(f"Reddit: {reddit_score}/10")
+                                    with score_col1:
+                                        for label, field in [("Reddit", 'reddit_sentiment_score'),
+                                                             ("FantasyPros", 'fantasypros_sentiment_score'),
+                                                             ("Overall", 'overall_sentiment_score')]:
+                                            score = sentiment_data.get(field)
+                                            if score is None:
+                                                st.info(f"{label}: N/A")
+                                            elif score >= 7:
+                                                st.success(f"{label}: {score}/10")
+                                            elif score >= 5:
+                                                st.warning(f"{label}: {score}/10")
                                             else:
-                                                st.info("Reddit: N/A")
-                                            
-                                            # FantasyPros score
-                                            if fantasypros_score and fantasypros_score != 'N/A':
-                                                if fantasypros_score >= 7:
-                                                    st.success(f"FantasyPros: {fantasypros_score}/10")
-                                                elif fantasypros_score >= 5:
-                                                    st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                                else:
-                                                    st.error(f"FantasyPros: {fantasypros_score}/10")
-                                            else:
-                                                st.info("FantasyPros: N/A")
-                                            
-                                            # Overall score
-                                            if overall_score and overall_score != 'N/A':
-                                                if overall_score >= 7:
-                                                    st.success(f"Overall: {overall_score}/10")
-                                                elif overall_score >= 5:
-                                                    st.warning(f"Overall: {overall_score}/10")
-                                                else:
-                                                    st.error(f"Overall: {overall_score}/10")
-                                            else:
-                                                st.info("Overall: N/A")
-                                        
-                                        with score_col2:
-                                            # Stats in separate colored boxes
-                                            injury_status = player.injuryStatus if player.injuryStatus else "ACTIVE"
-                                            projected_points = player.projected_total_points
-                                            actual_points = player.total_points
-                                            
-                                            st.info(f"Injury: {injury_status}")
-                                            st.info(f"Projected: {projected_points:.1f}")
-                                            st.info(f"Actual: {actual_points:.1f}")
-                                    
-                                    with col3:
-                                        pass  # Empty column for centering
-                                    
-                                    # Re-calculate sentiment data for this specific player
-                                    csv_player = df[df['name'] == player.name]
-                                    sentiment_data = None
-                                    if not csv_player.empty:
-                                        sentiment_data = parse_sentiment(csv_player['sentiment'].iloc[0])
+                                                st.error(f"{label}: {score}/10")
                                     
-                                    reddit_score = sentiment_data.get('reddit_sentiment_score', None) if sentiment_data else None
-                                    fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', None) if sentiment_data else None
-                                    overall_score = sentiment_data.get('overall_sentiment_score', None) if sentiment_data else None
-                                    
-                                    st.divider()
+                                    with score_col2:
+                                        # Stats in separate colored boxes
+                                        injury_status = player.injuryStatus if player.injuryStatus else "ACTIVE"
+                                        projected_points = player.projected_total_points
+                                        actual_points = player.total_points
+                                        
+                                        st.info(f"Injury: {injury_status}")
+                                        st.info(f"Projected: {projected_points:.1f}")
+                                        st.info(f"Actual: {actual_points:.1f}")
+                                
+                                with col3:
+                                    pass  # Empty column for centering
+                                
+                                st.divider()
+                    
+                    # Trade ideas scored by lineup projection and sentiment
+                    st.subheader("Trade Ideas")
+                    scan_league = st.checkbox("Scan every team in the league")
+                    mutual_only = st.checkbox("Only trades that don't lower their lineup")
+                    trades = get_trade_ideas(
+                        data_version(),
+                        st.session_state.league_key,
+                        getattr(league, 'current_week', None),
+                        league_rosters(league),
+                        league_projections(league, getattr(league, 'current_week', None)),
+                        st.session_state.selected_team.team_id,
+                        None if scan_league else team.team_id,
+                        mutual_only,
+                        league,
+                    )
+                    if trades.empty:
+                        st.info("No trades improve your projected lineup.")
+                    else:
+                        st.dataframe(trades.drop(columns=['team_id']).rename(columns={
+                            'team_name': 'Team', 'give': 'You Give', 'get': 'You Get', 'my_gain': 'Your Lineup +/-',
+                            'partner_gain': 'Their Lineup +/-', 'sentiment_delta': 'Sentiment +/-', 'score': 'Score',
+                        }).round(1), hide_index=True)
+
+        elif search_type == "Waiver Targets":
+            st.header("Waiver Targets")
+            league = st.session_state.league
+            week = getattr(league, 'current_week', None)
+            
+            # The shared index is ranked once; this league's rostered players are skipped per query
+            waiver_index = get_waiver_index(data_version(), week)
+            rostered = frozenset(player_id for _, player_id, _, _ in league_rosters(league))
+            
+            st.subheader("Best Adds for Your Weakest Slots")
+            per_slot = st.slider("Free agents per slot", min_value=1, max_value=10, value=3)
+            targets = waiver_targets(waiver_index, st.session_state.selected_team.roster,
+                                     league.settings.position_slot_counts, rostered, week, per_slot)
+            if targets.empty:
+                st.info("No free agents are available for your starting slots.")
+            else:
+                st.dataframe(targets.rename(columns={
+                    'slot': 'Slot', 'starter': 'Starter', 'starter_projection': 'Starter Projected', 'add': 'Add',
+                    'position': 'Position', 'projection': 'Projected', 'score': 'Score', 'upgrade': 'Upgrade',
+                }).round(1), hide_index=True)
+            
+            st.subheader("Top Free Agents")
+            col1, col2 = st.columns(2)
+            with col1:
+                waiver_position = st.selectbox("Position", waiver_index.positions())
+            with col2:
+                top_k = st.selectbox("Show", [10, 25, 50])
+            st.dataframe(waiver_index.top(waiver_position, top_k, rostered).rename(columns={
+                'name': 'Player', 'position': 'Position', 'projection': 'Projected', 'recent': 'Recent Avg',
+                'sentiment': 'Sentiment', 'percent_owned': '% Owned', 'score': 'Score',
+            }).round(1), hide_index=True)
 
         # Other search types...
         elif search_type == "Player Search":
@@ -654,7 +640,7 @@ else:
             player_name = st.selectbox("Select Player", df['name'].tolist())
             
             if player_name:
-                player_data = df[df['name'] == player_name].iloc[0]
+                player_data = store.get(name=player_name)
                 
                 # Display player info
                 col1, col2, col3 = st.columns(3)
@@ -676,80 +662,79 @@ else:
                 
                 
                 # Sentiment Analysis Cards
-                if 'sentiment' in df.columns and pd.notna(player_data['sentiment']):
-                    sentiment_data = parse_sentiment(player_data['sentiment'])
-                    
-                    if sentiment_data:
-                        st.subheader("Sentiment Analysis")
+                sentiment_data = store.sentiment(player_data['playerId'])
+                if sentiment_data:
+                    st.subheader("Sentiment Analysis")
                         
-                        # Sentiment scores in cards
-                        col6, col7, col8 = st.columns(3)
+                    # Sentiment scores in cards
+                    col6, col7, col8 = st.columns(3)
                         
-                        with col6:
-                            reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
-                            if reddit_score != 'N/A' and reddit_score is not None:
-                                # Color based on score
-                                if reddit_score >= 7:
-                                    st.success(f"Reddit Sentiment: {reddit_score}/10")
-                                elif reddit_score >= 5:
-                                    st.warning(f"Reddit Sentiment: {reddit_score}/10")
-                                else:
-                                    st.error(f"Reddit Sentiment: {reddit_score}/10")
+                    with col6:
+                        reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
+                        if reddit_score != 'N/A' and reddit_score is not None:
+                            # Color based on score
+                            if reddit_score >= 7:
+                                st.success(f"Reddit Sentiment: {reddit_score}/10")
+                            elif reddit_score >= 5:
+                                st.warning(f"Reddit Sentiment: {reddit_score}/10")
                             else:
-                                st.info("Reddit Sentiment: N/A")
+                                st.error(f"Reddit Sentiment: {reddit_score}/10")
+                        else:
+                            st.info("Reddit Sentiment: N/A")
                             
-                            if 'reddit_summary' in sentiment_data:
-                                st.write("**Reddit Summary:**")
-                                st.write(sentiment_data['reddit_summary'])
+                        if 'reddit_summary' in sentiment_data:
+                            st.write("**Reddit Summary:**")
+                            st.write(sentiment_data['reddit_summary'])
                         
-                        with col7:
-                            fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
-                            if fantasypros_score != 'N/A' and fantasypros_score is not None:
-                                if fantasypros_score >= 7:
-                                    st.success(f"FantasyPros Sentiment: {fantasypros_score}/10")
-                                elif fantasypros_score >= 5:
-                                    st.warning(f"FantasyPros Sentiment: {fantasypros_score}/10")
-                                else:
-                                    st.error(f"FantasyPros Sentiment: {fantasypros_score}/10")
+                    with col7:
+                        fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
+                        if fantasypros_score != 'N/A' and fantasypros_score is not None:
+                            if fantasypros_score >= 7:
+                                st.success(f"FantasyPros Sentiment: {fantasypros_score}/10")
+                            elif fantasypros_score >= 5:
+                                st.warning(f"FantasyPros Sentiment: {fantasypros_score}/10")
                             else:
-                                st.info("FantasyPros Sentiment: N/A")
+                                st.error(f"FantasyPros Sentiment: {fantasypros_score}/10")
+                        else:
+                            st.info("FantasyPros Sentiment: N/A")
                             
-                            if 'fantasypros_summary' in sentiment_data:
-                                st.write("**FantasyPros Summary:**")
-                                st.write(sentiment_data['fantasypros_summary'])
+                        if 'fantasypros_summary' in sentiment_data:
+                            st.write("**FantasyPros Summary:**")
+                            st.write(sentiment_data['fantasypros_summary'])
                         
-                        with col8:
-                            overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
-                            if overall_score != 'N/A' and overall_score is not None:
-                                if overall_score >= 7:
-                                    st.success(f"Overall Sentiment: {overall_score}/10")
-                                elif overall_score >= 5:
-                                    st.warning(f"Overall Sentiment: {overall_score}/10")
-                                else:
-                                    st.error(f"Overall Sentiment: {overall_score}/10")
+                    with col8:
+                        overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
+                        if overall_score != 'N/A' and overall_score is not None:
+                            if overall_score >= 7:
+                                st.success(f"Overall Sentiment: {overall_score}/10")
+                            elif overall_score >= 5:
+                                st.warning(f"Overall Sentiment: {overall_score}/10")
                             else:
-                                st.info("Overall Sentiment: N/A")
+                                st.error(f"Overall Sentiment: {overall_score}/10")
+                        else:
+                            st.info("Overall Sentiment: N/A")
                             
-                            if 'overall_summary' in sentiment_data:
-                                st.write("**Overall Summary:**")
-                                st.write(sentiment_data['overall_summary'])
+                        if 'overall_summary' in sentiment_data:
+                            st.write("**Overall Summary:**")
+                            st.write(sentiment_data['overall_summary'])
                 else:
                     st.subheader("Sentiment Analysis")
                     st.info("Sentiment analysis not available or failed.")
                 
                 # Text data
                 st.subheader("Raw Analysis Data")
+                text_data = load_player_text([player_data['playerId']], ['reddit_text', 'fantasy_pros_text']).iloc[0]
                 
                 col9, col10 = st.columns(2)
                 
                 with col9:
                     st.write("**Reddit Discussion:**")
-                    reddit_text = player_data['reddit_text'] if pd.notna(player_data['reddit_text']) else "No Reddit discussion available"
+                    reddit_text = text_data['reddit_text'] if pd.notna(text_data['reddit_text']) else "No Reddit discussion available"
                     st.text_area("Reddit Text", reddit_text, height=300, disabled=True)
                 
                 with col10:
                     st.write("**FantasyPros Analysis:**")
-                    fantasy_pros_text = player_data['fantasy_pros_text'] if pd.notna(player_data['fantasy_pros_text']) else "No FantasyPros analysis available"
+                    fantasy_pros_text = text_data['fantasy_pros_text'] if pd.notna(text_data['fantasy_pros_text']) else "No FantasyPros analysis available"
                     st.text_area("FantasyPros Text", fantasy_pros_text, height=300, disabled=True)
 
         elif search_type == "Position Filter":
@@ -758,110 +743,68 @@ else:
             # Position filter
             position = st.selectbox("Select Position", ["All"] + list(df['position'].unique()))
             
-            if position != "All":
-                filtered_df = df[df['position'] == position]
-            else:
-                filtered_df = df
-            
             # Sort options
             sort_by = st.selectbox("Sort by", ["total_points", "avg_points", "projected_total_points", "percent_owned", "name"])
             sort_order = st.selectbox("Sort order", ["Descending", "Ascending"])
             
-            if sort_order == "Descending":
-                filtered_df = filtered_df.sort_values(sort_by, ascending=False)
-            else:
-                filtered_df = filtered_df.sort_values(sort_by, ascending=True)
+            filtered_df = df.iloc[get_filtered_order(data_version(), position, sort_by, sort_order == "Ascending")]
             
             # Display filtered results
             st.write(f"**Showing {len(filtered_df)} players**")
+            display_mode = st.radio("Display", ["Cards", "Table"], horizontal=True)
             
-            # Create expandable sections for each player
-            for idx, player in filtered_df.iterrows():
-                with st.expander(f"{player['name']} ({player['position']}) - {player['total_points']:.1f} pts"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("**Stats:**")
-                        st.write(f"Total Points: {player['total_points']:.1f}")
-                        st.write(f"Average Points: {player['avg_points']:.1f}")
-                        st.write(f"Projected Points: {player['projected_total_points']:.1f}")
-                        st.write(f"Percent Owned: {player['percent_owned']:.1f}%")
-                        st.write(f"Team: {player['proTeam']}")
-                        st.write(f"Injury Status: {player['injuryStatus'] if player['injuryStatus'] else 'Healthy'}")
-                    
-                    with col2:
-                        st.write("**Analysis:**")
-                        reddit_text = player['reddit_text'] if pd.notna(player['reddit_text']) else "No Reddit discussion"
-                        fantasy_pros_text = player['fantasy_pros_text'] if pd.notna(player['fantasy_pros_text']) else "No FantasyPros analysis"
-                        
-                        if len(reddit_text) > 100:
-                            st.write("**Reddit (truncated):**")
-                            st.write(reddit_text[:100] + "...")
-                        else:
-                            st.write("**Reddit:**")
-                            st.write(reddit_text)
-                        
-                        if len(fantasy_pros_text) > 100:
-                            st.write("**FantasyPros (truncated):**")
-                            st.write(fantasy_pros_text[:100] + "...")
-                        else:
-                            st.write("**FantasyPros:**")
-                            st.write(fantasy_pros_text)
-                        
-                        # Add sentiment analysis to expandable sections
-                        if 'sentiment' in df.columns and pd.notna(player['sentiment']):
-                            sentiment_data = parse_sentiment(player['sentiment'])
-                            
-                            if sentiment_data:
-                                st.write("**Sentiment Analysis:**")
-                                col3, col4, col5 = st.columns(3)
-                                
-                                with col3:
-                                    reddit_score = sentiment_data.get('reddit_sentiment_score', 'N/A')
-                                    if reddit_score != 'N/A' and reddit_score is not None:
-                                        if reddit_score >= 7:
-                                            st.success(f"Reddit: {reddit_score}/10")
-                                        elif reddit_score >= 5:
-                                            st.warning(f"Reddit: {reddit_score}/10")
-                                        else:
-                                            st.error(f"Reddit: {reddit_score}/10")
-                                    else:
-                                        st.info("Reddit: N/A")
-                                
-                                with col4:
-                                    fantasypros_score = sentiment_data.get('fantasypros_sentiment_score', 'N/A')
-                                    if fantasypros_score != 'N/A' and fantasypros_score is not None:
-                                        if fantasypros_score >= 7:
-                                            st.success(f"FantasyPros: {fantasypros_score}/10")
-                                        elif fantasypros_score >= 5:
-                                            st.warning(f"FantasyPros: {fantasypros_score}/10")
-                                        else:
-                                            st.error(f"FantasyPros: {fantasypros_score}/10")
-                                    else:
-                                        st.info("FantasyPros: N/A")
-                                
-                                with col5:
-                                    overall_score = sentiment_data.get('overall_sentiment_score', 'N/A')
-                                    if overall_score != 'N/A' and overall_score is not None:
-                                        if overall_score >= 7:
-                                            st.success(f"Overall: {overall_score}/10")
-                                        elif overall_score >= 5:
-                                            st.warning(f"Overall: {overall_score}/10")
-                                        else:
-                                            st.error(f"Overall: {overall_score}/10")
-                                    else:
-                                        st.info("Overall: N/A")
-                                
-                                # Show summaries
-                                if 'reddit_summary' in sentiment_data:
-                                    st.write("**Reddit Summary:**")
-                                    st.write(sentiment_data['reddit_summary'])
-                                
-                                if 'fantasypros_summary' in sentiment_data:
-                                    st.write("**FantasyPros Summary:**")
-                                    st.write(sentiment_data['fantasypros_summary'])
-                                
-                                if 'overall_summary' in sentiment_data:
-                                    st.write("**Overall Summary:**")
-                                    st.write(sentiment_data['overall_summary'])
+            if display_mode == "Table":
+                # One virtualized grid for the whole pool; details render only for the selected row
+                table_columns = [column for column in FILTER_TABLE_COLUMNS if column in filtered_df.columns]
+                selection = st.dataframe(
+                    filtered_df[table_columns],
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                )
+                page_df = filtered_df.iloc[selection.selection.rows]
+            else:
+                # Server-side pagination: only one page of expanders is built per rerun
+                page_size = st.selectbox("Players per page", [10, 25, 50], index=1)
+                page_count = max(1, -(-len(filtered_df) // page_size))
+                page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+                st.caption(f"Page {page} of {page_count}")
+                page_df = filtered_df.iloc[(page - 1) * page_size:page * page_size]
+            
+            # Scraped text is fetched only for the players being rendered
+            texts = load_player_text(page_df['playerId'], ['reddit_text', 'fantasy_pros_text'])
+            
+            # Create expandable sections for each player on the page
+            for idx, player in page_df.iterrows():
+                with st.expander(f"{player['name']} ({player['position']}) - {player['total_points']:.1f} pts", expanded=display_mode == "Table"):
+                    show_filtered_player(player, texts.loc[player['playerId']], store.sentiments[idx])
 
+        elif search_type == "News Search":
+            st.header("News Search")
+            
+            query = st.text_input("Search scraped news", placeholder="e.g. snap count, hamstring")
+            source_labels = {"Reddit": 'reddit_text', "FantasyPros": 'fantasy_pros_text', "ESPN": 'espn_text'}
+            selected_sources = st.multiselect("Sources", list(source_labels), default=list(source_labels))
+            
+            if query:
+                start = time.perf_counter()
+                try:
+                    results = TextStore(TEXT_DB_PATH).search(query, [source_labels[label] for label in selected_sources])
+                except sqlite3.OperationalError:
+                    results = None
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                
+                if results is None:
+                    st.info("Search index not built yet. Re-run scrape_players.py to create it.")
+                elif results.empty:
+                    st.info(f"No players mention \"{query}\".")
+                else:
+                    st.caption(f"{len(results)} players in {elapsed_ms:.1f} ms")
+                    for _, hit in results.iterrows():
+                        player_data = store.get(hit['playerId'], hit['name'])
+                        if player_data is not None:
+                            st.write(f"**{hit['name']}** ({player_data['position']}, {player_data['proTeam']})")
+                        else:
+                            st.write(f"**{hit['name']}**")
+                        st.write(hit['snippet'])
+                        st.divider()
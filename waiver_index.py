@@ -0,0 +1,188 @@
+import bisect
+import copy
+import json
+
+import numpy as np
+import pandas as pd
+
+from lineup import BENCH_SLOTS, INACTIVE_STATUSES, optimize_roster
+from weekly_stats import load_weekly_stats, rolling_average, weekly_points
+
+
+# Weights of each feature's within-position z-score in the composite score
+COMPOSITE_WEIGHTS = {
+    'projection': 0.5,
+    'recent': 0.25,
+    'sentiment': 0.15,
+    'percent_owned': 0.10,
+}
+RECENT_WINDOW = 3
+# Share of changed players above which `WaiverIndex.updated` rebuilds from scratch
+MAX_UPDATE_FRACTION = 0.25
+
+
+def _slots(value):
+    if isinstance(value, str):
+        return json.loads(value) if value else []
+    return list(value) if value is not None else []
+
+
+def waiver_features(store, week=None):
+    """Per-player ranking inputs, indexed by playerId.
+
+    projection is the week's projected points from the weekly stats table
+    (the season per-game projection when there is none), recent the
+    rolling average of the last RECENT_WINDOW games, and sentiment the
+    overall sentiment score.
+    """
+    df = store.df
+    features = pd.DataFrame({
+        'name': df['name'].astype(str).to_numpy(),
+        'position': df['position'].astype(str).to_numpy(),
+        'eligible': [_slots(value) for value in df['eligibleSlots']] if 'eligibleSlots' in df else [[]] * len(df),
+        'injuryStatus': df['injuryStatus'].astype(str).to_numpy() if 'injuryStatus' in df else '',
+        'projection': df['projected_avg_points'].to_numpy(dtype=float, na_value=np.nan),
+        'sentiment': (df['overall_sentiment_score'].to_numpy(dtype=float, na_value=np.nan)
+                      if 'overall_sentiment_score' in df else np.nan),
+        'percent_owned': df['percent_owned'].to_numpy(dtype=float, na_value=np.nan),
+    }, index=pd.Index(df['playerId'].astype(int).to_numpy(), name='playerId'))
+    features = features[~features.index.duplicated()]
+
+    weekly = load_weekly_stats(stats=['points'])
+    if week is not None:
+        points = weekly_points(weekly)
+        projected = points[points['week'] == week].set_index('playerId')['projected'].dropna()
+        features['projection'] = projected.reindex(features.index).fillna(features['projection'])
+    features['recent'] = rolling_average(weekly, RECENT_WINDOW).groupby('playerId')['rolling_avg'].last()
+    return features
+
+
+class WaiverIndex:
+    """Players ranked by a composite score, per position and per slot.
+
+    Every active player sits in one sorted list for its position and one
+    for each starting slot it is eligible for. An index is never modified
+    after it is built, so one instance can be shared by every session and
+    league: a top-k query walks a list from the front and skips the
+    caller's rostered players. Standardization parameters are fixed when
+    the index is built; `updated` derives a new index that re-scores and
+    moves only the players whose features changed.
+    """
+
+    def __init__(self, features, weights=COMPOSITE_WEIGHTS):
+        self.weights = weights
+        self.features = features.copy()
+        grouped = self.features.groupby('position')[list(weights)]
+        self.means = grouped.mean()
+        self.stds = grouped.std().replace(0, np.nan)
+        self.features['score'] = self._score(self.features)
+        self.lists = {}
+        for player_id in self.features.index:
+            for key in self._player_keys(player_id):
+                self.lists.setdefault(key, []).append(self._entry(player_id))
+        for ranked in self.lists.values():
+            ranked.sort()
+
+    def _score(self, features):
+        columns = list(self.weights)
+        means = self.means.reindex(features['position']).to_numpy()
+        stds = self.stds.reindex(features['position']).to_numpy()
+        z = np.nan_to_num((features[columns].to_numpy(dtype=float) - means) / stds)
+        return z @ np.array([self.weights[column] for column in columns])
+
+    def _entry(self, player_id):
+        return (-self.features.at[player_id, 'score'], player_id)
+
+    def _player_keys(self, player_id):
+        row = self.features.loc[player_id]
+        if row['injuryStatus'] in INACTIVE_STATUSES:
+            return []
+        slots = [row['position']] + [slot for slot in row['eligible'] if slot not in BENCH_SLOTS]
+        return list(dict.fromkeys(slots))
+
+    def _changed(self, features):
+        """playerIds of `features` rows that are new or differ from this index's."""
+        common = features.index.intersection(self.features.index)
+        old = self.features.loc[common]
+        new = features.loc[common]
+        same = np.ones(len(common), dtype=bool)
+        for column in features.columns:
+            if column not in old:
+                same[:] = False
+                break
+            same &= ((old[column] == new[column]) | (old[column].isna() & new[column].isna())).to_numpy()
+        return features.index.difference(common).append(common[~same])
+
+    def updated(self, features, max_changed=MAX_UPDATE_FRACTION):
+        """Index for `features` that re-ranks only the new, changed and dropped players.
+
+        Scores use this index's per-position means and deviations. When more
+        than `max_changed` of the players changed, a fresh index is built
+        instead, which refits them.
+        """
+        changed = self._changed(features)
+        removed = self.features.index.difference(features.index)
+        if len(changed) + len(removed) > max_changed * len(features):
+            return WaiverIndex(features, self.weights)
+
+        index = copy.copy(self)
+        index.lists = {key: list(ranked) for key, ranked in self.lists.items()}
+        for player_id in changed.intersection(self.features.index).append(removed):
+            entry = self._entry(player_id)
+            for key in self._player_keys(player_id):
+                ranked = index.lists[key]
+                del ranked[bisect.bisect_left(ranked, entry)]
+        index.features = features.copy()
+        index.features['score'] = self.features['score'].reindex(features.index)
+        index.features.loc[changed, 'score'] = index._score(index.features.loc[changed])
+        for player_id in changed:
+            for key in index._player_keys(player_id):
+                bisect.insort(index.lists.setdefault(key, []), index._entry(player_id))
+        index.lists = {key: ranked for key, ranked in index.lists.items() if ranked}
+        return index
+
+    def positions(self):
+        return sorted(set(self.features['position']) & set(self.lists))
+
+    def top(self, key, k=10, rostered=frozenset()):
+        """Best `k` players for a position or slot that are not in `rostered`, best first."""
+        player_ids = []
+        for _, player_id in self.lists.get(key, ()):
+            if player_id in rostered:
+                continue
+            player_ids.append(player_id)
+            if len(player_ids) == k:
+                break
+        return self.features.loc[player_ids, ['name', 'position', 'projection', 'recent', 'sentiment',
+                                              'percent_owned', 'score']]
+
+
+def waiver_targets(index, roster, position_slot_counts, rostered, week=None, per_slot=3):
+    """Best adds for each starting seat of `roster`, weakest seats first.
+
+    Each seat of the optimal lineup is paired with the top `per_slot` free
+    agents (players not in `rostered`) eligible for it; upgrade is the
+    add's projection minus the current starter's. Seats are ordered by
+    their best upgrade.
+    """
+    rows = []
+    for seat, (slot, starter, projection) in enumerate(optimize_roster(roster, position_slot_counts, week)['lineup']):
+        for _, add in index.top(slot, per_slot, rostered).iterrows():
+            rows.append({
+                'seat': seat,
+                'slot': slot,
+                'starter': starter.name if starter else '(empty)',
+                'starter_projection': projection,
+                'add': add['name'],
+                'position': add['position'],
+                'projection': add['projection'],
+                'score': add['score'],
+                'upgrade': add['projection'] - projection,
+            })
+    targets = pd.DataFrame(rows, columns=['seat', 'slot', 'starter', 'starter_projection', 'add', 'position',
+                                          'projection', 'score', 'upgrade'])
+    if targets.empty:
+        return targets.drop(columns=['seat'])
+    best = targets.groupby('seat')['upgrade'].transform('max')
+    targets = targets.assign(best=best).sort_values(['best', 'seat', 'upgrade'], ascending=[False, True, False])
+    return targets.drop(columns=['seat', 'best']).reset_index(drop=True)
@@ -0,0 +1,166 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from player_store import load_players
+
+
+WEEKLY_STATS_PATH = 'weekly_stats.parquet'
+
+# Keys of an espn_api stats entry and the (stat, kind) rows they become;
+# breakdown dicts expand to one row per stat key
+VALUE_KEYS = {
+    'points': ('points', 'actual'),
+    'avg_points': ('avg_points', 'actual'),
+    'projected_points': ('points', 'projected'),
+    'projected_avg_points': ('avg_points', 'projected'),
+}
+BREAKDOWN_KEYS = {
+    'breakdown': 'actual',
+    'projected_breakdown': 'projected',
+}
+KINDS = ['actual', 'projected']
+
+# A week is a boom (bust) when actual points reach boom_ratio x (fall to
+# bust_ratio x) the week's projection
+BOOM_RATIO = 1.5
+BUST_RATIO = 0.5
+
+
+def decode_stats(player_id, stats):
+    """Long rows (playerId, week, stat, kind, value) from one player's stats dict.
+
+    `stats` is espn_api's Player.stats, or its JSON string from
+    get_player_stats, keyed by scoring period (0 is the season total).
+    Non-numeric values are skipped.
+    """
+    if isinstance(stats, str):
+        stats = json.loads(stats) if stats else {}
+    rows = []
+    for week, entry in (stats or {}).items():
+        if not isinstance(entry, dict):
+            continue
+        for key, value in entry.items():
+            if key in VALUE_KEYS:
+                stat, kind = VALUE_KEYS[key]
+                values = {stat: value}
+            elif key in BREAKDOWN_KEYS and isinstance(value, dict):
+                kind = BREAKDOWN_KEYS[key]
+                values = value
+            else:
+                continue
+            for stat, stat_value in values.items():
+                if isinstance(stat_value, (int, float)) and not isinstance(stat_value, bool):
+                    rows.append((player_id, int(week), str(stat), kind, stat_value))
+    return rows
+
+
+def build_weekly_stats(stats_rows):
+    """Long weekly stats table from get_player_stats rows.
+
+    Columns are playerId (int32), week (int16, 0 = season), stat and kind
+    (categorical) and value (float32), one row per player, week, stat and
+    actual/projected value.
+    """
+    rows = []
+    for row in stats_rows:
+        rows.extend(decode_stats(int(row['playerId']), row.get('stats')))
+    long = pd.DataFrame(rows, columns=['playerId', 'week', 'stat', 'kind', 'value'])
+    return long.astype({
+        'playerId': 'int32',
+        'week': 'int16',
+        'stat': 'category',
+        'kind': pd.CategoricalDtype(KINDS),
+        'value': 'float32',
+    }).sort_values(['playerId', 'week', 'kind', 'stat'], ignore_index=True)
+
+
+def write_weekly_stats(long, path=WEEKLY_STATS_PATH):
+    """Write the long table as Parquet, replacing `path` atomically."""
+    tmp_path = f"{path}.tmp"
+    pq.write_table(pa.Table.from_pandas(long, preserve_index=False), tmp_path,
+                   compression='zstd', use_dictionary=True)
+    os.replace(tmp_path, path)
+
+
+def load_weekly_stats(player_ids=None, stats=None, kind=None, path=WEEKLY_STATS_PATH):
+    """Long weekly stats, optionally only some players, stats and kind.
+
+    Filters are pushed down into the Parquet read. Exports made before the
+    weekly table existed are decoded from the players file's stats column.
+    """
+    if os.path.exists(path):
+        filters = []
+        if player_ids is not None:
+            filters.append(('playerId', 'in', [int(player_id) for player_id in player_ids]))
+        if stats is not None:
+            filters.append(('stat', 'in', list(stats)))
+        if kind is not None:
+            filters.append(('kind', '==', kind))
+        return pq.read_table(path, filters=filters or None, memory_map=True).to_pandas()
+
+    players = load_players(columns=['playerId', 'stats'], player_ids=player_ids)
+    long = build_weekly_stats(players.to_dict('records'))
+    if stats is not None:
+        long = long[long['stat'].isin(list(stats))]
+    if kind is not None:
+        long = long[long['kind'] == kind]
+    return long.reset_index(drop=True)
+
+
+def weekly_points(long):
+    """Actual and projected points per player and week (season total excluded).
+
+    Returns a frame with playerId, week, actual and projected columns; a
+    week a player has no actual points for (bye, not played) has NaN.
+    """
+    points = long[(long['stat'] == 'points') & (long['week'] > 0)]
+    wide = points.pivot_table(index=['playerId', 'week'], columns='kind', values='value',
+                              aggfunc='first', observed=False)
+    return wide.reindex(columns=KINDS).reset_index().rename_axis(columns=None)
+
+
+def rolling_average(long, window=3):
+    """Rolling mean of actual points over each player's last `window` games.
+
+    Returns weekly_points rows for weeks with actual points plus a
+    rolling_avg column (shorter windows at the start of the season).
+    """
+    points = weekly_points(long).dropna(subset=['actual']).sort_values(['playerId', 'week'], ignore_index=True)
+    points['rolling_avg'] = (points.groupby('playerId')['actual']
+                             .rolling(window, min_periods=1).mean()
+                             .reset_index(level=0, drop=True))
+    return points
+
+
+def consistency(long):
+    """Games, mean, standard deviation and coefficient of variation of actual points per player."""
+    actual = weekly_points(long).dropna(subset=['actual'])
+    summary = actual.groupby('playerId')['actual'].agg(games='count', mean='mean', std='std')
+    summary['std'] = summary['std'].fillna(0.0)
+    summary['cv'] = (summary['std'] / summary['mean']).where(summary['mean'] > 0)
+    return summary
+
+
+def boom_bust(long, boom_ratio=BOOM_RATIO, bust_ratio=BUST_RATIO):
+    """Share of projected games each player boomed or busted against the projection."""
+    points = weekly_points(long).dropna(subset=['actual'])
+    points = points[points['projected'] > 0]
+    ratio = points['actual'] / points['projected']
+    flags = pd.DataFrame({
+        'playerId': points['playerId'],
+        'boom_rate': (ratio >= boom_ratio).astype(float),
+        'bust_rate': (ratio <= bust_ratio).astype(float),
+    })
+    return flags.groupby('playerId')[['boom_rate', 'bust_rate']].mean()
+
+
+def player_trends(long, window=3, boom_ratio=BOOM_RATIO, bust_ratio=BUST_RATIO):
+    """League-wide summary per player: consistency, latest rolling average and boom/bust rates."""
+    latest = rolling_average(long, window).groupby('playerId')['rolling_avg'].last()
+    summary = consistency(long).join(latest).join(boom_bust(long, boom_ratio, bust_ratio))
+    return summary.astype({column: np.float32 for column in summary.columns if column != 'games'})